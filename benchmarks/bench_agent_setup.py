@@ -0,0 +1,90 @@
+"""
+Microbenchmark du coût de préparation des agents à chaque requête.
+
+For every request, `LegionCommander` wraps each selected general in an `AssignedGeneral`,
+and each general builds the schemas of its tools before calling the model. This measures
+that per-request setup: creating the views and generating the tool schemas, compared with
+a full `General` initialization (what building an `AssignedGeneral` used to cost).
+
+Usage:
+    python benchmarks/bench_agent_setup.py [--generals 8] [--tools 20] [--requests 2000]
+"""
+import argparse
+import time
+
+from dictatorgenai.agents.assigned_general import AssignedGeneral
+from dictatorgenai.agents.general import General
+from dictatorgenai.agents.tool import tool
+
+
+class _NullModel:
+    """Model stub: the benchmark never calls the model."""
+    pass
+
+
+def _make_tools(count: int) -> list:
+    tools = []
+    for i in range(count):
+        def lookup(query: str, top_k: int = 5) -> str:
+            return query
+        lookup.__name__ = f"lookup_{i}"
+        tools.append(tool(f"Lookup tool number {i}.")(lookup))
+    return tools
+
+
+def _make_generals(count: int, tools: list) -> list:
+    return [
+        General(
+            my_name_is=f"General{i}",
+            iam="A benchmark general.",
+            my_capabilities_are=[{"capability": "benchmark", "description": "Benchmark capability."}],
+            nlp_model=_NullModel(),
+            tools=tools,
+        )
+        for i in range(count)
+    ]
+
+
+def _bench_full_init(generals: list, tools: list, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        for general in generals:
+            agent = General(
+                my_name_is=general.my_name_is,
+                iam=general.iam,
+                my_capabilities_are=general.my_capabilities_are,
+                nlp_model=general.nlp_model,
+                tools=tools,
+            )
+            agent.generate_tool_schemas()
+    return time.perf_counter() - start
+
+
+def _bench_views(generals: list, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        for general in generals:
+            agent = AssignedGeneral(base_general=general, assigned_subtasks=[], capabilities_used=[], confidence=0.9)
+            agent.generate_tool_schemas()
+    return time.perf_counter() - start
+
+
+def main(generals_count: int, tools_count: int, requests: int):
+    tools = _make_tools(tools_count)
+    generals = _make_generals(generals_count, tools)
+    print(f"{requests} requests, {generals_count} generals, {tools_count} tools each")
+    print(f"{'setup':<28}{'total (s)':>12}{'per request (us)':>20}")
+    for name, duration in (
+        ("full General.__init__", _bench_full_init(generals, tools, requests)),
+        ("AssignedGeneral view", _bench_views(generals, requests)),
+    ):
+        print(f"{name:<28}{duration:>12.3f}{duration / requests * 1e6:>20.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generals", type=int, default=8, help="Number of generals selected per request.")
+    parser.add_argument("--tools", type=int, default=20, help="Number of tools of each general.")
+    parser.add_argument("--requests", type=int, default=2000, help="Number of simulated requests.")
+    args = parser.parse_args()
+    main(args.generals, args.tools, args.requests)
@@ -0,0 +1,122 @@
+"""
+Benchmark de la persistance des étapes dans `SQLiteStore`.
+
+Fills a database with `--sessions` memories of `--steps` steps each, then measures:
+- the write throughput, one `save_step` per step and one `save_steps` batch per turn,
+- the latency of `load_steps` for random memories.
+
+The same measurements are made with the previous store (one connection and one transaction
+per call, no index on `memory_id`) for comparison.
+
+Usage:
+    python benchmarks/bench_memory_store.py [--sessions 10000] [--steps 5] [--writes 2000] [--loads 500]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from dictatorgenai.memories.stores.sqlite_store import SQLiteStore
+from dictatorgenai.steps.base_step import TaskStep
+from dictatorgenai.steps.message_steps import UserMessageStep
+
+
+class _LegacySQLiteStore(SQLiteStore):
+    """Le store tel qu'il était : une connexion et un commit par appel, sans index."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memory_steps ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, memory_id TEXT NOT NULL, step_data TEXT NOT NULL)"
+            )
+
+    def save_step(self, memory_id, step):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO memory_steps (memory_id, step_data) VALUES (?, ?)", (memory_id, json.dumps(step.to_dict())))
+            conn.commit()
+
+    def save_steps(self, memory_id, steps):
+        for step in steps:
+            self.save_step(memory_id, step)
+
+    def load_steps(self, memory_id):
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT step_data FROM memory_steps WHERE memory_id = ?", (memory_id,)).fetchall()
+        return [TaskStep.from_dict(json.loads(row[0])) for row in rows]
+
+    def close(self):
+        pass
+
+
+def _step(i: int) -> UserMessageStep:
+    return UserMessageStep(request_id=f"req_{i}", content=f"Question juridique numéro {i} sur un contrat de bail.")
+
+
+def _populate(db_path: str, sessions: int, steps: int):
+    rows = [
+        (f"session_{s}", json.dumps(_step(i).to_dict()))
+        for s in range(sessions)
+        for i in range(steps)
+    ]
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("INSERT INTO memory_steps (memory_id, step_data) VALUES (?, ?)", rows)
+        conn.commit()
+
+
+def _bench_writes(store: SQLiteStore, writes: int, turn_size: int) -> tuple:
+    steps = [_step(i) for i in range(writes)]
+    start = time.perf_counter()
+    for step in steps:
+        store.save_step("bench_single", step)
+    single = writes / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, writes, turn_size):
+        store.save_steps("bench_batch", steps[i:i + turn_size])
+    batched = writes / (time.perf_counter() - start)
+    return single, batched
+
+
+def _bench_loads(store: SQLiteStore, sessions: int, loads: int) -> tuple:
+    rng = random.Random(0)
+    latencies = []
+    for _ in range(loads):
+        memory_id = f"session_{rng.randrange(sessions)}"
+        start = time.perf_counter()
+        store.load_steps(memory_id)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.mean(latencies), latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000, help="Memories in the database.")
+    parser.add_argument("--steps", type=int, default=5, help="Steps per memory, also the size of a turn.")
+    parser.add_argument("--writes", type=int, default=2000, help="Steps written per measurement.")
+    parser.add_argument("--loads", type=int, default=500, help="Memories loaded.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, factory in (("legacy", _LegacySQLiteStore), ("SQLiteStore", SQLiteStore)):
+            db_path = os.path.join(directory, f"{name}.db")
+            store = factory(db_path)
+            _populate(db_path, args.sessions, args.steps)
+            single, batched = _bench_writes(store, args.writes, args.steps)
+            mean, p95 = _bench_loads(store, args.sessions, args.loads)
+            store.close()
+            print(
+                f"{name:<12} save_step {single:>9.0f} steps/s | save_steps {batched:>9.0f} steps/s | "
+                f"load_steps mean {mean * 1e3:.3f} ms, p95 {p95 * 1e3:.3f} ms "
+                f"({args.sessions} sessions x {args.steps} steps)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark du moteur de recherche BM25 embarqué sur un corpus juridique synthétique.
+
+Builds an index of synthetic articles and decisions (Zipf-distributed vocabulary), then reports
+the indexing throughput, the size on disk, the latency of top-k queries, and the cost of an
+incremental update followed by a merge.
+
+Usage:
+    python benchmarks/bench_retrieval.py [--docs 20000] [--words 120] [--queries 500] [--top-k 10]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from dictatorgenai.retrieval import BM25Index
+
+_SYLLABLES = ["ca", "ti", "on", "re", "pe", "nal", "droit", "ju", "ris", "pru", "den", "ce", "ar", "tic", "le", "loi", "co", "de", "vol", "dol"]
+
+
+def _vocabulary(size: int, rng: random.Random) -> list:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _corpus(docs: int, words: int, vocabulary: list, rng: random.Random) -> list:
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [
+        {
+            "id": f"doc-{i}",
+            "title": f"Article {i}",
+            "text": " ".join(rng.choices(vocabulary, weights=weights, k=words)),
+            "metadata": {"source": "synthetic"},
+        }
+        for i in range(docs)
+    ]
+
+
+def _directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main(docs: int, words: int, queries: int, top_k: int):
+    rng = random.Random(42)
+    vocabulary = _vocabulary(20000, rng)
+    corpus = _corpus(docs, words, vocabulary, rng)
+    directory = tempfile.mkdtemp(prefix="bm25-bench-")
+    try:
+        index = BM25Index(directory)
+        start = time.perf_counter()
+        batch = max(1, docs // 4)
+        for offset in range(0, docs, batch):
+            index.add_documents(corpus[offset:offset + batch])
+        build = time.perf_counter() - start
+        print(f"indexed {docs} documents of {words} words in {build:.2f}s ({docs / build:,.0f} docs/s), "
+              f"{_directory_size(directory) / 1e6:.1f} MB on disk, {len(index._manifest['segments'])} segments")
+
+        start = time.perf_counter()
+        index.merge()
+        print(f"merge into one segment: {time.perf_counter() - start:.2f}s")
+
+        # Requêtes de 2 à 5 termes tirés dans le vocabulaire (termes fréquents et rares)
+        latencies = []
+        for _ in range(queries):
+            query = " ".join(rng.choice(vocabulary[:5000]) for _ in range(rng.randint(2, 5)))
+            start = time.perf_counter()
+            index.search(query, top_k=top_k)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f"{queries} queries top-{top_k}: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+
+        updates = _corpus(max(1, docs // 100), words, vocabulary, rng)
+        start = time.perf_counter()
+        index.add_documents(updates)
+        print(f"incremental update of {len(updates)} documents: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        reader = BM25Index(directory)
+        start = time.perf_counter()
+        reader.search(" ".join(vocabulary[:3]), top_k=top_k)
+        print(f"cold open + first query (new reader): {(time.perf_counter() - start) * 1000:.1f} ms")
+        reader.close()
+        index.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20_000, help="Number of synthetic documents.")
+    parser.add_argument("--words", type=int, default=120, help="Words per document.")
+    parser.add_argument("--queries", type=int, default=500, help="Number of queries.")
+    parser.add_argument("--top-k", type=int, default=10, help="Number of results per query.")
+    args = parser.parse_args()
+    main(args.docs, args.words, args.queries, args.top_k)
@@ -0,0 +1,89 @@
+"""
+Microbenchmark de l'encodage des étapes persistées.
+
+Compares, on a mix of steps typical of a discussion (messages, plans, evaluations, tool calls):
+- the previous JSON path: `json.dumps(step.to_dict())`, and `TaskStep.from_dict` inspecting the
+  constructor signature of every step,
+- `StepCodec`: cold encoding, memoized re-encoding (a step persisted or published again), and decoding.
+
+Usage:
+    python benchmarks/bench_step_codec.py [--steps 20000] [--plan-size 4000]
+"""
+import argparse
+import inspect
+import json
+import time
+
+from dictatorgenai.steps import (
+    AssistantMessageStep,
+    GeneralEvaluationStep,
+    PlanningStep,
+    StepCodec,
+    ToolExecutionStep,
+    UserMessageStep,
+)
+from dictatorgenai.steps.base_step import TASK_STEP_REGISTRY
+
+
+def _legacy_from_dict(data: dict):
+    """Reconstruction telle qu'elle était : signature inspectée à chaque étape."""
+    step_class = TASK_STEP_REGISTRY[data.pop("step_type")]
+    step_params = inspect.signature(step_class).parameters
+    return step_class(**{key: value for key, value in data.items() if key in step_params})
+
+
+def _make_steps(count: int, plan_size: int) -> list:
+    plan = ("Analyse du contrat de bail, vérification des clauses résolutoires et du dépôt de garantie. " * (plan_size // 90 + 1))[:plan_size]
+    factories = [
+        lambda i: UserMessageStep(f"req_{i}", f"Mon propriétaire refuse de rendre le dépôt de garantie ({i})."),
+        lambda i: PlanningStep(f"req_{i}", plan),
+        lambda i: GeneralEvaluationStep(f"req_{i}", "Juriste", plan[: plan_size // 2]),
+        lambda i: ToolExecutionStep(f"req_{i}", "code_civil_search", {"query": "dépôt de garantie", "top_k": 5}, output="Article 22 de la loi du 6 juillet 1989..."),
+        lambda i: AssistantMessageStep(f"req_{i}", "Le bailleur dispose d'un délai d'un mois pour restituer le dépôt.", metadata={"status": "complete"}),
+    ]
+    return [factories[i % len(factories)](i) for i in range(count)]
+
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>10.0f} steps/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=20000, help="Steps encoded and decoded.")
+    parser.add_argument("--plan-size", type=int, default=4000, help="Characters of the plans and evaluations.")
+    args = parser.parse_args()
+
+    steps = _make_steps(args.steps, args.plan_size)
+
+    start = time.perf_counter()
+    legacy = [json.dumps(step.to_dict()) for step in steps]
+    legacy_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in legacy:
+        _legacy_from_dict(json.loads(data))
+    legacy_decode = time.perf_counter() - start
+
+    codec = StepCodec()
+    start = time.perf_counter()
+    encoded = [codec.encode(step) for step in steps]
+    codec_encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for step in steps:
+        codec.encode(step)
+    codec_reencode = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in encoded:
+        codec.decode(data)
+    codec_decode = time.perf_counter() - start
+
+    legacy_size = sum(len(data.encode("utf-8")) for data in legacy)
+    codec_size = sum(len(data) for data in encoded)
+    body = "msgpack" if codec.use_msgpack else "compact JSON"
+    print(f"JSON       encode {_rate(args.steps, legacy_encode)} | decode {_rate(args.steps, legacy_decode)} | {legacy_size / 1e6:.1f} MB")
+    print(f"StepCodec  encode {_rate(args.steps, codec_encode)} | decode {_rate(args.steps, codec_decode)} | {codec_size / 1e6:.1f} MB ({body} + zlib)")
+    print(f"StepCodec  memoized re-encode {_rate(args.steps, codec_reencode)}")
+
+
+if __name__ == "__main__":
+    main()
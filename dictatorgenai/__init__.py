@@ -14,6 +14,7 @@ from .command_chains.command_chain import CommandChain
 from .command_chains.default_command_chain import DefaultCommandChain
 from .conversations.base_conversation import BaseConversation
 from .conversations.group_chat import GroupChat
+from .conversations.refinement_chat import RefinementChat
 from .conversations.nested_chat import NestedChat
 from .conversations.sequential_chat import SequentialChat
 from .conversations.two_agent_chat import TwoAgentChat
@@ -46,6 +47,7 @@ __all__ = [
     "Message",
     "BaseConversation",
     "GroupChat",
+    "RefinementChat",
     "NestedChat",
     "SequentialChat",
     "TwoAgentChat",
@@ -5,7 +5,9 @@ It includes the BaseAgent, General, and Dictator classes.
 """
 
 from .base_agent import BaseAgent
-from .tool import tool
+from .tool import tool, ToolUnavailableError
+from .tool_cache import ToolCache, InMemoryToolCache, SQLiteToolCache
+from .tool_selector import ToolSelector
 from .dictator import Dictator
 from .general import General, TaskExecutionError
 from .information_officer import InformationOfficer
@@ -17,6 +19,11 @@ from .assigned_general  import AssignedGeneral
 __all__ = [
     "BaseAgent",
     "tool",
+    "ToolUnavailableError",
+    "ToolCache",
+    "InMemoryToolCache",
+    "SQLiteToolCache",
+    "ToolSelector",
     "Dictator",
     "General",
     "Majordomo",
@@ -1,4 +1,5 @@
-from typing import List, Dict, Optional, TypedDict
+import asyncio
+from typing import Any, List, Dict, Optional, TypedDict
 from .general import General  # ou le bon chemin
 from dictatorgenai.utils.task import Task
 
@@ -7,11 +8,17 @@ class CapabilityUsed(TypedDict):
     explanation: str
     subtasks: List[str]
     sources: List[str]
+    legal_queries: List[str]
 
 class AssignedGeneral(General):
     """
     Décorateur de General qui ajoute des métadonnées sur une tâche assignée spécifique.
     Utilisé pour contextualiser un général sélectionné pour une sous-tâche donnée.
+
+    C'est une vue légère : `General.__init__` n'est pas rejoué, les attributs (modèle, outils,
+    schémas...) sont lus sur le général de base. Seuls les attributs modifiés sur la vue
+    (ex. `is_dictator`) lui sont propres, ainsi que l'état d'une requête (`conversation_history`,
+    `failed_attempts`) : il ne s'accumule pas sur le général de base d'une requête à l'autre.
     """
 
     def __init__(
@@ -21,19 +28,59 @@ class AssignedGeneral(General):
         capabilities_used: Optional[List[CapabilityUsed]] = None,
         confidence: Optional[float] = None,
     ):
-        # Copier les attributs initiaux du general de base
-        super().__init__(
-            my_name_is=base_general.my_name_is,
-            iam=base_general.iam,
-            my_capabilities_are=base_general.my_capabilities_are,
-            nlp_model=base_general.nlp_model,
-        )
+        # Ne pas empiler les vues d'une requête à l'autre
+        if isinstance(base_general, AssignedGeneral):
+            base_general = base_general._base_general
 
         # Ajouts spécifiques
         self._base_general = base_general
+        self.is_dictator = False
+        self.conversation_history: List[Dict] = []
+        self.failed_attempts = 0
         self.assigned_subtasks = assigned_subtasks or []
         self.capabilities_used = capabilities_used or []
         self.confidence = confidence or 0.0
+        # Résultats des outils de recherche lancés sur les `legal_queries` dès la sélection du général
+        self.prefetch_results: List[Dict[str, Any]] = []
+        self._prefetch: Optional[asyncio.Task] = None
+
+    @property
+    def legal_queries(self) -> List[str]:
+        """
+        Les `legal_queries` de toutes les capacités utilisées, sans doublon.
+        """
+        queries: Dict[str, None] = {}
+        for capability in self.capabilities_used:
+            if isinstance(capability, dict):
+                queries.update(dict.fromkeys(str(query) for query in capability.get("legal_queries", []) or []))
+        return list(queries)
+
+    def start_prefetch(self, task: Optional[Task] = None) -> Optional[asyncio.Task]:
+        """
+        Lance en tâche de fond les outils de recherche du général sur ses `legal_queries`.
+
+        Args:
+            task (Optional[Task]): La tâche où enregistrer les appels d'outils.
+
+        Returns:
+            Optional[asyncio.Task]: La tâche de fond, ou None si le général n'a pas d'outil de recherche
+                ou pas de `legal_queries`.
+        """
+        queries = self.legal_queries
+        if self._prefetch is None and queries and self.get_retrieval_tools():
+            self._prefetch = asyncio.create_task(self.prefetch_retrievals(queries, task=task))
+        return self._prefetch
+
+    async def wait_for_prefetch(self) -> List[Dict[str, Any]]:
+        """
+        Attend la fin du préchargement et retourne ses résultats (liste vide s'il a échoué).
+        """
+        if self._prefetch is not None and not self.prefetch_results:
+            try:
+                self.prefetch_results = await self._prefetch
+            except Exception as e:
+                self.logger.warning(f"Retrieval prefetch of {self.my_name_is} failed: {e}")
+        return self.prefetch_results
 
     async def solve_task(self, task: Task, **kwargs):
         """
@@ -49,8 +96,23 @@ class AssignedGeneral(General):
         async for chunk in self._base_general.solve_task(task, **kwargs):
             yield chunk
 
+    def generate_tool_schemas(self) -> list:
+        """
+        Réutilise les schémas d'outils mis en cache par le général de base.
+        """
+        return self._base_general.generate_tool_schemas()
+
+    def get_tool_selector(self):
+        """
+        Réutilise l'index des outils du général de base.
+        """
+        return self._base_general.get_tool_selector()
+
     def __getattr__(self, item):
         """
         Délègue les appels d'attributs non définis à l'objet décoré.
         """
+        if item == "_base_general":
+            # Vue pas encore initialisée (ex. copie ou désérialisation)
+            raise AttributeError(item)
         return getattr(self._base_general, item)
@@ -1,8 +1,10 @@
+import inspect
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Type
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type
 
 from dictatorgenai.utils.task import Task 
+from .tool_selector import ToolSelector
 
 class TaskExecutionError(Exception):
     """Custom exception raised when a task execution fails."""
@@ -19,6 +21,9 @@ class BaseAgent(ABC):
         tools (Dict[str, Callable]): Dictionary of registered tools for the agent.
     """
 
+    # Noms des méthodes @tool de chaque classe, calculés une seule fois par classe
+    _internal_tool_names: ClassVar[Dict[Type, Tuple[str, ...]]] = {}
+
     def __init__(self, my_name_is: str, my_capabilities_are: List[Dict[str, str]], tools = None):
         """
         Initializes the BaseAgent with the given name.
@@ -32,16 +37,37 @@ class BaseAgent(ABC):
         self.conversation_history: List[Dict] = []  # Track the message history
         self.logger = logging.getLogger(self.my_name_is)
         self.tools: Dict[str, Callable] = {}
+        self._tool_schemas: Optional[list] = None
+        self._tool_schemas_key: Optional[tuple] = None
+        self._tool_selector: Optional[ToolSelector] = None
+        self._tool_selector_key: Optional[tuple] = None
         self._register_internal_tools()
         if tools:
             self._register_external_tools(tools)
 
+    @classmethod
+    def get_internal_tool_names(cls) -> Tuple[str, ...]:
+        """
+        Returns the names of the methods of the class decorated with @tool.
+
+        The class is scanned once and the result is cached, so that creating agents does not
+        walk every attribute of the instance.
+        """
+        names = BaseAgent._internal_tool_names.get(cls)
+        if names is None:
+            names = tuple(
+                attr_name
+                for attr_name in dir(cls)
+                if callable(attr := inspect.getattr_static(cls, attr_name, None))
+                and getattr(attr, "is_tool", False)
+            )
+            BaseAgent._internal_tool_names[cls] = names
+        return names
+
     def _register_internal_tools(self):
         """Register tools defined within the class (decorated with @tool)."""
-        for attr_name in dir(self):
-            attr = getattr(self, attr_name)
-            if callable(attr) and getattr(attr, "is_tool", False):
-                self.tools[attr_name] = attr
+        for attr_name in self.get_internal_tool_names():
+            self.tools[attr_name] = getattr(self, attr_name)
 
     def _register_external_tools(self, tools: List[Callable]):
         """Register external tools passed as arguments to the constructor."""
@@ -55,9 +81,16 @@ class BaseAgent(ABC):
         """
         Generate tool schemas for API compatibility with OpenAI's expected structure.
 
+        The schemas are cached and only rebuilt when the registered tools change. The returned
+        list is shared and must not be modified.
+
         Returns:
             list: A list of tool schemas structured for OpenAI.
         """
+        key = tuple((tool_name, id(tool_func)) for tool_name, tool_func in self.tools.items())
+        if self._tool_schemas is not None and key == self._tool_schemas_key:
+            return self._tool_schemas
+
         schemas = []
         for tool_name, tool_func in self.tools.items():
             parameters = getattr(tool_func, "tool_parameters", {
@@ -75,8 +108,23 @@ class BaseAgent(ABC):
                 },
             }
             schemas.append(schema)
+        self._tool_schemas = schemas
+        self._tool_schemas_key = key
         return schemas
 
+    def get_tool_selector(self) -> ToolSelector:
+        """
+        Returns the keyword index of the registered tools, rebuilt only when the tools change.
+
+        Returns:
+            ToolSelector: The selector ranking the tools of the agent against a query.
+        """
+        key = tuple((tool_name, id(tool_func)) for tool_name, tool_func in self.tools.items())
+        if self._tool_selector is None or key != self._tool_selector_key:
+            self._tool_selector = ToolSelector(self.tools)
+            self._tool_selector_key = key
+        return self._tool_selector
+
 
 
 
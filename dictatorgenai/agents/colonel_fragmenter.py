@@ -46,11 +46,10 @@ class ColonelFragmenter(General):
         :param task: La tâche que nous devons découper en sous-tâches.
         :return: Un prompt structuré pour une IA d'analyse juridique.
         """
-        # Filtrer les messages utiles dans l'historique de la conversation
+        # Filtrer les messages utiles dans l'historique de la conversation (précédés du résumé des tours compactés)
         conversation_history = [
             {"role": step.role, "content": step.content}
-            for step in task.steps
-            if step.step_type in ("user_message", "assistant_message")  # Filtrage des messages pertinents
+            for step in task.get_context_steps(("user_message", "assistant_message"))
         ]
 
         # 🔹 Conversion en JSON formaté
@@ -1,17 +1,22 @@
 import asyncio
+import inspect
 import logging
-from typing import AsyncGenerator, List, Dict, Generator, Optional, Any
-
+import time
+import weakref
+from typing import AsyncGenerator, List, Dict, Optional, Any
 
 from dictatorgenai.events.base_event_manager import BaseEventManager
 from dictatorgenai.events.event import Event, EventType
 from dictatorgenai.utils.task import Task 
 from dictatorgenai.steps import ToolExecutionStep
 from .base_agent import BaseAgent
-from dictatorgenai.models import BaseModel, Message
+from .tool import run_batched_tool, run_streaming_tool, run_tool
+from .tool_selector import ToolSelector
+from dictatorgenai.models import BaseModel
+from dictatorgenai.models.tool_call_assembler import StreamedToolCall, StreamUsage
 from dictatorgenai.config import DictatorSettings
+from pydantic import ValidationError
 import json
-import re
 
 
 class TaskExecutionError(Exception):
@@ -40,8 +45,10 @@ class TaskExecutionError(Exception):
         return base_message
 
 
-
 class General(BaseAgent):
+    # Outil fictif proposé quand seule une sélection des outils est envoyée au modèle
+    ALL_TOOLS_REQUEST = "request_all_tools"
+
     def __init__(
         self,
         my_name_is: str,
@@ -52,6 +59,10 @@ class General(BaseAgent):
         tools=None,
         is_dictator: bool = False,
         event_manager: BaseEventManager | None = None,
+        max_concurrent_tools: int = 5,
+        max_tool_iterations: int = 10,
+        tool_loop_timeout: Optional[float] = None,
+        tool_top_k: Optional[int] = None,
     ):
         super().__init__(my_name_is, my_capabilities_are=my_capabilities_are ,tools=tools)
         self.my_name_is = my_name_is
@@ -63,9 +74,17 @@ class General(BaseAgent):
         self.failed_attempts = 0
         self.logger = logging.getLogger(self.my_name_is)
         self.event_manager = event_manager
+        # Nombre maximal d'appels d'outils exécutés en parallèle par cet agent
+        self.max_concurrent_tools = max_concurrent_tools
+        self._tool_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        # Bornes de la boucle d'appels d'outils : nombre de tours et durée (secondes) avant de forcer une réponse finale
+        self.max_tool_iterations = max_tool_iterations
+        self.tool_loop_timeout = tool_loop_timeout
+        # Nombre d'outils envoyés au modèle à chaque complétion, les plus pertinents pour la tâche (None : tous)
+        self.tool_top_k = tool_top_k
 
     # Making the agent communicate with others
-    async def send_message(self, recipient: 'General', message: str, task: Task) -> str:
+    async def send_message(self, recipient: 'General', message: str, task: Task, **kwargs: Any) -> str:
         # Store the outgoing message in the conversation history
         self.conversation_history.append({
             "role": "sender",
@@ -73,9 +92,9 @@ class General(BaseAgent):
             "message": message
         })
         self.logger.debug(f"{self.my_name_is} sends message to {recipient.my_name_is}: {message}")
-        return await recipient.receive_message(self, message, task=task)
+        return await recipient.receive_message(self, message, task=task, **kwargs)
 
-    async def receive_message(self, sender: 'General', message: str, task: Task) -> str:
+    async def receive_message(self, sender: 'General', message: str, task: Task, **kwargs: Any) -> str:
         # Store the incoming message in the conversation history
         self.conversation_history.append({
             "role": "receiver",
@@ -84,101 +103,682 @@ class General(BaseAgent):
         })
         self.logger.debug(f"{self.my_name_is} received message from {sender.my_name_is}: {message}")
         # Process the message and formulate a reply
-        reply = await self.process_message(sender, message, task=task)
+        reply = await self.process_message(sender, message, task=task, **kwargs)
         return reply
 
     # def process_message(self, sender: 'General', message: str) -> str:
     #     # The agent processes the message and generates a response
     #     return f"{self.my_name_is} acknowledges the message from {sender.my_name_is}."
 
-
-    async def _execute_tool(self, function_name: str, arguments: Dict) -> str:
-        print('execute tool', function_name, arguments)
+    async def _execute_tool(
+        self,
+        function_name: str,
+        arguments: Dict,
+        metadata: Optional[Dict] = None,
+        task: Optional[Task] = None,
+        continuations: Optional[List[Dict]] = None,
+    ) -> str:
         """
         Executes a tool based on its name and the provided arguments.
 
+        Synchronous tools are dispatched according to the execution policy declared on `@tool`
+        (inline, thread pool or process pool), so that they never block the event loop.
+        Results of tools declared `cacheable=True` are looked up in the tool cache first.
+        Async generator tools publish every page they yield as a `tool_progress` event; with
+        `stream_mode="first_page"`, the first page is returned while the rest is still being fetched.
+
         Args:
             function_name (str): The name of the tool to execute.
             arguments (Dict): The arguments for the tool as a dictionary.
+            metadata (Optional[Dict]): If provided, filled with execution details (`cache`: "hit" or "miss",
+                `stream`: "first_page" for a partial result).
+            task (Optional[Task]): The task the tool is executed for, referenced by the progress events.
+            continuations (Optional[List[Dict]]): Receives the pending remainder of a first-page result,
+                see `_drain_tool_continuations`. Without it, async generator tools are always collected.
 
         Returns:
             str: The result of the tool execution as a JSON string, or an error message if the tool is not found or arguments are invalid.
         """
+        self.logger.debug(f"Executing tool {function_name} with {arguments}")
         tool = self.tools.get(function_name)
         if not tool:
             return json.dumps({"error": f"Tool '{function_name}' not found."})
 
         # Validate arguments and execute the tool
         try:
-            # Use Pydantic model for argument validation if provided
-            if hasattr(tool, "tool_model") and tool.tool_model:
-                tool_model = tool.tool_model
-                validated_args = tool_model(**arguments)  # Validate arguments using Pydantic
-                arguments = validated_args.dict()
-
-            # Check if the tool is a coroutine and execute it
-            if asyncio.iscoroutinefunction(tool):
-                result = await tool(**arguments)
+            # Validate arguments with the validator compiled by @tool
+            validator = getattr(tool, "tool_validator", None)
+            validated_args = None
+            is_batch = getattr(tool, "tool_batch", False)
+            if validator is not None:
+                validated_args = validator.validate_python(arguments)
+                if not is_batch:
+                    # Top-level fields only: nested models and enums are passed to the tool as such
+                    arguments = dict(validated_args)
+
+            cache_key = None
+            if getattr(tool, "tool_cacheable", False):
+                tool_cache = DictatorSettings.get_tool_cache()
+                cache_arguments = validator.dump_python(validated_args, mode="json") if validator is not None else arguments
+                cache_key = tool_cache.make_key(function_name, cache_arguments)
+                hit, result = tool_cache.get(cache_key)
+                if metadata is not None:
+                    metadata["cache"] = "hit" if hit else "miss"
+                if hit:
+                    return json.dumps({"result": result})
+
+            # Execute the tool according to its execution policy; calls to a batch tool are merged
+            if is_batch:
+                result = await run_batched_tool(tool, validated_args)
+            elif inspect.isasyncgenfunction(tool):
+                result, partial = await self._run_streaming_tool(tool, function_name, arguments, task, continuations)
+                if partial:
+                    # Le reste des pages sera ajouté à la conversation avant la complétion suivante
+                    if metadata is not None:
+                        metadata["stream"] = "first_page"
+                    return json.dumps({
+                        "result": result,
+                        "partial": True,
+                        "note": "First page only: the remaining pages are still being fetched and will be provided before your next turn.",
+                    })
             else:
-                result = tool(**arguments)
+                result = await run_tool(tool, arguments)
+
+            if cache_key is not None:
+                tool_cache.set(cache_key, result, ttl=getattr(tool, "tool_cache_ttl", None))
 
             return json.dumps({"result": result})
 
+        except ValidationError as e:
+            # Invalid arguments: concise errors so that the model can fix its call
+            errors = "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc']) or 'arguments'}: {error['msg']}"
+                for error in e.errors(include_url=False)
+            )
+            self.logger.error(f"Invalid arguments for tool '{function_name}': {errors}")
+            return json.dumps({"error": f"Invalid arguments for tool '{function_name}': {errors}"})
+
         except Exception as e:
             # Handle exceptions during tool execution or argument validation
             self.logger.error(f"Error executing tool '{function_name}': {e}")
             return json.dumps({"error": f"Error executing tool '{function_name}': {str(e)}"})
 
+    async def _execute_tool_calls(
+        self,
+        tool_calls: List[Any],
+        task: Optional[Task] = None,
+        continuations: Optional[List[Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Exécute en parallèle tous les appels d'outils d'un tour du modèle.
+
+        At most `max_concurrent_tools` calls of this agent run at the same time. The tool messages
+        are returned, and the `ToolExecutionStep` recorded, in the order of the calls.
+
+        Args:
+            tool_calls (List[Any]): Les `tool_calls` renvoyés par le modèle.
+            task (Optional[Task]): Si fournie, chaque appel y est enregistré en `ToolExecutionStep`.
+            continuations (Optional[List[Dict]]): Reçoit la suite des résultats partiels (voir `_execute_tool`).
+
+        Returns:
+            List[Dict]: Un message `tool` par appel, dans l'ordre des appels.
+        """
+        results = await asyncio.gather(*[self._run_tool_call(call, task, continuations) for call in tool_calls])
+        return await self._record_tool_results(tool_calls, results, task=task)
+
+    async def _run_tool_call(
+        self,
+        call: Any,
+        task: Optional[Task] = None,
+        continuations: Optional[List[Dict]] = None,
+    ) -> Optional[tuple]:
+        """
+        Exécute un appel d'outil du modèle, dans la limite de `max_concurrent_tools` appels simultanés.
+
+        Returns:
+            Optional[tuple]: `(function_name, arguments, result, execution_metadata)`, None if the call has no function.
+        """
+        function = call.function
+        if not function:
+            return None  # Skip if no function is defined
+
+        # Extract name and arguments
+        function_name = function.name
+        try:
+            arguments = json.loads(function.arguments or "{}")
+        except json.JSONDecodeError as e:
+            return function_name, {}, json.dumps({"error": f"Invalid arguments for tool '{function_name}': {e}"}), {}
+
+        if function_name == self.ALL_TOOLS_REQUEST:
+            # Le modèle demande l'ensemble des outils : ils lui sont envoyés au prochain tour
+            return function_name, arguments, json.dumps({"result": "All the tools are now available."}), {"tool_set": "all"}
+
+        execution_metadata: Dict[str, Any] = {}
+        try:
+            async with self._get_tool_semaphore():
+                result = await self._execute_tool(
+                    function_name, arguments, metadata=execution_metadata, task=task, continuations=continuations
+                )
+        except Exception as e:
+            self.logger.error(f"Error executing tool {function_name}: {e}")
+            result = json.dumps({"error": str(e)})
+        return function_name, arguments, result, execution_metadata
+
+    def _get_tool_semaphore(self) -> asyncio.Semaphore:
+        """
+        Sémaphore limitant à `max_concurrent_tools` les appels d'outils de l'agent dans la boucle courante.
+
+        Un sémaphore asyncio est lié à la boucle qui l'utilise en premier : l'agent en garde un par boucle.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._tool_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._tool_semaphores[loop] = asyncio.Semaphore(self.max_concurrent_tools)
+        return semaphore
+
+    async def _record_tool_results(self, tool_calls: List[Any], results: List[Optional[tuple]], task: Optional[Task] = None) -> List[Dict]:
+        """
+        Construit les messages `tool` des appels exécutés et enregistre leurs `ToolExecutionStep`, dans l'ordre des appels.
+        """
+        tool_messages = []
+        for call, executed in zip(tool_calls, results):
+            if executed is None:
+                continue
+            function_name, arguments, result, execution_metadata = executed
+            # Les sorties volumineuses sont écrites une seule fois dans le blob store
+            output, output_ref = await self._offload_tool_output(result)
+            # Append the tool's result to the messages (already a JSON string)
+            tool_messages.append({"role": "tool", "content": self._tool_output_prompt_view(result, output_ref), "tool_call_id": call.id})
+            if task is not None:
+                # Add ToolStep to the task
+                task.add_step(ToolExecutionStep(
+                    request_id=len(task.steps) + 1,
+                    tool_name=function_name,
+                    arguments=arguments,
+                    output=output,
+                    output_ref=output_ref,
+                    metadata={"executed_by": self.my_name_is, **execution_metadata}
+                ))
+        return tool_messages
+
+    @staticmethod
+    async def _offload_tool_output(output: str) -> tuple:
+        """
+        Stocke hors ligne une sortie d'outil dépassant `DictatorSettings.blob_threshold`.
+
+        The blob is written with `BlobStore.aput`, off the event loop for stores doing I/O.
+
+        Returns:
+            tuple: `(output, None)` for a small output, `(preview, ref)` for a large one.
+        """
+        if len(output) <= DictatorSettings.blob_threshold:
+            return output, None
+        output_ref = await DictatorSettings.get_blob_store().aput(output)
+        preview = output[:DictatorSettings.blob_preview_chars]
+        return f"{preview}… [{len(output)} characters, full output in {output_ref}]", output_ref
+
+    @staticmethod
+    def _tool_output_prompt_view(output: str, output_ref: Optional[str] = None) -> str:
+        """
+        Vue d'une sortie d'outil envoyée au modèle, tronquée si `DictatorSettings.tool_output_prompt_chars` est défini.
+        """
+        max_chars = DictatorSettings.tool_output_prompt_chars
+        if not max_chars or len(output) <= max_chars:
+            return output
+        return f"{output[:max_chars]}… [truncated, {len(output)} characters{f' stored in {output_ref}' if output_ref else ''}]"
+
+    async def _run_streaming_tool(
+        self,
+        tool: Any,
+        function_name: str,
+        arguments: Dict[str, Any],
+        task: Optional[Task] = None,
+        continuations: Optional[List[Dict]] = None,
+    ) -> tuple:
+        """
+        Exécute un outil écrit en générateur asynchrone, en publiant chaque page en événement `tool_progress`.
+
+        With `stream_mode="first_page"` and a `continuations` list, returns as soon as the first page
+        is yielded; the generator keeps running and its pending remainder is added to `continuations`.
+
+        Returns:
+            tuple: `(pages, partial)`, where `partial` is True if only the first page is returned.
+        """
+        first_page = asyncio.get_running_loop().create_future()
+
+        async def on_chunk(index: int, chunk: Any):
+            if index == 0 and not first_page.done():
+                first_page.set_result(chunk)
+            if self.event_manager is not None:
+                await self.event_manager.publish(Event(
+                    EventType.TOOL_PROGRESS,
+                    f"Tool '{function_name}' returned page {index + 1}.",
+                    task.task_id if task is not None else None,
+                    details={"tool": function_name, "arguments": arguments, "page": index, "content": chunk},
+                ))
+
+        if continuations is None or getattr(tool, "tool_stream_mode", "collect") != "first_page":
+            return await run_streaming_tool(tool, arguments, on_chunk=on_chunk), False
+
+        stream = asyncio.create_task(run_streaming_tool(tool, arguments, on_chunk=on_chunk))
+        try:
+            await asyncio.wait({stream, first_page}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            stream.cancel()
+            raise
+        if stream.done():
+            # Terminé (ou en échec) avant la première page : le résultat complet est renvoyé
+            return stream.result(), False
+        continuations.append({"tool": function_name, "arguments": arguments, "stream": stream})
+        return [first_page.result()], True
+
+    async def _drain_tool_continuations(self, continuations: List[Dict], task: Optional[Task] = None, cancel: bool = False) -> List[Dict]:
+        """
+        Retire de `continuations` les suites de résultats partiels terminées et construit leurs messages.
+
+        Each finished remainder is recorded as a `ToolExecutionStep` marked `stream: "continuation"`.
+
+        Args:
+            continuations (List[Dict]): Les suites en attente, remplies par `_execute_tool`.
+            task (Optional[Task]): Si fournie, chaque suite terminée y est enregistrée en `ToolExecutionStep`.
+            cancel (bool): Annule les suites encore en cours (fin de la boucle d'outils).
+
+        Returns:
+            List[Dict]: Un message par suite terminée, à ajouter avant la complétion suivante.
+        """
+        messages = []
+        for continuation in list(continuations):
+            stream = continuation["stream"]
+            if not stream.done():
+                if cancel:
+                    self.logger.info(f"Remaining pages of tool '{continuation['tool']}' are no longer needed.")
+                    stream.cancel()
+                    continuations.remove(continuation)
+                continue
+            continuations.remove(continuation)
+            if stream.cancelled():
+                continue
+
+            error = stream.exception()
+            if error is not None:
+                self.logger.error(f"Error executing tool '{continuation['tool']}': {error}")
+                result = json.dumps({"error": f"Error executing tool '{continuation['tool']}': {error}"})
+            else:
+                result = json.dumps({"result": stream.result()[1:]})
+            output, output_ref = await self._offload_tool_output(result)
+            messages.append({
+                "role": "system",
+                "content": (
+                    f"Remaining pages of the tool '{continuation['tool']}' called with {json.dumps(continuation['arguments'])}: "
+                    f"{self._tool_output_prompt_view(result, output_ref)}"
+                ),
+            })
+            if task is not None:
+                task.add_step(ToolExecutionStep(
+                    request_id=len(task.steps) + 1,
+                    tool_name=continuation["tool"],
+                    arguments=continuation["arguments"],
+                    output=output,
+                    output_ref=output_ref,
+                    metadata={"executed_by": self.my_name_is, "stream": "continuation"}
+                ))
+        return messages
+
+    def _streams_tool_calls(self, tools_definitions: Optional[List[Dict]]) -> bool:
+        """
+        Indique si les appels d'outils peuvent être exécutés pendant la génération de la complétion.
+        """
+        return bool(tools_definitions) and getattr(self.nlp_model, "supports_streaming_tool_calls", False)
+
+    async def _tool_turn(
+        self,
+        messages: List[Any],
+        tools_definitions: Optional[List[Dict]],
+        completion_kwargs: Dict[str, Any],
+        token_usage: Optional[Dict[str, int]] = None,
+        task: Optional[Task] = None,
+        continuations: Optional[List[Dict]] = None,
+    ) -> tuple:
+        """
+        Effectue un tour de la boucle d'outils : une complétion, puis l'exécution de ses appels d'outils.
+
+        See `_stream_tool_turn`; the content is only returned once the turn is over.
+
+        Returns:
+            tuple: `(content, tool_calls, turn_messages)`, where `turn_messages` are the assistant message
+                and the tool messages to append to the conversation (empty without tool calls).
+        """
+        async for item in self._stream_tool_turn(
+            messages, tools_definitions, completion_kwargs, token_usage=token_usage, task=task,
+            continuations=continuations,
+        ):
+            if isinstance(item, tuple):
+                return item
+
+    async def _stream_tool_turn(
+        self,
+        messages: List[Any],
+        tools_definitions: Optional[List[Dict]],
+        completion_kwargs: Dict[str, Any],
+        token_usage: Optional[Dict[str, int]] = None,
+        task: Optional[Task] = None,
+        continuations: Optional[List[Dict]] = None,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Effectue un tour de la boucle d'outils en diffusant le contenu au fur et à mesure.
+
+        When the model streams its tool calls, each call starts as soon as its arguments are complete,
+        so that tool latency overlaps with the generation of the following calls, and the content
+        fragments are yielded as they arrive. Only the tool calls are buffered. The remainders of
+        first-page results are added to `continuations`.
+
+        Yields:
+            str | tuple: Les fragments de contenu (seulement quand le modèle diffuse ses appels d'outils),
+                puis `(content, tool_calls, turn_messages)`, où `turn_messages` sont le message assistant
+                et les messages d'outils à ajouter à la conversation (vide sans appels d'outils).
+        """
+        if not self._streams_tool_calls(tools_definitions):
+            response = await self.nlp_model.chat_completion(messages, tools=tools_definitions, **completion_kwargs)
+            self._record_usage(response, token_usage)
+            message = response.message
+            tool_calls = getattr(message, "tool_calls", None)
+            content = getattr(message, "content", None)
+            if not tool_calls or tools_definitions is None:
+                yield content, None, []
+                return
+            # Exécute tous les appels du tour en parallèle, les résultats restent dans l'ordre des appels
+            yield content, tool_calls, [message, *await self._execute_tool_calls(tool_calls, task=task, continuations=continuations)]
+            return
+
+        content_parts: List[str] = []
+        tool_calls: List[StreamedToolCall] = []
+        running: List[asyncio.Task] = []
+        try:
+            async for item in self.nlp_model.stream_chat_completion(
+                messages, tools=tools_definitions, yield_tool_calls=True, **completion_kwargs
+            ):
+                if isinstance(item, StreamedToolCall):
+                    # L'appel démarre pendant que le modèle génère les suivants
+                    tool_calls.append(item)
+                    running.append(asyncio.create_task(self._run_tool_call(item, task, continuations)))
+                elif isinstance(item, StreamUsage):
+                    self._record_usage(item, token_usage)
+                elif item:
+                    content_parts.append(item)
+                    yield item
+            results = await asyncio.gather(*running)
+        except BaseException:
+            for running_call in running:
+                running_call.cancel()
+            raise
+
+        content = "".join(content_parts)
+        if not tool_calls:
+            yield content, None, []
+            return
+        assistant_message = {
+            "role": "assistant",
+            "content": content or None,
+            "tool_calls": [tool_call.to_dict() for tool_call in tool_calls],
+        }
+        yield content, tool_calls, [assistant_message, *await self._record_tool_results(tool_calls, results, task=task)]
+
+    def select_tool_schemas(self, query: Optional[str]) -> List[Dict]:
+        """
+        Sélectionne les schémas des `tool_top_k` outils les plus pertinents pour une requête.
+
+        When only a subset is sent, a `request_all_tools` tool is added so that the model can ask
+        for the full set if none of the selected tools fits.
+
+        Args:
+            query (Optional[str]): Ce que l'agent doit faire (sous-tâches, recherches juridiques...).
+                None envoie tous les outils.
+
+        Returns:
+            List[Dict]: Les schémas des outils à envoyer au modèle.
+        """
+        schemas = self.generate_tool_schemas()
+        if not query or not self.tool_top_k or len(schemas) <= self.tool_top_k:
+            return schemas
+
+        selected = set(self.get_tool_selector().select(query, self.tool_top_k))
+        return [schema for schema in schemas if schema["function"]["name"] in selected] + [{
+            "type": "function",
+            "function": {
+                "name": self.ALL_TOOLS_REQUEST,
+                "description": "Only a selection of the tools is available. Call this if none of them fits, to get all the tools.",
+                "parameters": {"type": "object", "properties": {}, "required": [], "additionalProperties": False},
+            },
+        }]
+
+    def _tool_selection_query(self, task: Task, message: Optional[str] = None) -> str:
+        """
+        Construit la requête de sélection des outils : la tâche, le message reçu, et pour un général
+        assigné, ses sous-tâches, capacités utilisées et `legal_queries`.
+        """
+        parts = [task.request, message or ""]
+        for capability in getattr(self, "capabilities_used", None) or []:
+            if not isinstance(capability, dict):
+                continue
+            parts.append(str(capability.get("capability", "")))
+            parts.append(str(capability.get("explanation", "")))
+            parts.extend(str(subtask) for subtask in capability.get("subtasks", []) or [])
+            parts.extend(str(query) for query in capability.get("legal_queries", []) or [])
+        return "\n".join(part for part in parts if part)
+
+    def _requests_all_tools(self, tool_calls: List[Any]) -> bool:
+        """
+        Indique si le modèle a appelé `request_all_tools`.
+        """
+        return any(
+            getattr(getattr(call, "function", None), "name", None) == self.ALL_TOOLS_REQUEST
+            for call in tool_calls
+        )
+
+    def get_retrieval_tools(self) -> Dict[str, Any]:
+        """
+        Retourne les outils de recherche (déclarés avec `@tool(query_param=...)`), par nom.
+        """
+        return {
+            name: tool_func for name, tool_func in self.tools.items()
+            if getattr(tool_func, "tool_query_param", None)
+        }
+
+    async def prefetch_retrievals(self, queries: List[str], task: Optional[Task] = None) -> List[Dict[str, Any]]:
+        """
+        Exécute en parallèle les outils de recherche sur des requêtes, avant la première complétion.
 
+        Each query is sent to the retrieval tool that best matches it (see `ToolSelector`), or to
+        the only retrieval tool of the agent. Every call is recorded as a `ToolExecutionStep`
+        marked `prefetch`.
 
+        Args:
+            queries (List[str]): Les requêtes de recherche (ex. `legal_queries`).
+            task (Optional[Task]): Si fournie, chaque appel y est enregistré en `ToolExecutionStep`.
 
-    async def _process_with_tools(self, initial_messages: List[Dict], streaming: bool = False) -> AsyncGenerator[str, None]:
+        Returns:
+            List[Dict[str, Any]]: Les résultats obtenus, `{"query", "tool", "result"}`, dans l'ordre des requêtes.
+                Failed calls are left out.
+        """
+        retrieval_tools = self.get_retrieval_tools()
+        if not retrieval_tools or not queries:
+            return []
+        selector = ToolSelector(retrieval_tools) if len(retrieval_tools) > 1 else None
+
+        calls = []
+        for query in dict.fromkeys(query for query in queries if query):
+            tool_name = selector.select(query, 1)[0] if selector else next(iter(retrieval_tools))
+            calls.append((query, tool_name, {retrieval_tools[tool_name].tool_query_param: query}))
+
+        semaphore = self._get_tool_semaphore()
+
+        async def run(tool_name: str, arguments: Dict[str, Any]) -> tuple:
+            execution_metadata: Dict[str, Any] = {}
+            async with semaphore:
+                output = await self._execute_tool(tool_name, arguments, metadata=execution_metadata)
+            return output, execution_metadata
+
+        executed = await asyncio.gather(*[run(tool_name, arguments) for _, tool_name, arguments in calls])
+
+        results = []
+        for (query, tool_name, arguments), (output, execution_metadata) in zip(calls, executed):
+            step_output, output_ref = await self._offload_tool_output(output)
+            if task is not None:
+                task.add_step(ToolExecutionStep(
+                    request_id=len(task.steps) + 1,
+                    tool_name=tool_name,
+                    arguments=arguments,
+                    output=step_output,
+                    output_ref=output_ref,
+                    metadata={"executed_by": self.my_name_is, "prefetch": True, **execution_metadata}
+                ))
+            payload = json.loads(output)
+            if "error" in payload:
+                self.logger.warning(f"Prefetch of '{query}' with tool '{tool_name}' failed: {payload['error']}")
+                continue
+            result = payload.get("result")
+            if output_ref and DictatorSettings.tool_output_prompt_chars:
+                result = self._tool_output_prompt_view(json.dumps(result, ensure_ascii=False), output_ref)
+            results.append({"query": query, "tool": tool_name, "result": result, "output_ref": output_ref})
+        return results
+
+    def _tool_loop_exhausted(self, iterations: int, started_at: float) -> bool:
+        """
+        Indique si la boucle d'appels d'outils a atteint `max_tool_iterations` tours ou `tool_loop_timeout` secondes.
+        """
+        if self.max_tool_iterations is not None and iterations >= self.max_tool_iterations:
+            self.logger.warning(f"Tool loop stopped after {iterations} iterations.")
+            return True
+        if self.tool_loop_timeout is not None and time.monotonic() - started_at >= self.tool_loop_timeout:
+            self.logger.warning(f"Tool loop stopped after {self.tool_loop_timeout}s.")
+            return True
+        return False
+
+    @staticmethod
+    def _tool_loop_exhausted_message() -> Dict:
+        """
+        Message demandant au modèle une réponse finale sans nouvel appel d'outil.
+        """
+        return {
+            "role": "system",
+            "content": (
+                "The tool budget for this request is exhausted. Do not call any more tools: "
+                "answer now with the information already gathered, and state what could not be verified."
+            ),
+        }
+
+    async def _process_with_tools(
+        self,
+        initial_messages: List[Dict],
+        streaming: bool = False,
+        max_tokens: Optional[int] = None,
+        token_usage: Optional[Dict[str, int]] = None,
+        task: Optional[Task] = None,
+        tool_query: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
         """
         Gère les appels successifs de fonctions (tools) et retourne la réponse finale,
         ou diffuse les réponses au fur et à mesure si `streaming` est True.
+
+        Args:
+            initial_messages (List[Dict]): Les messages de départ.
+            streaming (bool): Diffuse la réponse au fur et à mesure.
+            max_tokens (Optional[int]): Nombre maximal de tokens générés par l'ensemble des complétions de
+                la boucle d'outils : chaque complétion est limitée à ce qu'il en reste (voir `_completion_budget`).
+            token_usage (Optional[Dict[str, int]]): Si fourni, cumule les tokens consommés
+                (`prompt_tokens`, `completion_tokens`) par les complétions.
+            task (Optional[Task]): Si fournie, chaque appel d'outil y est enregistré en `ToolExecutionStep`.
+            tool_query (Optional[str]): Si fournie et `tool_top_k` défini, seuls les outils les plus
+                pertinents pour cette requête sont envoyés au modèle.
         """
         messages = initial_messages.copy()
-        tools_definitions = self.generate_tool_schemas()
-
-        while True:
-            # Appel avec ou sans streaming
-            if streaming:
-                async for chunk in self.nlp_model.stream_chat_completion(messages, tools=tools_definitions):
-                    yield chunk  # Diffuse les fragments au fur et à mesure
-                break  
-            else:
-                response = await self.nlp_model.chat_completion(messages, tools=tools_definitions)
-                message = response.message
-                tool_calls = getattr(message, "tool_calls", None)
+        tools_definitions = self.select_tool_schemas(tool_query)
+        completion_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        iterations = 0
+        started_at = time.monotonic()
+        continuations: List[Dict] = []
+        spent = 0  # Tokens générés par les complétions de cet appel
+        content = None
 
-                if tool_calls:
-                    for call in tool_calls:
-                        call_id = call.id
-                        function = call.function
-                        if not function:
-                            continue  # Skip if no function is defined
-
-                        # Extract name and arguments
-                        function_name = function.name
-                        arguments = json.loads(function.arguments)
-
-                        # Execute the tool
-                        try:
-                            result = await self._execute_tool(function_name, arguments)
-                            # Append the tool's result to the messages
-                            #messages.append({"role": getattr(message, "role", "tool"), "tool_calls": tool_calls})
-                            messages.append(message)
-                            messages.append({"role": "tool", "content": json.dumps(result), "tool_call_id": call_id})
-                        except Exception as e:
-                            self.logger.error(f"Error executing tool {function_name}: {e}")
-                            messages.append({"role": "tool", "content": json.dumps({"error": str(e)})})
-                else:
-                    # Pas de tools, retourner la réponse finale
-                    message = response.message
-                    yield getattr(message, "content", "")
+        try:
+            while True:
+                # Appel avec ou sans streaming
+                if streaming:
+                    async for chunk in self.nlp_model.stream_chat_completion(messages, tools=tools_definitions, **completion_kwargs):
+                        yield chunk  # Diffuse les fragments au fur et à mesure
                     break
+                else:
+                    if iterations and self._tool_loop_exhausted(iterations, started_at):
+                        # Plus d'outils : le modèle doit conclure avec ce qu'il a déjà obtenu
+                        messages.append(self._tool_loop_exhausted_message())
+                        tools_definitions = None
+                    # Pages reçues depuis le tour précédent
+                    messages.extend(await self._drain_tool_continuations(continuations, task))
+                    turn_kwargs = self._completion_budget(max_tokens, spent)
+                    if turn_kwargs is None:
+                        # Allocation épuisée : pas de nouvelle complétion
+                        yield content or ""
+                        break
+                    turn_usage: Dict[str, int] = {}
+                    content, tool_calls, turn_messages = await self._tool_turn(
+                        messages, tools_definitions, turn_kwargs, token_usage=turn_usage, task=task,
+                        continuations=continuations,
+                    )
+                    spent += self._merge_usage(turn_usage, token_usage)
+
+                    if tool_calls:
+                        iterations += 1
+                        messages.extend(turn_messages)
+                        if self._requests_all_tools(tool_calls):
+                            tools_definitions = self.generate_tool_schemas()
+                    else:
+                        # Pas de tools, retourner la réponse finale
+                        await self._drain_tool_continuations(continuations, task, cancel=True)
+                        yield content or ""
+                        break
+        finally:
+            await self._drain_tool_continuations(continuations, task, cancel=True)
+
+    def _completion_budget(self, max_tokens: Optional[int], spent: int) -> Optional[Dict[str, Any]]:
+        """
+        Arguments d'une complétion de la boucle d'outils, limitée à ce qui reste de `max_tokens`.
+
+        The tool loop may run up to `max_tool_iterations` completions: `max_tokens` bounds all of them,
+        as counted from the usage reported by the model (a model reporting no usage is only limited per completion).
+
+        Returns:
+            Optional[Dict[str, Any]]: The completion kwargs, or None if `max_tokens` is spent.
+        """
+        if not max_tokens:
+            return {}
+        remaining = max_tokens - spent
+        if remaining <= 0:
+            self.logger.warning(f"Tool loop stopped: the allocation of {max_tokens} output tokens is spent.")
+            return None
+        return {"max_tokens": remaining}
+
+    @staticmethod
+    def _merge_usage(turn_usage: Dict[str, int], token_usage: Optional[Dict[str, int]]) -> int:
+        """
+        Ajoute la consommation d'un tour à `token_usage` et retourne les tokens générés pendant ce tour.
+        """
+        if token_usage is not None:
+            for key, value in turn_usage.items():
+                token_usage[key] = token_usage.get(key, 0) + value
+        return turn_usage.get("completion_tokens", 0)
 
-    async def process_message(self, sender: 'General', message: str, task: Task) -> str:
+    @staticmethod
+    def _record_usage(response: Any, token_usage: Optional[Dict[str, int]]):
+        """
+        Cumule la consommation de tokens d'une complétion dans `token_usage`, si disponible.
+        """
+        usage = response if isinstance(response, StreamUsage) else getattr(response, "usage", None)
+        if token_usage is None or usage is None:
+            return
+        for key in ("prompt_tokens", "completion_tokens"):
+            token_usage[key] = token_usage.get(key, 0) + (getattr(usage, key, 0) or 0)
+
+    async def process_message(self, sender: 'General', message: str, task: Task, **kwargs: Any) -> str:
         """
         Analyse un message reçu et utilise les outils si nécessaire en prenant en compte le contexte de la discussion.
         
@@ -186,6 +786,7 @@ class General(BaseAgent):
             sender (General): L'agent qui a envoyé le message.
             message (str): Le message reçu.
             task (Task): L'objet Task contenant la requête et le contexte de discussion.
+            **kwargs: `max_tokens` et `token_usage`, transmis à `_process_with_tools`.
         
         Returns:
             str: La réponse complète après traitement.
@@ -195,11 +796,10 @@ class General(BaseAgent):
         )
         reply_language = f"Reply in {DictatorSettings.get_language()} language."
 
-        # Construire le contexte à partir de la discussion
+        # Construire le contexte à partir de la discussion (résumé des tours compactés, puis tours récents)
         context_messages = [
             {"role": step.role, "content": step.content}
-            for step in task.steps
-            if step.step_type in ("user_message", "assistant_message")  # ✅ Plus simple et extensible !
+            for step in task.get_context_steps(("user_message", "assistant_message"))
         ]
 
         # Ajouter le message reçu et les informations de base
@@ -224,16 +824,29 @@ class General(BaseAgent):
         ]
 
         # Traitement avec les outils
-        async for response in self._process_with_tools(all_messages, streaming=False):
+        async for response in self._process_with_tools(
+            all_messages,
+            streaming=False,
+            max_tokens=kwargs.get("max_tokens"),
+            token_usage=kwargs.get("token_usage"),
+            task=task,
+            tool_query=self._tool_selection_query(task, message),
+        ):
             return response  # Retourne la réponse complète sans streaming
 
-
-
     async def solve_task(self, task: Task, **kwargs: Any) -> AsyncGenerator[str, None]:
         """
         Résout une tâche en utilisant les outils disponibles, en tenant compte des messages assistants
         si l'agent est un dictateur, puis diffuse la réponse finale en streaming.
+
+        Args:
+            task (Task): La tâche à résoudre.
+            **kwargs: `max_tokens` limite le nombre de tokens générés par l'ensemble des complétions
+                (appels d'outils et réponse finale). `token_usage`, si fourni, cumule les tokens consommés
+                par ces complétions, tels que le modèle les rapporte.
         """
+        max_tokens = kwargs.get("max_tokens")
+        token_usage = kwargs.get("token_usage")
         role_description = (
             "As the dictator, your role is to lead and coordinate the resolution of this task (the last user message), leveraging the inputs and support of your generals provided in assistants messages."
             if self.is_dictator
@@ -245,11 +858,22 @@ class General(BaseAgent):
         reply_language = f"Reply in {DictatorSettings.get_language()} language."
         
         # Ajouter les messages assistants si l'agent est un dictateur
+        # Résumé des tours compactés, réponses finales des tours suivants et contributions des généraux du tour courant
+        assistant_steps = task.get_context_steps(("assistant_message",))
         assistant_messages = [
             {"role": step.role, "content": step.content}
-            for step in task.steps
-            if step.step_type == "assistant_message"
+            for step in assistant_steps
         ]
+        has_missing_contributions = any(
+            step.metadata.get("status") in ("missing", "partial")
+            for step in assistant_steps
+        )
+        missing_contributions_note = (
+            "Some parts of the expertise could not be obtained and are marked with a 'missing_contribution' object. "
+            "Do not invent their content: resolve what you can and state clearly which aspects could not be analysed.\n\n"
+            if has_missing_contributions
+            else ""
+        )
         
         # Construire les messages contextuels
         messages = [
@@ -263,67 +887,81 @@ class General(BaseAgent):
                     f"Your task is to resolve the user's latest request based on the combined expertise and context provided. "
                     f"Do not reference individual assistants or their contributions explicitly. "
                     f"Provide a single, cohesive response as if all expertise was directly available to you.\n\n"
+                    f"{missing_contributions_note}"
                     f"Focus solely on resolving the latest user request while incorporating all relevant details from the discussion and assistant messages."
                 ),
             },
             *[
-                {"role": "assistant", "content": msg["content"]}
-                for msg in assistant_messages  # Inclure les messages assistants anonymisés
+                {"role": msg["role"], "content": msg["content"]}
+                for msg in assistant_messages  # Inclure les messages assistants anonymisés (et le résumé, en "system")
             ],
             {"role": "user", "content": f"The latest task/request to resolve is: '{task.request}' use the context and assistant messages to resolve it."},
-            {"role": "assistant", "content": f"Ma résolution de la tache est la suivante "}
+            {"role": "assistant", "content": "Ma résolution de la tache est la suivante "}
         ]
         #print('messages', messages)
-        tools_definitions = self.generate_tool_schemas()
+        tools_definitions = self.select_tool_schemas(self._tool_selection_query(task))
 
         # Publish log of solving task
         if self.event_manager is not None:
-            await self.event_manager.publish(Event(EventType.__str__(EventType.TASK_STARTED), f"Solving task...", task.task_id, details=task.to_dict()))
+            await self.event_manager.publish(Event(EventType.__str__(EventType.TASK_STARTED), "Solving task...", task.task_id, details=task.to_dict()))
 
         # Étape 1 : Traiter les appels d'outils nécessaires
-        while True:
-            response = await self.nlp_model.chat_completion(messages, tools=tools_definitions)
-            message = response.message
-            tool_calls = getattr(message, "tool_calls", None)
-
-            if tool_calls:
-                messages.append(message)
-                for call in tool_calls:
-                    function = call.function
-                    call_id = call.id
-                    if not function:
-                        continue  # Skip if no function is defined
-
-                    # Extract name and arguments
-                    function_name = function.name
-                    arguments = json.loads(function.arguments)
-
-                    # Execute the tool
-                    try:
-                        result = await self._execute_tool(function_name, arguments)
-                        # Append the tool's result to the messages
-                        messages.append({"role": "tool", "content": json.dumps(result), "tool_call_id": call_id})
-                        # Add ToolStep to the task
-                        tool_step = ToolExecutionStep(
-                            request_id=len(task.steps) + 1,
-                            tool_name=function_name,
-                            arguments=arguments,
-                            output=result,
-                            metadata={"executed_by": self.my_name_is}
-                        )
-                        task.add_step(tool_step)
-                    except Exception as e:
-                        self.logger.error(f"Error executing tool {function_name}: {e}")
-                        messages.append({"role": "tool", "content": json.dumps({"error": str(e)})})
-            else:
-                # Étape 2 : Diffuser la réponse finale en streaming
-                async for chunk in self.nlp_model.stream_chat_completion(messages):
-                    yield chunk  # Diffuse chaque fragment de la réponse au fur et à mesure
-                break
-
+        iterations = 0
+        started_at = time.monotonic()
+        continuations: List[Dict] = []
+        spent = 0  # Tokens générés par les complétions de la résolution
+        content = None
+        try:
+            while True:
+                # Pages reçues depuis le tour précédent
+                messages.extend(await self._drain_tool_continuations(continuations, task))
+                completion_kwargs = self._completion_budget(max_tokens, spent)
+                if completion_kwargs is None:
+                    # Allocation épuisée : la réponse est ce que le modèle a déjà produit
+                    if content:
+                        yield content
+                    break
+                if iterations and self._tool_loop_exhausted(iterations, started_at):
+                    # Plus d'outils : la réponse finale est produite avec ce qui a déjà été obtenu
+                    messages.append(self._tool_loop_exhausted_message())
+                    content, tool_calls = None, None
+                else:
+                    turn_usage: Dict[str, int] = {}
+                    streamed = False
+                    async for item in self._stream_tool_turn(
+                        messages, tools_definitions, completion_kwargs, token_usage=turn_usage, task=task,
+                        continuations=continuations,
+                    ):
+                        if isinstance(item, tuple):
+                            content, tool_calls, turn_messages = item
+                        else:
+                            # Fragment de contenu diffusé pendant que les appels d'outils sont mis en tampon
+                            streamed = True
+                            yield item
+                    spent += self._merge_usage(turn_usage, token_usage)
 
+                if tool_calls:
+                    iterations += 1
+                    messages.extend(turn_messages)
+                    if self._requests_all_tools(tool_calls):
+                        tools_definitions = self.generate_tool_schemas()
+                elif content and streamed:
+                    # La réponse finale a déjà été diffusée pendant ce tour
+                    break
+                else:
+                    # Étape 2 : Diffuser la réponse finale en streaming
+                    if getattr(self.nlp_model, "supports_streaming_tool_calls", False):
+                        # Le modèle rapporte alors sa consommation en fin de flux (`StreamUsage`)
+                        completion_kwargs = {**completion_kwargs, "yield_tool_calls": True}
+                    async for chunk in self.nlp_model.stream_chat_completion(messages, **completion_kwargs):
+                        if isinstance(chunk, StreamUsage):
+                            self._record_usage(chunk, token_usage)
+                        elif isinstance(chunk, str):
+                            yield chunk  # Diffuse chaque fragment de la réponse au fur et à mesure
+                    break
+        finally:
+            await self._drain_tool_continuations(continuations, task, cancel=True)
 
-    
     async def generate_response(self, sender: 'General', analysis: Dict) -> str:
         message_type = analysis.get('message_type', 'unknown')
         content = analysis.get('content', '')
@@ -354,7 +992,6 @@ class General(BaseAgent):
             response_content = "I'm not sure how to respond to that message."
         return response_content
 
-
     def can_perform_coup(self) -> bool:
         prompt = self.build_prompt("Can you perform a coup?")
         return self.nlp_model.can_perform_coup(prompt)
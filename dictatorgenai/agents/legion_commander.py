@@ -16,9 +16,12 @@ class LegionCommander(General):
         my_capabilities_are: List[Dict[str, str]],
         nlp_model: BaseModel,
         tools=None,
+        prefetch_legal_queries: bool = True,
     ):
         super().__init__(my_name_is, iam, my_capabilities_are, nlp_model, tools=tools)
         self.logger = logging.getLogger(self.my_name_is)
+        # Lance les outils de recherche des généraux sélectionnés sur leurs `legal_queries` dès l'évaluation
+        self.prefetch_legal_queries = prefetch_legal_queries
 
     async def solve_task(self, task: Task, **kwargs: Any) -> List[AssignedGeneral]:
         """
@@ -56,14 +59,15 @@ class LegionCommander(General):
             if eval_data["result"] == "entirely" or eval_data["result"] == "partially":
                 general = self.get_general_by_name(general_name, generals)
                 if general:
-                    selected_generals.append(
-                        AssignedGeneral( 
-                            base_general=general, 
-                            assigned_subtasks=subtasks, 
-                            capabilities_used=eval_data["details"], 
-                            confidence=eval_data["confidence"]
-                        )
+                    assigned_general = AssignedGeneral(
+                        base_general=general,
+                        assigned_subtasks=subtasks,
+                        capabilities_used=eval_data["details"],
+                        confidence=eval_data["confidence"]
                     )
+                    if self.prefetch_legal_queries:
+                        assigned_general.start_prefetch(task)
+                    selected_generals.append(assigned_general)
                         
                     task.add_step(
                         GeneralEvaluationStep(
@@ -53,11 +53,10 @@ class Majordomo(BaseAgent):
         # Generate a clarification message based on the task's request and context
         reply_language = f"Reply in {DictatorSettings.get_language()} language."
 
-        # Construire le contexte à partir de la discussion
+        # Construire le contexte à partir de la discussion (résumé des tours compactés, puis tours récents)
         context_messages = [
-            {"role": step.role, "content": step.content} 
-            for step in task.steps
-            if step.step_type in ("user_message", "assistant_message")
+            {"role": step.role, "content": step.content}
+            for step in task.get_context_steps(("user_message", "assistant_message"))
         ]
 
         # Ajouter le message reçu et les informations de base
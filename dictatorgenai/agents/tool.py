@@ -1,54 +1,637 @@
+import asyncio
+import functools
 import inspect
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type, get_args, get_origin, get_type_hints
 
-def tool(description: str, tool_type: str = "function"):
+from pydantic import BaseModel as PydanticBaseModel, ConfigDict, TypeAdapter, ValidationError, create_model
+
+logger = logging.getLogger(__name__)
+
+# Politiques d'exécution des tools synchrones
+EXECUTION_POLICIES = ("inline", "thread", "process")
+
+# Restitution des résultats des tools écrits en générateurs asynchrones
+STREAM_MODES = ("collect", "first_page")
+
+# Pools partagés par tous les tools, indexés par (politique, taille du pool)
+_EXECUTORS: Dict[Tuple[str, Optional[int]], Executor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+class ToolUnavailableError(Exception):
+    """
+    Raised when a tool is short-circuited by its circuit breaker after repeated failures.
+    """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un tool : après `failure_threshold` échecs consécutifs, le tool est court-circuité
+    pendant `recovery_time` secondes, puis un appel d'essai est autorisé (état "half-open").
+    Un succès referme le disjoncteur, un nouvel échec le rouvre.
+
+    Only execution errors and timeouts are failures: invalid arguments (a Pydantic `ValidationError`)
+    are the caller's mistake and say nothing about the health of the tool.
+
+    Attributes:
+        failure_threshold (int): Number of consecutive failures (errors or timeouts) that open the circuit.
+        recovery_time (float): Seconds before a trial call is allowed on an open circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The state of the breaker: "closed", "open" or "half-open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.recovery_time:
+            return "half-open"
+        return "open"
+
+    def allow_call(self) -> bool:
+        """
+        Returns whether a call may go through. On a half-open circuit, a single trial call is allowed.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_cancelled(self):
+        """A cancelled call is neither a success nor a failure, but frees the trial slot."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Seconds left before a trial call is allowed."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.recovery_time - (time.monotonic() - self.opened_at))
+
+
+def tool(
+    description: str,
+    tool_type: str = "function",
+    execution: str = "thread",
+    pool_size: Optional[int] = None,
+    cacheable: bool = False,
+    ttl: Optional[float] = None,
+    timeout: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+    failure_threshold: Optional[int] = 5,
+    recovery_time: float = 30.0,
+    query_param: Optional[str] = None,
+    batch: bool = False,
+    batch_window: float = 0.01,
+    max_batch_size: Optional[int] = None,
+    stream_mode: str = "collect",
+):
     """
     Decorator to mark a function as a tool and attach metadata.
 
     Args:
         description (str): A brief description of the tool.
         tool_type (str): The type of the tool. Default is "function".
+        execution (str): How a synchronous tool is executed, so that it never blocks the event loop:
+            - "inline": called directly on the event loop (only for trivial, fast tools),
+            - "thread": run in a thread pool (I/O-bound tools: database lookups, HTTP calls...),
+            - "process": run in a process pool (CPU-bound tools: PDF parsing, heavy computations).
+              The tool and its arguments must be picklable, so it must be a module-level function.
+            Coroutine tools always run on the event loop and ignore this option.
+        pool_size (Optional[int]): Number of workers of the pool. Tools declaring the same policy
+            and pool size share the same pool. None uses the default size of the executor.
+        cacheable (bool): Whether the tool is pure, i.e. its result only depends on its arguments.
+            Results of cacheable tools are stored in the tool cache (see `DictatorSettings.set_tool_cache`)
+            under the tool name and the canonicalized arguments, and reused for identical calls.
+        ttl (Optional[float]): Time to live of the cached results in seconds, None for no expiry.
+        timeout (Optional[float]): Maximum duration of a call in seconds, None for no limit. A tool running
+            in a thread cannot be interrupted: the call fails with a timeout but the thread runs to completion.
+        max_concurrency (Optional[int]): Maximum number of concurrent calls of this tool across all agents,
+            None for no limit.
+        failure_threshold (Optional[int]): Number of consecutive failures (execution errors or timeouts, not
+            invalid arguments) after which the circuit breaker of the tool opens and calls fail fast. The breaker
+            is shared by all the agents of the process. None disables the circuit breaker.
+        recovery_time (float): Seconds an open circuit breaker waits before allowing a trial call.
+        query_param (Optional[str]): Marks a retrieval tool: the name of the parameter receiving the
+            search query. Retrieval tools are prefetched with the `legal_queries` of the assigned
+            generals before their first completion; their other parameters must have defaults.
+        batch (bool): Marks a batch tool. Its only parameter is a list of argument sets, annotated
+            `List[Item]` where `Item` is a Pydantic model or a TypedDict, and it returns one result per
+            item, in order (an exception instance fails that item only). The model sees the schema of
+            `Item` and calls the tool once per item; the calls issued within `batch_window` seconds,
+            by one turn or by concurrent generals, are merged into a single invocation.
+        batch_window (float): Seconds a batch waits for more calls before the tool is invoked.
+        max_batch_size (Optional[int]): Invokes the tool as soon as this many calls are waiting.
+        stream_mode (str): How the results of an async generator tool (one yielding pages of results)
+            are handed to the model. Every page is published as a `tool_progress` event in both modes:
+            - "collect": the model receives the list of all the pages once the generator is exhausted,
+            - "first_page": the model receives the first page as soon as it is yielded, and the
+              remaining pages are added to the conversation before the following completion.
+            The timeout applies to the whole generator.
 
     Returns:
         callable: The decorated function.
     """
+    if execution not in EXECUTION_POLICIES:
+        raise ValueError(f"Invalid execution policy '{execution}'. Must be one of: {EXECUTION_POLICIES}")
+    if stream_mode not in STREAM_MODES:
+        raise ValueError(f"Invalid stream mode '{stream_mode}'. Must be one of: {STREAM_MODES}")
+
     def decorator(func):
         func.is_tool = True
         func.tool_description = description
         func.tool_type = tool_type
+        func.tool_execution = execution
+        func.tool_pool_size = pool_size
+        func.tool_cacheable = cacheable
+        func.tool_cache_ttl = ttl
+        func.tool_timeout = timeout
+        func.tool_max_concurrency = max_concurrency
+        func.tool_semaphores = weakref.WeakKeyDictionary()  # One per event loop, created on first use
+        func.tool_circuit_breaker = (
+            CircuitBreaker(failure_threshold, recovery_time) if failure_threshold else None
+        )
+        func.tool_query_param = query_param
+        func.tool_batch = batch
+        func.tool_batch_window = batch_window
+        func.tool_max_batch_size = max_batch_size
+        func.tool_stream_mode = stream_mode
+
+        # Compile the argument validator and the JSON schema once, from the full function signature
+        if batch:
+            func.tool_batch_param, func.tool_model, func.tool_validator, func.tool_parameters = build_batch_tool_arguments(func)
+        else:
+            func.tool_model, func.tool_validator, func.tool_parameters = build_tool_arguments(func)
+
+        return func
+    return decorator
+
+
+def build_tool_arguments(func: Callable) -> Tuple[Optional[Type[PydanticBaseModel]], Optional[TypeAdapter], Dict[str, Any]]:
+    """
+    Builds the Pydantic model of the arguments of a tool, its compiled validator and its JSON schema.
+
+    Every annotation Pydantic understands is supported (`List[str]`, `Optional[int]`, enums, nested
+    models, `Annotated[..., Field(description=...)]`...). `self`/`cls` and `*args`/`**kwargs` are not
+    exposed to the model; unannotated parameters accept any value.
+
+    Args:
+        func (Callable): The tool function.
+
+    Returns:
+        Tuple: The arguments model, its `TypeAdapter`, and the JSON schema of the parameters.
+            If the signature cannot be compiled, the model and the validator are None and the
+            schema falls back to primitive types.
+    """
+    signature = inspect.signature(func)
+    try:
+        type_hints = get_type_hints(func, include_extras=True)
+    except Exception:
+        type_hints = {}
+
+    fields: Dict[str, Any] = {}
+    for index, (name, param) in enumerate(signature.parameters.items()):
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        if index == 0 and name in ("self", "cls"):
+            continue
+        annotation = type_hints.get(name, param.annotation)
+        if annotation is param.empty:
+            annotation = Any
+        default = ... if param.default is param.empty else param.default
+        fields[name] = (annotation, default)
+
+    try:
+        model = create_model(
+            f"{func.__name__}_arguments",
+            __config__=ConfigDict(extra="forbid", arbitrary_types_allowed=True),
+            **fields,
+        )
+        validator = TypeAdapter(model)
+        parameters = validator.json_schema()
+    except Exception as e:
+        logger.warning(f"Could not compile the arguments of tool '{func.__name__}', falling back to primitive types: {e}")
+        return None, None, _primitive_parameters(signature, fields)
+
+    _strip_titles(parameters)
+    for name, property_schema in parameters.get("properties", {}).items():
+        property_schema.setdefault("description", f"Argument for {name}")
+    parameters.setdefault("required", [])
+    return model, validator, parameters
+
+
+def build_batch_tool_arguments(func: Callable) -> Tuple[str, Any, TypeAdapter, Dict[str, Any]]:
+    """
+    Builds the validator and the JSON schema of one item of a batch tool.
+
+    Args:
+        func (Callable): The batch tool, whose only parameter is annotated `List[Item]`.
+
+    Returns:
+        Tuple: The name of the list parameter, the item type, its `TypeAdapter`, and the JSON schema
+            of an item, which is the schema advertised to the model.
+
+    Raises:
+        TypeError: If the signature is not a single `List[Item]` parameter.
+    """
+    signature = inspect.signature(func)
+    parameters = [
+        (name, param) for index, (name, param) in enumerate(signature.parameters.items())
+        if not (index == 0 and name in ("self", "cls"))
+        and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+    ]
+    try:
+        type_hints = get_type_hints(func)
+    except Exception:
+        type_hints = {}
+    if len(parameters) != 1:
+        raise TypeError(f"Batch tool '{func.__name__}' must take a single List[Item] parameter.")
+    name, param = parameters[0]
+    annotation = type_hints.get(name, param.annotation)
+    if get_origin(annotation) not in (list, List) or not get_args(annotation):
+        raise TypeError(f"The parameter of batch tool '{func.__name__}' must be annotated List[Item].")
+    item_type = get_args(annotation)[0]
+
+    validator = TypeAdapter(item_type)
+    item_schema = validator.json_schema()
+    if item_schema.get("type") != "object":
+        raise TypeError(f"The items of batch tool '{func.__name__}' must be a Pydantic model or a TypedDict.")
+    _strip_titles(item_schema)
+    for property_name, property_schema in item_schema.get("properties", {}).items():
+        property_schema.setdefault("description", f"Argument for {property_name}")
+    item_schema.setdefault("required", [])
+    item_schema.setdefault("additionalProperties", False)
+    return name, item_type, validator, item_schema
+
+
+class BatchCoalescer:
+    """
+    Regroupe les appels simultanés d'un tool batch en une seule invocation, puis redistribue
+    les résultats à chaque appelant.
+
+    Attributes:
+        tool_func (Callable): The batch tool.
+        window (float): Seconds a batch waits for more calls.
+        max_batch_size (Optional[int]): Flushes the batch as soon as it holds this many calls.
+    """
+
+    def __init__(self, tool_func: Callable, window: float = 0.01, max_batch_size: Optional[int] = None):
+        self.tool_func = tool_func
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Invocations en cours : la boucle ne garde qu'une référence faible sur ses tâches
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Adds a call to the current batch and waits for its result.
+
+        Args:
+            item (Any): The validated arguments of the call.
+
+        Returns:
+            Any: The result of this item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if self.max_batch_size and len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            invocation = asyncio.ensure_future(self._invoke(batch))
+            self._tasks.add(invocation)
+            invocation.add_done_callback(self._tasks.discard)
+
+    async def _invoke(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        try:
+            results = await run_tool(self.tool_func, {self.tool_func.tool_batch_param: items})
+            if results is None or len(results) != len(items):
+                raise ValueError(
+                    f"Batch tool '{self.tool_func.__name__}' returned "
+                    f"{'no result' if results is None else len(results)} results for {len(items)} calls."
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Regroupeurs actifs, par fonction du tool batch, instance de la méthode (None pour une fonction) et boucle :
+# tous les agents appelant le même tool partagent le lot. Un regroupeur sans appel en attente est libéré,
+# il est recréé au prochain appel ; tant qu'il vit, il garde son instance (et son identifiant) en vie.
+_BATCH_COALESCERS: "weakref.WeakValueDictionary[tuple, BatchCoalescer]" = weakref.WeakValueDictionary()
+
+
+async def run_batched_tool(tool_func: Callable, item: Any) -> Any:
+    """
+    Executes one call of a batch tool, merged with the other calls issued within its batch window.
+
+    Args:
+        tool_func (Callable): The batch tool.
+        item (Any): The validated arguments of the call.
+
+    Returns:
+        Any: The result of this call.
+    """
+    func = getattr(tool_func, "__func__", tool_func)
+    target = getattr(tool_func, "__self__", None)
+    key = (func, id(target) if target is not None else None, asyncio.get_running_loop())
+    coalescer = _BATCH_COALESCERS.get(key)
+    if coalescer is None:
+        coalescer = _BATCH_COALESCERS[key] = BatchCoalescer(
+            tool_func,
+            window=getattr(tool_func, "tool_batch_window", 0.01),
+            max_batch_size=getattr(tool_func, "tool_max_batch_size", None),
+        )
+    return await coalescer.submit(item)
+
+
+def _strip_titles(schema: Any):
+    """Removes the titles generated by Pydantic, which only cost tokens in the prompt."""
+    if isinstance(schema, dict):
+        if isinstance(schema.get("title"), str):
+            del schema["title"]
+        for value in schema.values():
+            _strip_titles(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            _strip_titles(value)
 
-        # Generate parameter schema dynamically from the function signature
-        signature = inspect.signature(func)
-        parameters = {
-            "type": "object",
-            "properties": {},
-            "required": [],
-            "additionalProperties": False,
-        }
 
-        # Map Python types to JSON Schema types
-        type_mapping = {
-            str: "string",
-            int: "integer",
-            float: "number",
-            bool: "boolean",
-            list: "array",
-            dict: "object",
-            type(None): "null",
+def _primitive_parameters(signature: inspect.Signature, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema of the parameters using only primitive JSON types."""
+    parameters = {
+        "type": "object",
+        "properties": {},
+        "required": [],
+        "additionalProperties": False,
+    }
+
+    # Map Python types to JSON Schema types
+    type_mapping = {
+        str: "string",
+        int: "integer",
+        float: "number",
+        bool: "boolean",
+        list: "array",
+        dict: "object",
+        type(None): "null",
+    }
+
+    for name, (annotation, default) in fields.items():
+        if default is ...:  # Required parameter
+            parameters["required"].append(name)
+        parameters["properties"][name] = {
+            "type": type_mapping.get(annotation, "string"),  # Default to "string" if unknown
+            "description": f"Argument for {name}"  # Placeholder description
         }
+    return parameters
 
-        for name, param in signature.parameters.items():
-            param_type = param.annotation
-            json_type = type_mapping.get(param_type, "string")  # Default to "string" if unknown
 
-            if param.default is param.empty:  # Required parameter
-                parameters["required"].append(name)
+def get_tool_executor(execution: str, pool_size: Optional[int] = None) -> Optional[Executor]:
+    """
+    Returns the shared executor of an execution policy, creating it on first use.
 
-            parameters["properties"][name] = {
-                "type": json_type,
-                "description": f"Argument for {name}"  # Placeholder description
-            }
+    Args:
+        execution (str): The execution policy ("inline", "thread" or "process").
+        pool_size (Optional[int]): The number of workers of the pool.
 
-        func.tool_parameters = parameters
+    Returns:
+        Optional[Executor]: The executor, or None for the "inline" policy.
+    """
+    if execution == "inline":
+        return None
+    key = (execution, pool_size)
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(key)
+        if executor is None:
+            if execution == "process":
+                executor = ProcessPoolExecutor(max_workers=pool_size)
+            else:
+                executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="dictatorgenai-tool")
+            _EXECUTORS[key] = executor
+        return executor
 
-        return func
-    return decorator
+
+async def run_tool(tool_func: Callable, arguments: Dict[str, Any]) -> Any:
+    """
+    Executes a tool according to its execution policy.
+
+    Coroutine tools are awaited on the event loop. Synchronous tools are dispatched to the
+    thread or process pool declared on `@tool`, or called inline. The timeout, concurrency
+    limit and circuit breaker declared on `@tool` are applied.
+
+    Args:
+        tool_func (Callable): The tool to execute.
+        arguments (Dict[str, Any]): The keyword arguments of the tool.
+
+    Returns:
+        Any: The result of the tool.
+
+    Raises:
+        ToolUnavailableError: If the circuit breaker of the tool is open.
+        asyncio.TimeoutError: If the call exceeds the timeout of the tool.
+    """
+    async with _tool_guard(tool_func):
+        return await _call_tool(tool_func, arguments)
+
+
+async def run_streaming_tool(
+    tool_func: Callable,
+    arguments: Dict[str, Any],
+    on_chunk: Optional[Callable[[int, Any], Awaitable[None]]] = None,
+) -> List[Any]:
+    """
+    Executes an async generator tool and collects the pages it yields.
+
+    The timeout, concurrency limit and circuit breaker declared on `@tool` are applied to the
+    whole generator.
+
+    Args:
+        tool_func (Callable): The async generator tool to execute.
+        arguments (Dict[str, Any]): The keyword arguments of the tool.
+        on_chunk (Optional[Callable[[int, Any], Awaitable[None]]]): Awaited with the index and
+            the content of every page, as soon as it is yielded.
+
+    Returns:
+        List[Any]: The pages yielded by the tool, in order.
+
+    Raises:
+        ToolUnavailableError: If the circuit breaker of the tool is open.
+        asyncio.TimeoutError: If the generator exceeds the timeout of the tool.
+    """
+    async def consume() -> List[Any]:
+        chunks = []
+        generator: AsyncIterator[Any] = tool_func(**arguments)
+        try:
+            async for chunk in generator:
+                if on_chunk is not None:
+                    await on_chunk(len(chunks), chunk)
+                chunks.append(chunk)
+        finally:
+            await generator.aclose()
+        return chunks
+
+    async with _tool_guard(tool_func):
+        timeout = getattr(tool_func, "tool_timeout", None)
+        if not timeout:
+            return await consume()
+        try:
+            return await asyncio.wait_for(consume(), timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Tool '{tool_func.__name__}' timed out after {timeout}s.")
+
+
+@asynccontextmanager
+async def _tool_guard(tool_func: Callable):
+    """
+    Applique le disjoncteur et la limite de concurrence d'un tool autour de son exécution.
+    """
+    breaker: Optional[CircuitBreaker] = getattr(tool_func, "tool_circuit_breaker", None)
+    if breaker is not None and not breaker.allow_call():
+        raise ToolUnavailableError(
+            f"Tool '{tool_func.__name__}' is temporarily unavailable after repeated failures "
+            f"(retry in {breaker.retry_after():.1f}s). Continue without it."
+        )
+
+    semaphore = _tool_semaphore(tool_func)
+
+    try:
+        if semaphore is not None:
+            async with semaphore:
+                yield
+        else:
+            yield
+    except (asyncio.CancelledError, ValidationError):
+        # Ni succès ni échec : des arguments invalides ne disent rien de l'état du tool
+        if breaker is not None:
+            breaker.record_cancelled()
+        raise
+    except Exception:
+        if breaker is not None:
+            breaker.record_failure()
+        raise
+
+    if breaker is not None:
+        breaker.record_success()
+
+
+def _tool_semaphore(tool_func: Callable) -> Optional[asyncio.Semaphore]:
+    """
+    Retourne le sémaphore limitant la concurrence d'un tool dans la boucle courante, None sans limite.
+
+    Les attributs sont lus sur la fonction sous-jacente : un tool défini comme méthode est reçu lié
+    à son instance, et un objet `method` n'accepte pas de nouveaux attributs.
+    """
+    func = getattr(tool_func, "__func__", tool_func)
+    max_concurrency = getattr(func, "tool_max_concurrency", None)
+    if not max_concurrency:
+        return None
+    semaphores = getattr(func, "tool_semaphores", None)
+    if semaphores is None:
+        semaphores = func.tool_semaphores = weakref.WeakKeyDictionary()
+    loop = asyncio.get_running_loop()
+    semaphore = semaphores.get(loop)
+    if semaphore is None:
+        semaphore = semaphores[loop] = asyncio.Semaphore(max_concurrency)
+    return semaphore
+
+
+async def _call_tool(tool_func: Callable, arguments: Dict[str, Any]) -> Any:
+    """
+    Calls a tool according to its execution policy, within its timeout.
+    """
+    timeout = getattr(tool_func, "tool_timeout", None)
+    if timeout:
+        try:
+            return await asyncio.wait_for(_dispatch_tool(tool_func, arguments), timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Tool '{tool_func.__name__}' timed out after {timeout}s.")
+    return await _dispatch_tool(tool_func, arguments)
+
+
+async def _dispatch_tool(tool_func: Callable, arguments: Dict[str, Any]) -> Any:
+    """
+    Dispatches a tool to the event loop, its pool, or calls it inline.
+    """
+    if asyncio.iscoroutinefunction(tool_func):
+        return await tool_func(**arguments)
+
+    executor = get_tool_executor(
+        getattr(tool_func, "tool_execution", "inline"),
+        getattr(tool_func, "tool_pool_size", None),
+    )
+    if executor is None:
+        return tool_func(**arguments)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(tool_func, **arguments))
+
+
+def shutdown_tool_executors(wait: bool = True):
+    """
+    Shuts down the pools used to execute the tools. They are recreated on the next tool call.
+
+    Args:
+        wait (bool): Wait for the running tools to complete.
+    """
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
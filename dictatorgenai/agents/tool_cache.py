@@ -0,0 +1,174 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ToolCache(ABC):
+    """
+    Interface pour les caches de résultats des tools déclarés `cacheable=True`.
+
+    Entries are keyed by the tool name and its canonicalized arguments (see `make_key`).
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Retrieves a cached result.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Tuple[bool, Any]: `(True, value)` on a hit, `(False, None)` on a miss or an expired entry.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Stores a result.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The result of the tool.
+            ttl (Optional[float]): Time to live in seconds, None for no expiry.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Removes every entry of the cache."""
+        pass
+
+    @staticmethod
+    def make_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        """
+        Builds the cache key of a tool call from the tool name and its canonicalized arguments.
+
+        Args:
+            tool_name (str): The name of the tool.
+            arguments (Dict[str, Any]): The validated arguments of the call.
+
+        Returns:
+            str: A SHA-256 digest, identical for calls with the same arguments in any order.
+        """
+        canonical = json.dumps(
+            {"tool": tool_name, "arguments": arguments},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class InMemoryToolCache(ToolCache):
+    """
+    Cache LRU en mémoire, partagé par toutes les sessions du processus.
+
+    Attributes:
+        max_entries (int): Number of entries kept; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initializes the in-memory cache.
+
+        Args:
+            max_entries (int): Number of entries kept.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteToolCache(ToolCache):
+    """
+    Cache persistant dans SQLite, partagé entre les processus et conservé entre les sessions.
+
+    Results are stored as JSON, so cacheable tools must return JSON-serializable values.
+    """
+
+    def __init__(self, db_path: str = "tool_cache.db"):
+        """
+        Initializes the SQLite cache and creates its table if needed.
+
+        Args:
+            db_path (str): Chemin du fichier de base de données SQLite.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tool_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute("DELETE FROM tool_cache WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                return False, None
+        return True, json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (cache_key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, expires_at),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM tool_cache")
+            self._conn.commit()
+
+    def close(self):
+        """Closes the connection to the database."""
+        with self._lock:
+            self._conn.close()
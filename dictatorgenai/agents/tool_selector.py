@@ -0,0 +1,110 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en mots normalisés : minuscules, sans accents, identifiants
+    `snake_case` et `camelCase` séparés.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        List[str]: The tokens of the text.
+    """
+    text = _CAMEL_RE.sub(" ", text or "")
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token for token in _WORD_RE.findall(text) if len(token) > 1]
+
+
+class ToolSelector:
+    """
+    Index de mots-clés (BM25) sur les noms, descriptions et paramètres des tools d'un agent.
+
+    Used to send only the tools relevant to the current subtasks to the model, instead of the
+    whole toolbox on every completion.
+
+    Attributes:
+        k1 (float): BM25 term frequency saturation.
+        b (float): BM25 document length normalization.
+    """
+
+    def __init__(self, tools: Dict[str, Callable], k1: float = 1.5, b: float = 0.75):
+        """
+        Builds the index of the tools.
+
+        Args:
+            tools (Dict[str, Callable]): The registered tools of the agent, by name.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.tool_names: List[str] = list(tools)
+        self._documents: List[Counter] = [
+            Counter(tokenize(self._tool_text(name, func))) for name, func in tools.items()
+        ]
+        self._lengths = [sum(document.values()) for document in self._documents]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        document_frequencies: Counter = Counter()
+        for document in self._documents:
+            document_frequencies.update(document.keys())
+        count = len(self._documents)
+        self._idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequencies.items()
+        }
+
+    @staticmethod
+    def _tool_text(name: str, func: Callable) -> str:
+        """Text indexed for a tool: its name (twice, to weight it), description and parameters."""
+        parameters: Dict[str, Any] = getattr(func, "tool_parameters", {}).get("properties", {})
+        parameter_texts = [
+            f"{parameter} {schema.get('description', '')}" for parameter, schema in parameters.items()
+        ]
+        return " ".join([name, name, getattr(func, "tool_description", ""), *parameter_texts])
+
+    def rank(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Ranks the tools against a query.
+
+        Args:
+            query (str): The text describing what the agent has to do (subtasks, legal queries...).
+
+        Returns:
+            List[Tuple[str, float]]: The tool names with their BM25 score, best first. Ties keep the
+                registration order of the tools.
+        """
+        terms = set(tokenize(query))
+        scores = []
+        for index, document in enumerate(self._documents):
+            score = 0.0
+            length_norm = 1 - self.b + self.b * (self._lengths[index] / self._average_length if self._average_length else 0)
+            for term in terms:
+                frequency = document.get(term)
+                if frequency:
+                    score += self._idf[term] * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+            scores.append((index, score))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return [(self.tool_names[index], score) for index, score in scores]
+
+    def select(self, query: str, top_k: int) -> List[str]:
+        """
+        Returns the names of the `top_k` tools most relevant to a query.
+
+        Args:
+            query (str): The text describing what the agent has to do.
+            top_k (int): The number of tools to select.
+
+        Returns:
+            List[str]: The selected tool names, best first.
+        """
+        return [name for name, _ in self.rank(query)[:top_k]]
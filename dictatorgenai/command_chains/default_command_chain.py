@@ -9,6 +9,7 @@ from dictatorgenai.agents.assigned_general import AssignedGeneral
 from dictatorgenai.models import BaseModel, Message
 from dictatorgenai.utils.task import Task
 from .command_chain import CommandChain
+from dictatorgenai.conversations import BaseConversation
 from ..agents.general import General, TaskExecutionError
 from dictatorgenai.config import DictatorSettings
 from dictatorgenai.steps.action_steps import ActionStep, PlanningStep, GeneralEvaluationStep
@@ -24,8 +25,9 @@ class DefaultCommandChain(CommandChain):
         logger (logging.Logger): Logger for recording debug and error messages.
     """
 
-    def __init__(self, nlp_model: BaseModel, confidence_threshold: float = 1.0, event_manager: BaseEventManager = None):
-        super().__init__(None)
+    def __init__(self, nlp_model: BaseModel, confidence_threshold: float = 1.0, event_manager: BaseEventManager = None, conversation: BaseConversation = None, prefetch_legal_queries: bool = True):
+        super().__init__(conversation)
+        self.prefetch_legal_queries = prefetch_legal_queries
         self.nlp_model = nlp_model
         self.logger = logging.getLogger(self.__class__.__name__)
         self.confidence_threshold = confidence_threshold
@@ -114,7 +116,7 @@ class DefaultCommandChain(CommandChain):
         await self.event_manager.publish(Event(EventType.TASK_UPDATED, f"Task has been decomposed into subtasks.", task.task_id, details=task.to_dict()))
 
         # 2. Sélectionner les généraux avec le LegionCommander
-        legion_commander = LegionCommander(my_name_is="LegionCommander", iam="Legion Commander", my_capabilities_are=[], nlp_model=self.nlp_model)
+        legion_commander = LegionCommander(my_name_is="LegionCommander", iam="Legion Commander", my_capabilities_are=[], nlp_model=self.nlp_model, prefetch_legal_queries=self.prefetch_legal_queries)
         
         try:
             # Nous passons les généraux et les sous-tâches à solve_task de LegionCommander via kwargs
@@ -341,8 +343,7 @@ class DefaultCommandChain(CommandChain):
         """
         conversation_history = [
             {"role": step.role, "content": step.content}
-            for step in task.steps
-            if step.step_type in ("user_message", "assistant_message")  # ✅ Filtrage des messages utiles
+            for step in task.get_context_steps(("user_message", "assistant_message"))
         ]
 
         # 🔹 Conversion en JSON formaté
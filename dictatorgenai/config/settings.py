@@ -9,6 +9,11 @@ class DictatorSettings():
     confidence_threshold: float = 0.7  # Confidence threshold for general selection
     logging_level: str = "INFO"  # Default logging level 
     nlp_model: BaseModel = None  # Default NLP model for task analysis
+    tool_cache = None  # Cache of the results of cacheable tools, in memory by default
+    blob_store = None  # Storage of the large tool outputs, on disk (`FileBlobStore("regime_blobs")`) by default
+    blob_threshold: int = 4096  # Tool outputs above this size (characters) are stored out of line
+    blob_preview_chars: int = 500  # Preview of an out-of-line output kept in the steps and events
+    tool_output_prompt_chars: int = None  # Truncates the tool outputs sent to the model, None to send them whole
 
     @classmethod
     def set_language(cls, language: str):
@@ -37,3 +42,51 @@ class DictatorSettings():
         Retrieve the current default language.
         """
         return cls.nlp_model
+
+    @classmethod
+    def set_tool_cache(cls, tool_cache):
+        """
+        Change the cache used for the results of cacheable tools (e.g. a `SQLiteToolCache`).
+        """
+        cls.tool_cache = tool_cache
+
+    @classmethod
+    def get_tool_cache(cls):
+        """
+        Retrieve the cache of the results of cacheable tools, creating an in-memory LRU cache by default.
+        """
+        if cls.tool_cache is None:
+            from dictatorgenai.agents.tool_cache import InMemoryToolCache
+            cls.tool_cache = InMemoryToolCache()
+        return cls.tool_cache
+
+    @classmethod
+    def set_blob_store(cls, blob_store, threshold: int = None, preview_chars: int = None):
+        """
+        Change the storage of the large tool outputs (e.g. a `FileBlobStore`), and optionally the size
+        above which outputs are stored out of line and the length of the preview kept in the steps.
+        """
+        cls.blob_store = blob_store
+        if threshold is not None:
+            cls.blob_threshold = threshold
+        if preview_chars is not None:
+            cls.blob_preview_chars = preview_chars
+
+    @classmethod
+    def get_blob_store(cls):
+        """
+        Retrieve the storage of the large tool outputs, creating a `FileBlobStore` in "regime_blobs" by default:
+        the steps persisted with the regime memory keep only the reference of these outputs, so they must
+        outlive the process. They are deleted with the memory (`RegimeMemory.clear_memory`).
+        """
+        if cls.blob_store is None:
+            from dictatorgenai.memories.stores.blob_store import FileBlobStore
+            cls.blob_store = FileBlobStore("regime_blobs")
+        return cls.blob_store
+
+    @classmethod
+    def set_tool_output_prompt_chars(cls, max_chars: int = None):
+        """
+        Truncate the tool outputs sent to the model to `max_chars` characters, None to send them whole.
+        """
+        cls.tool_output_prompt_chars = max_chars
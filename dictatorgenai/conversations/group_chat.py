@@ -1,8 +1,9 @@
-from typing import Any, AsyncGenerator, Dict, Generator, List
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+import json
 import logging
 import asyncio
-from dictatorgenai.agents.general import General
 from dictatorgenai.utils.task import Task
+from dictatorgenai.utils.token_budget import TokenBudget
 from dictatorgenai.steps.message_steps import AssistantMessageStep
 from dictatorgenai.agents.assigned_general import AssignedGeneral
 from .base_conversation import BaseConversation
@@ -10,7 +11,87 @@ from .base_conversation import BaseConversation
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+
+class _AttemptTask(Task):
+    """
+    Vue d'une tâche pour une tentative de requête : elle partage les étapes et les métadonnées de la tâche
+    et retient les étapes ajoutées pendant la tentative.
+    """
+
+    def __init__(self, task: Task):
+        super().__init__(
+            task.request, steps=task.steps, subtasks=task.subtasks, priority=task.priority,
+            status=task.status, task_id=task.task_id,
+        )
+        self.metadata = task.metadata
+        self.added_steps: List[Any] = []
+
+    def add_step(self, step):
+        super().add_step(step)
+        self.added_steps.append(step)
+
+
 class GroupChat(BaseConversation):
+    """
+    The dictator sends an imperative message to all the generals, gathers their
+    contributions in parallel and then resolves the task with them.
+
+    When a general fails, only its request is re-executed: it is retried with an exponential
+    backoff, then handed over to an alternate general whose capabilities overlap (based on the
+    subtasks assigned by the LegionCommander). If nobody can provide it, the contribution is
+    replaced by a structured "missing contribution" marker instead of an error message.
+    Retries and alternates share the allocation of the request, and the tool steps recorded by a
+    failed attempt are tagged `failed_attempt`.
+
+    Attributes:
+        fan_out_subtasks (bool): When True, a general assigned to several subtasks receives one
+            independent request per subtask instead of a single prompt covering all of them.
+            The per-subtask requests run concurrently (each with its own tool loop) and their
+            answers are merged back into the general's contribution.
+        max_parallel_subtasks (Optional[int]): Maximum number of concurrent per-subtask requests
+            for a single general when `fan_out_subtasks` is enabled. None means no limit.
+        max_retries (int): Number of retries of a failed request before failing over.
+        retry_backoff (float): Delay in seconds before the first retry, doubled at each retry.
+        failover (bool): Whether a failed request is handed over to an alternate general.
+        token_budget (Optional[int]): Output-token budget of a request. When set, it is split across
+            the generals by a `TokenBudget`; the allocation of a general bounds the output of its request,
+            tool loop included, and a share is reserved for the synthesis of the dictator.
+        synthesis_share (float): Share of `token_budget` reserved for the synthesis.
+    """
+
+    def __init__(
+        self,
+        fan_out_subtasks: bool = False,
+        max_parallel_subtasks: Optional[int] = None,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        failover: bool = True,
+        token_budget: Optional[int] = None,
+        synthesis_share: float = 0.25,
+    ):
+        """
+        Initializes the GroupChat.
+
+        Args:
+            fan_out_subtasks (bool): Split a general's workload into per-subtask requests.
+            max_parallel_subtasks (Optional[int]): Concurrency cap for the per-subtask requests of a general.
+            max_retries (int): Number of retries of a failed request before failing over.
+            retry_backoff (float): Delay in seconds before the first retry, doubled at each retry.
+            failover (bool): Hand a failed request over to an alternate general.
+            token_budget (Optional[int]): Output-token budget of a request, None for no limit.
+            synthesis_share (float): Share of the budget reserved for the synthesis of the dictator,
+                strictly between 0 and 1.
+        """
+        if not 0 < synthesis_share < 1:
+            raise ValueError("synthesis_share must be strictly between 0 and 1.")
+        super().__init__()
+        self.fan_out_subtasks = fan_out_subtasks
+        self.max_parallel_subtasks = max_parallel_subtasks
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.failover = failover
+        self.token_budget = token_budget
+        self.synthesis_share = synthesis_share
 
     async def start_conversation(
         self, dictator: AssignedGeneral, generals: List[AssignedGeneral], task: Task
@@ -20,92 +101,524 @@ class GroupChat(BaseConversation):
         gathers their responses in parallel, and then uses the input to resolve the task.
         """
         try:
-            async def send_command_to_general(general: AssignedGeneral):
-                """Envoie une commande à un général et récupère sa réponse."""
-                try:
-
-                    # Générer une liste de capacités sous forme de texte
-                    selected_capabilities = [
-                        f"{cap['capability']} (Explanation: {cap['explanation']}, Legal queries: {cap['legal_queries']}, Confidence: {general.confidence}) subtasks: {cap['subtasks']}"
-                        for cap in general.capabilities_used
-                    ]
-                    selected_capabilities_str = "\n- ".join(selected_capabilities)
-                    print(selected_capabilities_str, "\n")
-                    # Construire le message impératif
-                    imperative_message = (
-                        f"I am {dictator.my_name_is}, and I have selected you, {general.my_name_is}, "
-                        f"to assist with the task: '{task.request}'.\n"
-                        f"You have been chosen based on the following capabilities, and associate subtasks to solve :\n"
-                        f"- {selected_capabilities_str}.\n\n"
-                        f""
-                        f"\n\n"
-                        f"Focus strictly on these capabilities and their details, and provide your input accordingly to solve the subtasks. "
-                        f"Ignore any aspect of the task that falls outside your expertise."
-
-                        f"You are allowed and encouraged to use your legal tools to search for supporting legal texts, "
-                        f"articles, jurisprudence or doctrine that could strengthen your answer.\n"
-                        f"For this, rely on the `legal_queries` provided with each capability. "
-                        f"Use them as search inputs for your legal research tools to retrieve the most relevant legal context.\n\n"
-                        
-                        f"Be concise, precise, and legally grounded in your response."
-                    )
+            budget = self.create_token_budget(generals)
+            responses = await self.gather_contributions(dictator, generals, task, budget=budget)
+            self.record_contributions(responses, task)
+            if budget is not None:
+                task.add_metadata("token_budget", budget.report())
+
+            # ✅ Le dictateur utilise maintenant les réponses pour finaliser la tâche
+            logger.debug(f"Dictator {dictator.my_name_is} is now resolving the task based on the responses...\n")
+            async for chunk in self.synthesize(dictator, task, budget):
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"An error occurred during the conversation: {e}")
+            yield f"An error occurred: {e}"
+
+    async def synthesize(
+        self, dictator: AssignedGeneral, task: Task, budget: Optional[TokenBudget] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Streams the resolution of the task by the dictator, within the synthesis share of the budget.
+
+        The usage of the synthesis is recorded in the budget, whose report in the `token_budget`
+        metadata of the task is updated once the answer is complete.
+        """
+        token_usage: Dict[str, int] = {}
+        try:
+            async for chunk in dictator.solve_task(
+                task, max_tokens=budget.synthesis_tokens if budget else None, token_usage=token_usage
+            ):
+                yield chunk
+        finally:
+            if budget is not None:
+                budget.record_synthesis_usage(token_usage.get("completion_tokens", 0))
+                task.add_metadata("token_budget", budget.report())
+
+    def create_token_budget(self, generals: List[AssignedGeneral]) -> Optional[TokenBudget]:
+        """
+        Creates the token budget of a request and allocates it across the generals.
+
+        Args:
+            generals (List[AssignedGeneral]): The selected generals.
+
+        Returns:
+            Optional[TokenBudget]: The allocated budget, or None if `token_budget` is not set.
+        """
+        if not self.token_budget:
+            return None
+        budget = TokenBudget(self.token_budget, synthesis_share=self.synthesis_share)
+        budget.allocate(generals)
+        return budget
+
+    async def gather_contributions(
+        self,
+        dictator: AssignedGeneral,
+        generals: List[AssignedGeneral],
+        task: Task,
+        budget: Optional[TokenBudget] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sends the command to every general in parallel and collects their contributions.
+
+        Args:
+            dictator (AssignedGeneral): The dictator issuing the commands.
+            generals (List[AssignedGeneral]): The generals to consult.
+            task (Task): The task being solved.
+            budget (Optional[TokenBudget]): The token budget allocated across the generals.
+
+        Returns:
+            List[Dict[str, Any]]: One contribution per general, with the keys `general`, `content`,
+            `capabilities_used` and `status` (`ok`, `failover`, `partial` or `missing`).
+        """
+        # ✅ Exécuter toutes les commandes en parallèle avec `asyncio.gather`
+        responses = await asyncio.gather(
+            *[self.send_command_to_general(dictator, general, task, generals=generals, budget=budget) for general in generals],
+            return_exceptions=True  # ✅ Évite de planter si une erreur survient
+        )
 
-                    logger.debug(f"Sending command to General {general.my_name_is}...\n")
-
-                    # Envoyer le message au général (appel asynchrone)
-                    response_content = await dictator.send_message(general, imperative_message, task=task)
-                    #print(f"General {general.my_name_is}'s response: {response_content}\n")
-                    logger.debug(f"General {general.my_name_is}'s response: {response_content}\n")
-
-                    # Retourner la réponse sous forme d'objet
-                    return {
-                        "general": general.my_name_is,
-                        "content": response_content,
-                        "capabilities_used": general.capabilities_used
-                    }
-
-                except Exception as e:
-                    logger.error(f"Error while communicating with General {general.my_name_is}: {e}")
-                    return {
-                        "general": general.my_name_is,
-                        "content": f"Error: {str(e)}",
-                        "capabilities_used": []
-                    }
-
-            # ✅ Exécuter toutes les commandes en parallèle avec `asyncio.gather`
-            responses = await asyncio.gather(
-                *[send_command_to_general(general) for general in generals],
-                return_exceptions=True  # ✅ Évite de planter si une erreur survient
+        # ✅ Filtrer les réponses valides (exclure `None` pour les généraux non pertinents)
+        return [resp for resp in responses if resp is not None and not isinstance(resp, BaseException)]
+
+    def record_contributions(self, responses: List[Dict[str, Any]], task: Task):
+        """
+        Appends the contributions of the generals to the task as `AssistantMessageStep`.
+
+        Args:
+            responses (List[Dict[str, Any]]): The contributions returned by `gather_contributions`.
+            task (Task): The task being solved.
+        """
+        for response in responses:
+            metadata = {
+                "general": response["general"],
+                "capabilities_used": response["capabilities_used"],
+                "status": response.get("status", "ok"),
+            }
+            for key in ("subtasks", "covered_by", "error", "token_usage"):
+                if response.get(key):
+                    metadata[key] = response[key]
+            assistant_step = AssistantMessageStep(
+                request_id=task.task_id,
+                content=response["content"],
+                metadata=metadata
             )
+            task.steps.append(assistant_step)
 
-            # ✅ Filtrer les réponses valides (exclure `None` pour les généraux non pertinents)
-            responses = [resp for resp in responses if resp is not None]
+    async def send_command_to_general(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        task: Task,
+        generals: Optional[List[AssignedGeneral]] = None,
+        budget: Optional[TokenBudget] = None,
+    ) -> Dict[str, Any]:
+        """
+        Envoie une commande à un général et récupère sa réponse.
 
+        Args:
+            dictator (AssignedGeneral): The dictator issuing the command.
+            general (AssignedGeneral): The general receiving the command.
+            task (Task): The task being solved.
+            generals (Optional[List[AssignedGeneral]]): All the selected generals, used to pick
+                an alternate general if this one fails.
+            budget (Optional[TokenBudget]): The token budget; the allocation of the general bounds its
+                request (retries and alternates included) and each attempt is charged to the general
+                who made it.
 
+        Returns:
+            Dict[str, Any]: The contribution of the general.
+        """
+        alternates = self.select_alternate_generals(general, generals or []) if self.failover else []
+        subtasks = self.split_subtasks(general.capabilities_used) if self.fan_out_subtasks else []
+        max_tokens = budget.limit_for(general.my_name_is, calls=max(1, len(subtasks))) if budget else None
 
-            for response in responses:
-                assistant_step = AssistantMessageStep(
-                    request_id=task.task_id,
-                    content=response["content"],
-                    metadata={
-                        "general": response["general"],
-                        "capabilities_used": response["capabilities_used"]
-                    }
-                )
-                task.steps.append(assistant_step)
+        # Résultats des outils de recherche lancés par le LegionCommander sur les `legal_queries`
+        if hasattr(general, "wait_for_prefetch"):
+            await general.wait_for_prefetch()
 
+        contribution = await self._request_contribution(
+            dictator, general, task, subtasks, alternates, max_tokens=max_tokens, budget=budget
+        )
+        if budget is not None:
+            contribution["token_usage"] = budget.report()["generals"].get(general.my_name_is)
+        return contribution
 
-            # ✅ Le dictateur utilise maintenant les réponses pour finaliser la tâche
-            logger.debug(f"Dictator {dictator.my_name_is} is now resolving the task based on the responses...\n")
-            async for chunk in dictator.solve_task(task):
-                yield chunk
+    async def _request_contribution(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        task: Task,
+        subtasks: List[tuple],
+        alternates: List[AssignedGeneral],
+        **call_kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Obtains the contribution of a general, fanning it out per subtask when requested.
+        """
+        if len(subtasks) > 1:
+            response_content, statuses = await self._send_subtasks_to_general(
+                dictator, general, task, subtasks, alternates, **call_kwargs
+            )
+            if all(status == "missing" for status in statuses):
+                status = "missing"
+            elif "missing" in statuses:
+                status = "partial"
+            elif "failover" in statuses:
+                status = "failover"
+            else:
+                status = "ok"
+            return {
+                "general": general.my_name_is,
+                "content": response_content,
+                "capabilities_used": general.capabilities_used,
+                "subtasks": [subtask for subtask, _ in subtasks],
+                "status": status,
+            }
 
+        logger.debug(f"Sending command to General {general.my_name_is}...\n")
+        try:
+            response_content, covered_by = await self._send_with_failover(
+                dictator, general, alternates, task, general.capabilities_used, **call_kwargs
+            )
         except Exception as e:
-            logger.error(f"An error occurred during the conversation: {e}")
-            yield f"An error occurred: {e}"
+            logger.error(f"Error while communicating with General {general.my_name_is}: {e}")
+            return {
+                "general": general.my_name_is,
+                "content": self.missing_contribution_marker(general.my_name_is, general.capabilities_used, error=e),
+                "capabilities_used": general.capabilities_used,
+                "status": "missing",
+                "error": str(e),
+            }
+        logger.debug(f"General {general.my_name_is}'s response: {response_content}\n")
+
+        # Retourner la réponse sous forme d'objet
+        return {
+            "general": general.my_name_is,
+            "content": response_content,
+            "capabilities_used": general.capabilities_used,
+            "status": "ok" if covered_by == general.my_name_is else "failover",
+            "covered_by": covered_by if covered_by != general.my_name_is else None,
+        }
+
+    async def _send_subtasks_to_general(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        task: Task,
+        subtasks: List[tuple],
+        alternates: Optional[List[AssignedGeneral]] = None,
+        **call_kwargs: Any,
+    ) -> Tuple[str, List[str]]:
+        """
+        Sends one request per subtask to the same general concurrently and merges the answers.
+
+        Args:
+            dictator (AssignedGeneral): The dictator issuing the commands.
+            general (AssignedGeneral): The general owning the subtasks.
+            task (Task): The task being solved.
+            subtasks (List[tuple]): `(subtask, capabilities)` pairs returned by `split_subtasks`.
+            alternates (Optional[List[AssignedGeneral]]): Generals taking over a failed subtask.
+            **call_kwargs: Passed to `_send_with_failover` (`max_tokens`, `budget`).
+
+        Returns:
+            Tuple[str, List[str]]: The merged contribution of the general, one section per subtask,
+            and the status of each subtask (`ok`, `failover` or `missing`).
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_subtasks) if self.max_parallel_subtasks else None
+
+        async def solve_subtask(subtask: str, capabilities: List[Dict[str, Any]]) -> Tuple[str, str]:
+            logger.debug(f"Sending subtask '{subtask}' to General {general.my_name_is}...\n")
+            try:
+                if semaphore is None:
+                    answer, covered_by = await self._send_with_failover(
+                        dictator, general, alternates or [], task, capabilities, subtask, **call_kwargs
+                    )
+                else:
+                    async with semaphore:
+                        answer, covered_by = await self._send_with_failover(
+                            dictator, general, alternates or [], task, capabilities, subtask, **call_kwargs
+                        )
+            except Exception as e:
+                logger.error(f"General {general.my_name_is} failed on subtask '{subtask}': {e}")
+                return self.missing_contribution_marker(general.my_name_is, capabilities, subtask=subtask, error=e), "missing"
+            return answer, "ok" if covered_by == general.my_name_is else "failover"
+
+        answers = await asyncio.gather(*[solve_subtask(subtask, capabilities) for subtask, capabilities in subtasks])
+
+        sections = [f"### {subtask}\n{answer}" for (subtask, _), (answer, _) in zip(subtasks, answers)]
+        return "\n\n".join(sections), [status for _, status in answers]
+
+    async def _send_with_failover(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        alternates: List[AssignedGeneral],
+        task: Task,
+        capabilities: List[Dict[str, Any]],
+        subtask: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        budget: Optional[TokenBudget] = None,
+    ) -> Tuple[str, str]:
+        """
+        Sends a request to a general, retrying it and then handing it over to the alternates.
+
+        Args:
+            max_tokens (Optional[int]): Output tokens of the request, shared by all the attempts of the
+                general and of its alternates.
+            budget (Optional[TokenBudget]): Each attempt is charged to the general who made it.
+
+        Returns:
+            Tuple[str, str]: The answer and the name of the general who provided it.
+
+        Raises:
+            Exception: The last error if neither the general nor its alternates could answer.
+        """
+        last_error: Optional[Exception] = None
+        token_usage: Dict[str, int] = {}  # Consommation de la requête, toutes tentatives confondues
+        prefetched = self.select_prefetched_results(getattr(general, "prefetch_results", None), capabilities)
+        for candidate in [general, *alternates]:
+            if max_tokens and token_usage.get("completion_tokens", 0) >= max_tokens:
+                logger.warning(f"No failover for General {general.my_name_is}: the allocation of the request is spent.")
+                break
+            message = self.build_imperative_message(dictator, candidate, task, capabilities, subtask=subtask, prefetched=prefetched)
+            try:
+                answer = await self._send_with_retry(
+                    dictator, candidate, message, task, max_tokens=max_tokens, token_usage=token_usage, budget=budget
+                )
+                return answer, candidate.my_name_is
+            except Exception as e:
+                last_error = e
+                if candidate is not general:
+                    logger.warning(f"Alternate General {candidate.my_name_is} failed for {general.my_name_is}: {e}")
+                elif alternates:
+                    logger.warning(f"General {general.my_name_is} failed, failing over to {alternates[0].my_name_is}: {e}")
+        raise last_error
+
+    async def _send_with_retry(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        message: str,
+        task: Task,
+        max_tokens: Optional[int] = None,
+        token_usage: Optional[Dict[str, int]] = None,
+        budget: Optional[TokenBudget] = None,
+    ) -> str:
+        """
+        Sends a message to a general, retrying with an exponential backoff when it fails.
+
+        Each attempt is limited to what is left of `max_tokens` after the tokens already counted in
+        `token_usage`, and no retry is made once it is spent. The usage of each attempt is added to
+        `token_usage` and charged to `general` in the `budget`. The steps recorded by a failed attempt
+        (its tool executions) stay in the task, tagged with `failed_attempt`.
+
+        Args:
+            dictator (AssignedGeneral): The dictator sending the message.
+            general (AssignedGeneral): The general receiving it.
+            message (str): The message.
+            task (Task): The task being solved.
+            max_tokens (Optional[int]): Output tokens shared by all the attempts, None for no limit.
+            token_usage (Optional[Dict[str, int]]): Usage already spent on the request, updated by each attempt.
+            budget (Optional[TokenBudget]): The token budget charged with each attempt.
+
+        Returns:
+            str: The answer of the general.
+        """
+        if token_usage is None:
+            token_usage = {}
+        for attempt in range(self.max_retries + 1):
+            call_kwargs: Dict[str, Any] = {}
+            if max_tokens:
+                call_kwargs["max_tokens"] = max_tokens - token_usage.get("completion_tokens", 0)
+            attempt_task = _AttemptTask(task)
+            attempt_usage: Dict[str, int] = {}
+            try:
+                return await dictator.send_message(general, message, task=attempt_task, token_usage=attempt_usage, **call_kwargs)
+            except Exception as e:
+                for step in attempt_task.added_steps:
+                    step.metadata["failed_attempt"] = attempt + 1
+                if attempt >= self.max_retries:
+                    raise
+                if max_tokens and token_usage.get("completion_tokens", 0) + attempt_usage.get("completion_tokens", 0) >= max_tokens:
+                    logger.warning(f"General {general.my_name_is} failed (attempt {attempt + 1}) and its allocation is spent: {e}")
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning(f"General {general.my_name_is} failed (attempt {attempt + 1}), retrying in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+            finally:
+                for key, value in attempt_usage.items():
+                    token_usage[key] = token_usage.get(key, 0) + value
+                if budget is not None:
+                    budget.record_usage(general.my_name_is, attempt_usage.get("completion_tokens", 0))
+
+    def select_alternate_generals(
+        self, general: AssignedGeneral, generals: List[AssignedGeneral]
+    ) -> List[AssignedGeneral]:
+        """
+        Selects the generals able to take over the work of a general, based on the subtasks the
+        LegionCommander assigned to each of them.
+
+        Args:
+            general (AssignedGeneral): The general who may fail.
+            generals (List[AssignedGeneral]): All the selected generals.
+
+        Returns:
+            List[AssignedGeneral]: The generals sharing at least one subtask with `general`,
+            ordered by number of shared subtasks, then by confidence.
+        """
+        own_subtasks = {subtask for subtask, _ in self.split_subtasks(general.capabilities_used)}
+        candidates = []
+        for other in generals:
+            if other is general or other.my_name_is == general.my_name_is:
+                continue
+            overlap = len(own_subtasks & {subtask for subtask, _ in self.split_subtasks(other.capabilities_used)})
+            if overlap:
+                candidates.append((overlap, other.confidence or 0.0, other))
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[1]), reverse=True)
+        return [candidate for _, _, candidate in candidates]
+
+    @staticmethod
+    def missing_contribution_marker(
+        general_name: str,
+        capabilities: List[Dict[str, Any]],
+        subtask: Optional[str] = None,
+        error: Optional[Exception] = None,
+    ) -> str:
+        """
+        Builds the structured marker replacing a contribution that could not be obtained.
+
+        Args:
+            general_name (str): The general whose contribution is missing.
+            capabilities (List[Dict[str, Any]]): The capabilities the contribution should have covered.
+            subtask (Optional[str]): The missing subtask, when only one subtask is missing.
+            error (Optional[Exception]): The last error encountered.
+
+        Returns:
+            str: A JSON object under the `missing_contribution` key.
+        """
+        if subtask is not None:
+            subtasks = [subtask]
+        else:
+            subtasks = [name for name, _ in GroupChat.split_subtasks(capabilities)]
+        return json.dumps({
+            "missing_contribution": {
+                "general": general_name,
+                "capabilities": [cap.get("capability") for cap in capabilities or []],
+                "subtasks": subtasks,
+                "reason": type(error).__name__ if error else "unknown",
+            }
+        }, ensure_ascii=False)
+
+    @staticmethod
+    def split_subtasks(capabilities_used: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Groups the capabilities of a general by subtask.
+
+        Args:
+            capabilities_used (List[Dict[str, Any]]): The capabilities selected by the LegionCommander,
+                each one listing the `subtasks` it covers.
+
+        Returns:
+            List[tuple]: `(subtask, capabilities)` pairs, in order of first appearance, where
+            `capabilities` are the capabilities of the general that cover the subtask.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for cap in capabilities_used or []:
+            for subtask in cap.get("subtasks", []) or []:
+                key = subtask if isinstance(subtask, str) else str(subtask)
+                grouped.setdefault(key, []).append(cap)
+        return list(grouped.items())
+
+    @staticmethod
+    def select_prefetched_results(
+        prefetched: Optional[List[Dict[str, Any]]], capabilities: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Keeps the prefetched retrieval results of the `legal_queries` of the given capabilities.
+        """
+        if not prefetched:
+            return []
+        queries = {
+            str(query)
+            for cap in capabilities
+            for query in (cap.get("legal_queries", []) or [])
+        }
+        return [result for result in prefetched if result["query"] in queries]
+
+    def build_imperative_message(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        task: Task,
+        capabilities: List[Dict[str, Any]],
+        subtask: Optional[str] = None,
+        prefetched: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Construit le message impératif envoyé par le dictateur à un général.
+
+        Args:
+            dictator (AssignedGeneral): The dictator issuing the command.
+            general (AssignedGeneral): The general receiving the command.
+            task (Task): The task being solved.
+            capabilities (List[Dict[str, Any]]): The capabilities the general has been selected for.
+            subtask (Optional[str]): When set, the general only has to solve this subtask.
+            prefetched (Optional[List[Dict[str, Any]]]): Results of the retrieval tools already run on the
+                `legal_queries`; they are included so that the general can answer without calling them.
+
+        Returns:
+            str: The imperative message.
+        """
+        # Générer une liste de capacités sous forme de texte
+        selected_capabilities = [
+            f"{cap['capability']} (Explanation: {cap.get('explanation', '')}, Legal queries: {cap.get('legal_queries', [])}, Confidence: {general.confidence}) subtasks: {cap.get('subtasks', [])}"
+            for cap in capabilities
+        ]
+        selected_capabilities_str = "\n- ".join(selected_capabilities)
+
+        if subtask is not None:
+            scope = (
+                f"You have been chosen based on the following capabilities:\n"
+                f"- {selected_capabilities_str}.\n\n"
+                f"Solve only the following subtask, the other subtasks are handled separately: '{subtask}'.\n\n"
+            )
+        else:
+            scope = (
+                f"You have been chosen based on the following capabilities, and associate subtasks to solve :\n"
+                f"- {selected_capabilities_str}.\n\n"
+                f"\n\n"
+            )
+
+        if prefetched:
+            results_str = "\n\n".join(
+                f"#### {result['query']} ({result['tool']})\n{result['result']}" for result in prefetched
+            )
+            research = (
+                f"The `legal_queries` provided with each capability have already been searched with your legal research tools. "
+                f"Here are the results:\n{results_str}\n\n"
+                f"Answer directly from these results. Only use your tools for research that is still missing.\n\n"
+            )
+        else:
+            research = (
+                "You are allowed and encouraged to use your legal tools to search for supporting legal texts, "
+                "articles, jurisprudence or doctrine that could strengthen your answer.\n"
+                "For this, rely on the `legal_queries` provided with each capability. "
+                "Use them as search inputs for your legal research tools to retrieve the most relevant legal context.\n\n"
+            )
+
+        return (
+            f"I am {dictator.my_name_is}, and I have selected you, {general.my_name_is}, "
+            f"to assist with the task: '{task.request}'.\n"
+            f"{scope}"
+            f"Focus strictly on these capabilities and their details, and provide your input accordingly to solve the subtasks. "
+            f"Ignore any aspect of the task that falls outside your expertise.\n"
+
+            f"{research}"
 
+            f"Be concise, precise, and legally grounded in your response."
+        )
 
-    
     def get_general_relevant_capabilities(self, general, task) -> List[Dict[str, Any]]:
         """
         Extracts the relevant capabilities of a specific general for a given task.
@@ -0,0 +1,318 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from dictatorgenai.agents.assigned_general import AssignedGeneral
+from dictatorgenai.config import DictatorSettings
+from dictatorgenai.events.event import Event, EventType
+from dictatorgenai.models.base_model import Message
+from dictatorgenai.utils.task import Task
+from dictatorgenai.utils.token_budget import TokenBudget
+from .group_chat import GroupChat
+
+logger = logging.getLogger(__name__)
+
+
+class RefinementChat(GroupChat):
+    """
+    A debate/refinement conversation pattern. The generals contribute as in `GroupChat`, then the
+    dictator critiques the contributions and the generals revise them over several rounds.
+
+    Rounds stop as soon as one of the following happens:
+    - the dictator has no more critique to make,
+    - the contributions have converged (the text similarity between two rounds reaches
+      `convergence_threshold` for every revised general),
+    - the round budget (`max_rounds`) or the time budget (`max_seconds`) is exhausted.
+
+    The planning and the selection of the generals happen only once, before the first round.
+
+    Attributes:
+        max_rounds (int): Maximum number of contribution rounds, the initial one included.
+        max_seconds (Optional[float]): Time budget for all the rounds. A round that would exceed it
+            is abandoned and the contributions of the previous round are kept.
+        convergence_threshold (float): Similarity (between 0 and 1) above which a revised
+            contribution is considered stable.
+        critique_max_tokens (int): Maximum number of tokens generated for the critique of a round.
+    """
+
+    def __init__(
+        self,
+        max_rounds: int = 3,
+        max_seconds: Optional[float] = None,
+        convergence_threshold: float = 0.9,
+        critique_max_tokens: int = 1000,
+        fan_out_subtasks: bool = False,
+        max_parallel_subtasks: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initializes the RefinementChat.
+
+        Args:
+            max_rounds (int): Maximum number of contribution rounds, the initial one included.
+            max_seconds (Optional[float]): Time budget for all the rounds.
+            convergence_threshold (float): Similarity above which contributions are considered stable.
+            critique_max_tokens (int): Maximum number of tokens generated for the critique of a round.
+            fan_out_subtasks (bool): See `GroupChat`.
+            max_parallel_subtasks (Optional[int]): See `GroupChat`.
+            **kwargs: Other `GroupChat` options (retries, failover, token budget).
+        """
+        super().__init__(fan_out_subtasks=fan_out_subtasks, max_parallel_subtasks=max_parallel_subtasks, **kwargs)
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be at least 1.")
+        self.max_rounds = max_rounds
+        self.max_seconds = max_seconds
+        self.convergence_threshold = convergence_threshold
+        self.critique_max_tokens = critique_max_tokens
+
+    async def start_conversation(
+        self, dictator: AssignedGeneral, generals: List[AssignedGeneral], task: Task
+    ) -> AsyncGenerator[str, None]:
+        """
+        Runs the refinement rounds, then lets the dictator resolve the task with the final contributions.
+        """
+        try:
+            deadline = time.monotonic() + self.max_seconds if self.max_seconds else None
+
+            budget = self.create_token_budget(generals)
+            contributions = await self.gather_contributions(dictator, generals, task, budget=budget)
+            rounds = 1
+            stop_reason = "max_rounds"
+
+            while rounds < self.max_rounds:
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    stop_reason = "time_budget"
+                    break
+
+                try:
+                    revised = await asyncio.wait_for(
+                        self.run_refinement_round(dictator, generals, task, contributions, budget=budget),
+                        timeout=remaining,
+                    )
+                except asyncio.TimeoutError:
+                    logger.debug(f"Refinement round {rounds + 1} exceeded the time budget, keeping round {rounds}.")
+                    stop_reason = "time_budget"
+                    break
+
+                if revised is None:
+                    stop_reason = "no_critique"
+                    break
+
+                similarity = self.contributions_similarity(contributions, revised)
+                contributions = revised
+                rounds += 1
+                await self._publish_round(dictator, task, rounds, similarity)
+
+                if similarity >= self.convergence_threshold:
+                    stop_reason = "converged"
+                    break
+
+            task.add_metadata("refinement", {"rounds": rounds, "stop_reason": stop_reason})
+            self.record_contributions(contributions, task)
+            if budget is not None:
+                task.add_metadata("token_budget", budget.report())
+
+            logger.debug(f"Dictator {dictator.my_name_is} is now resolving the task after {rounds} round(s) ({stop_reason})...\n")
+            async for chunk in self.synthesize(dictator, task, budget):
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"An error occurred during the conversation: {e}")
+            yield f"An error occurred: {e}"
+
+    async def run_refinement_round(
+        self,
+        dictator: AssignedGeneral,
+        generals: List[AssignedGeneral],
+        task: Task,
+        contributions: List[Dict[str, Any]],
+        budget: Optional[TokenBudget] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Runs one critique/revision round.
+
+        Args:
+            dictator (AssignedGeneral): The dictator critiquing the contributions.
+            generals (List[AssignedGeneral]): The generals revising their contributions.
+            task (Task): The task being solved.
+            contributions (List[Dict[str, Any]]): The contributions of the previous round.
+            budget (Optional[TokenBudget]): The token budget; each revision is limited to the
+                allocation of its general and consumes it, the critique consumes the synthesis share.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The revised contributions, or None if the dictator
+            has nothing left to criticize.
+        """
+        critiques = await self.critique_contributions(dictator, task, contributions, budget=budget)
+        if not critiques:
+            return None
+
+        generals_by_name = {general.my_name_is: general for general in generals}
+
+        async def revise(contribution: Dict[str, Any]) -> Dict[str, Any]:
+            critique = critiques.get(contribution["general"])
+            general = generals_by_name.get(contribution["general"])
+            if not critique or general is None or contribution.get("status") == "missing":
+                return contribution
+            message = self.build_revision_message(dictator, general, task, contribution, critique)
+            max_tokens = budget.limit_for(general.my_name_is) if budget else None
+            try:
+                content = await self._send_with_retry(
+                    dictator, general, message, task, max_tokens=max_tokens, token_usage={}, budget=budget
+                )
+            except Exception as e:
+                logger.error(f"General {general.my_name_is} failed to revise its contribution: {e}")
+                return contribution
+            revised = {**contribution, "content": content, "revised": True}
+            if budget is not None:
+                revised["token_usage"] = budget.report()["generals"].get(general.my_name_is)
+            return revised
+
+        return list(await asyncio.gather(*[revise(contribution) for contribution in contributions]))
+
+    async def critique_contributions(
+        self,
+        dictator: AssignedGeneral,
+        task: Task,
+        contributions: List[Dict[str, Any]],
+        budget: Optional[TokenBudget] = None,
+    ) -> Dict[str, str]:
+        """
+        Asks the dictator to critique the contributions of the generals.
+
+        Args:
+            dictator (AssignedGeneral): The dictator critiquing the contributions.
+            task (Task): The task being solved.
+            contributions (List[Dict[str, Any]]): The contributions to critique.
+            budget (Optional[TokenBudget]): The token budget; the critique is recorded in the usage
+                of the synthesis, the share of the budget reserved for the dictator.
+
+        Returns:
+            Dict[str, str]: The critique for each general whose contribution must be revised.
+        """
+        response = await dictator.nlp_model.chat_completion(
+            [
+                Message(role="system", content=self.build_critique_prompt(dictator, task, contributions)),
+                Message(role="user", content="Critique these contributions."),
+            ],
+            tools=[],
+            max_tokens=self.critique_max_tokens,
+            response_format={"type": "json_object"},
+        )
+        if budget is not None:
+            usage = getattr(response, "usage", None)
+            budget.record_synthesis_usage(getattr(usage, "completion_tokens", 0) or 0)
+        try:
+            evaluation = json.loads(getattr(response.message, "content", "{}") or "{}")
+        except json.JSONDecodeError:
+            logger.error("Failed to decode the critique of the dictator, stopping the refinement.")
+            return {}
+
+        critiques = {}
+        for general_name, data in evaluation.items():
+            if isinstance(data, dict) and not data.get("satisfied", False) and data.get("critique"):
+                critiques[general_name] = data["critique"]
+        return critiques
+
+    def build_critique_prompt(self, dictator: AssignedGeneral, task: Task, contributions: List[Dict[str, Any]]) -> str:
+        """
+        Builds the prompt asking the dictator to critique the contributions.
+        """
+        contributions_str = "\n\n".join(
+            f"## {contribution['general']}\n{contribution['content']}" for contribution in contributions
+        )
+        reply_language = f"Write the critiques in {DictatorSettings.get_language()} language."
+
+        return f"""
+My name is {dictator.my_name_is}. I am {dictator.iam}.
+I lead the resolution of the task: '{task.request}'.
+
+# Contributions of the generals
+{contributions_str}
+
+# Objective
+Critique each contribution: point out errors, missing elements, weak legal grounding and contradictions
+with the other contributions. If a contribution needs no further work, mark it as satisfied.
+
+Reply in JSON format, for example:
+{{
+    "general_name": {{
+        "satisfied": false,
+        "critique": "The answer omits the limitation period applicable to ..."
+    }}
+}}
+
+{reply_language}
+""".strip()
+
+    def build_revision_message(
+        self,
+        dictator: AssignedGeneral,
+        general: AssignedGeneral,
+        task: Task,
+        contribution: Dict[str, Any],
+        critique: str,
+    ) -> str:
+        """
+        Builds the message asking a general to revise its contribution.
+        """
+        return (
+            f"I am {dictator.my_name_is}. For the task '{task.request}', you provided the following contribution:\n"
+            f"{contribution['content']}\n\n"
+            f"Here is my critique:\n{critique}\n\n"
+            f"Revise your contribution to address the critique. Keep what was correct, "
+            f"and provide the complete revised contribution, not only the changes."
+        )
+
+    def contributions_similarity(
+        self, previous: List[Dict[str, Any]], current: List[Dict[str, Any]]
+    ) -> float:
+        """
+        Computes the similarity between two rounds as the lowest similarity of the revised contributions.
+
+        Args:
+            previous (List[Dict[str, Any]]): Contributions of the previous round.
+            current (List[Dict[str, Any]]): Contributions of the current round.
+
+        Returns:
+            float: A value between 0 and 1. Unrevised contributions are ignored.
+        """
+        previous_by_general = {contribution["general"]: contribution["content"] for contribution in previous}
+        similarities = [
+            self.text_similarity(previous_by_general.get(contribution["general"], ""), contribution["content"])
+            for contribution in current
+            if contribution.get("revised")
+        ]
+        return min(similarities) if similarities else 1.0
+
+    @staticmethod
+    def text_similarity(first: str, second: str) -> float:
+        """
+        Cheap local similarity: Jaccard index of the word sets of both texts.
+
+        Args:
+            first (str): First text.
+            second (str): Second text.
+
+        Returns:
+            float: A value between 0 (nothing in common) and 1 (same words).
+        """
+        first_words = set(re.findall(r"\w+", (first or "").lower()))
+        second_words = set(re.findall(r"\w+", (second or "").lower()))
+        if not first_words and not second_words:
+            return 1.0
+        return len(first_words & second_words) / len(first_words | second_words)
+
+    async def _publish_round(self, dictator: AssignedGeneral, task: Task, rounds: int, similarity: float):
+        event_manager = getattr(dictator, "event_manager", None)
+        if event_manager is not None:
+            await event_manager.publish(Event(
+                EventType.TASK_UPDATED,
+                f"Refinement round {rounds} completed (similarity {similarity:.2f}).",
+                task.task_id,
+                details=task.to_dict(),
+            ))
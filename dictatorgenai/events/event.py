@@ -26,6 +26,9 @@ class EventType(Enum):
     GENERAL_REMOVED = "general_removed"
     COUP_D_ETAT = "coup_d_etat"
 
+    # 🎯 Tool Events
+    TOOL_PROGRESS = "tool_progress"
+
     # 🎯 Custom Events (modifiable by developers)
     _custom_events: Set[str] = set()
 
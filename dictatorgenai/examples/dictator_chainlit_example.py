@@ -136,8 +136,8 @@ def estimate_damage(injury_type: str, severity_level: int) -> str:
         f"(Test - réponse fixe)."
     )
 
-@tool(description="Recherche dans le code pénal avec la query en entrée et renvoie les articles de lois du code pénal relatifs à la requette.")
-def code_penal_search(query: str, top_k: int) -> str:
+@tool(description="Recherche dans le code pénal avec la query en entrée et renvoie les articles de lois du code pénal relatifs à la requette.", query_param="query")
+def code_penal_search(query: str, top_k: int = 5) -> str:
     return (
         f"article 22-53 du Code pénal qui traite du harcèlement moral, et l'article 23-34 qui aborde le harcèlement sexuel et le damage corporel."
     )
@@ -10,6 +10,7 @@ from .sql_ite_chat_memory import SQLiteChatMemory
 from .redis_chat_memory import RedisChatMemory
 from .base_memory import BaseMemory
 from .regime_memory import RegimeMemory
+from .compaction import MemoryCompactor
 
 
 __all__ = [
@@ -19,4 +20,5 @@ __all__ = [
     "RedisChatMemory",
     "BaseMemory",
     "RegimeMemory",
+    "MemoryCompactor",
 ]
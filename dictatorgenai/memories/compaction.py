@@ -0,0 +1,113 @@
+# dictatorgenai/memories/compaction.py
+import logging
+from typing import Callable, List, Optional
+
+from ..config.settings import DictatorSettings
+from ..models.base_model import BaseModel, Message
+from ..steps.base_step import TaskStep
+from ..utils.task import Task
+
+
+class MemoryCompactor:
+    """
+    Résume les tours les plus anciens d'une discussion pour borner la taille des prompts.
+
+    `RegimeMemory` asks the compactor at the end of each turn whether the context of the prompts
+    (summary, user messages and final answers) exceeds `max_context_tokens`. If so, every turn
+    but the last `keep_recent_turns` is summarized in the background, together with the previous
+    summary, into a `ConversationSummaryStep` persisted with the other steps.
+
+    Tokens are estimated at 4 characters per token unless a `token_counter` is given.
+    """
+
+    def __init__(
+        self,
+        nlp_model: Optional[BaseModel] = None,
+        max_context_tokens: int = 8000,
+        keep_recent_turns: int = 4,
+        summary_max_tokens: int = 1000,
+        token_counter: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Args:
+            nlp_model (Optional[BaseModel]): Modèle utilisé pour les résumés, celui de `DictatorSettings` par défaut.
+            max_context_tokens (int): Taille du contexte (en tokens) au-delà de laquelle la discussion est compactée.
+            keep_recent_turns (int): Nombre de tours récents conservés tels quels.
+            summary_max_tokens (int): Nombre maximal de tokens générés pour un résumé.
+            token_counter (Optional[Callable[[str], int]]): Compte les tokens d'un texte (ex. un tokenizer tiktoken).
+        """
+        if keep_recent_turns < 1:
+            raise ValueError("keep_recent_turns must be at least 1.")
+        self.nlp_model = nlp_model
+        self.max_context_tokens = max_context_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.summary_max_tokens = summary_max_tokens
+        self.token_counter = token_counter
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Estime le nombre de tokens d'un texte.
+        """
+        if self.token_counter is not None:
+            return self.token_counter(text)
+        return len(text) // 4 + 1
+
+    def context_tokens(self, steps: List[TaskStep]) -> int:
+        """
+        Estime la taille du contexte que les prompts construisent à partir des étapes.
+
+        Args:
+            steps (List[TaskStep]): Les étapes chargées de la mémoire.
+
+        Returns:
+            int: Nombre de tokens estimé.
+        """
+        context = Task(request="", steps=steps).get_context_steps(include_contributions=False)
+        return sum(self.count_tokens(step.content) for step in context)
+
+    def should_compact(self, steps: List[TaskStep], turns: int) -> bool:
+        """
+        Indique si la discussion doit être compactée.
+
+        Args:
+            steps (List[TaskStep]): Les étapes chargées de la mémoire.
+            turns (int): Nombre de tours chargés depuis le dernier résumé.
+
+        Returns:
+            bool: True si le contexte dépasse `max_context_tokens` et qu'il y a des tours à résumer.
+        """
+        return turns > self.keep_recent_turns and self.context_tokens(steps) > self.max_context_tokens
+
+    async def summarize(self, previous_summary: Optional[str], steps: List[TaskStep]) -> str:
+        """
+        Résume des tours de discussion, en intégrant le résumé précédent.
+
+        Args:
+            previous_summary (Optional[str]): Le résumé des tours déjà compactés.
+            steps (List[TaskStep]): Les étapes des tours à résumer.
+
+        Returns:
+            str: Le nouveau résumé.
+        """
+        transcript = "\n\n".join(
+            f"{step.role}: {step.content}"
+            for step in steps
+            if step.step_type in ("user_message", "assistant_message") and not Task.is_general_contribution(step)
+        )
+        previous = f"Summary of the earlier discussion:\n{previous_summary}\n\n" if previous_summary else ""
+        messages = [
+            Message(
+                role="system",
+                content=(
+                    "You maintain the running summary of a long discussion between a user and a legal assistant. "
+                    "Merge the earlier summary and the new exchanges into a single summary that keeps the facts of the case, "
+                    "the questions asked, the answers and legal references given, the decisions taken and the open points. "
+                    "Drop greetings and repetitions. Write in the language of the discussion."
+                ),
+            ),
+            Message(role="user", content=f"{previous}New exchanges:\n{transcript}"),
+        ]
+        model = self.nlp_model or DictatorSettings.get_nlp_model()
+        response = await model.chat_completion(messages, tools=[], max_tokens=self.summary_max_tokens)
+        return getattr(response.message, "content", "") or ""
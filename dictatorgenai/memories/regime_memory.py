@@ -1,42 +1,268 @@
 # mon_framework/memory/regime_memory.py
-from typing import List, Optional, Union
+import asyncio
+import bisect
+import logging
+from typing import Any, Dict, List, Optional, Union
 from .base_memory import BaseMemory
+from ..config.settings import DictatorSettings
 from ..steps.base_step import TaskStep
-from ..steps.message_steps import UserMessageStep, AssistantMessageStep
+from ..steps.message_steps import UserMessageStep, AssistantMessageStep, ConversationSummaryStep
 from ..steps.action_steps import GeneralSelectionStep, CoupDEtatStep, ActionStep
 from .stores.memory_store import MemoryStore
+from .stores.async_memory_store import AsyncMemoryStore, SyncStoreAdapter
+from .compaction import MemoryCompactor
 from ..utils.task import Task
 
+# Modes de durabilité des étapes persistées
+DURABILITY_MODES = ("strict", "per_turn", "periodic")
+
+
 class RegimeMemory(BaseMemory):
     """
     Gestion de la mémoire du régime, incluant les étapes de sélection des généraux, des coups d'état et des actions.
+
+    The store is accessed asynchronously: the steps are loaded by `load` (or `ensure_loaded`)
+    and every method writing to the store must be awaited.
+
+    Unless `durability` is "strict", the steps are written behind: they are buffered in order and
+    written to the store in a single batch by `flush`, so that the store latency stays off the
+    streaming path. Buffered steps are lost if the process dies before they are flushed; `close`
+    flushes them on shutdown.
+
+    With `window_turns`, only the last turns are loaded, from a snapshot saved every `snapshot_every`
+    turns (step count, turn positions, current dictator, summary, step counts per type). Older steps
+    are paged in on demand with `page_older_steps`.
+
+    With a `compactor`, the oldest turns are summarized in the background once the context of the
+    prompts grows past its token threshold (see `MemoryCompactor`). The `ConversationSummaryStep`
+    is persisted like any other step and replaces the summarized steps in `steps`; these stay in
+    the store, which serves as cold storage, and are no longer loaded into the prompts.
     """
 
-    def __init__(self, memory_id: str, task: Task, store: MemoryStore):
+    def __init__(
+        self,
+        memory_id: str,
+        task: Task,
+        store: Union[AsyncMemoryStore, MemoryStore],
+        durability: str = "per_turn",
+        flush_interval: float = 1.0,
+        max_buffered_steps: int = 100,
+        window_turns: Optional[int] = None,
+        snapshot_every: Optional[int] = 10,
+        compactor: Optional[MemoryCompactor] = None,
+    ):
         """
         Initialise la mémoire du régime.
 
         Args:
             memory_id (str): Identifiant unique de la mémoire.
             task (Task): Objet représentant la tâche principale de la discussion.
-            store (MemoryStore): Instance de stockage (RedisStore ou SQLiteStore).
+            store (Union[AsyncMemoryStore, MemoryStore]): Instance de stockage (AsyncSQLiteStore, AsyncRedisStore...).
+                Un store synchrone est exécuté sur un thread dédié via `SyncStoreAdapter`.
+            durability (str): Quand les étapes sont écrites dans le store :
+                - "strict": chaque étape est écrite avant que `save_step` ne rende la main,
+                - "per_turn": les étapes d'un tour sont écrites ensemble à la fin du tour (`end_turn`),
+                - "periodic": les étapes sont écrites en arrière-plan, au plus `flush_interval` secondes après leur ajout.
+            flush_interval (float): Délai maximal avant l'écriture des étapes en mode "periodic".
+            max_buffered_steps (int): Nombre d'étapes en attente au-delà duquel elles sont écrites sans attendre.
+            window_turns (Optional[int]): Nombre de tours chargés par `load`, None pour toute la discussion.
+            snapshot_every (Optional[int]): Nombre de tours entre deux instantanés, None pour n'en jamais enregistrer.
+            compactor (Optional[MemoryCompactor]): Résume les tours les plus anciens en arrière-plan, None pour ne jamais compacter.
         """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Invalid durability '{durability}'. Must be one of: {DURABILITY_MODES}")
+        if window_turns is not None and window_turns < 1:
+            raise ValueError("window_turns must be at least 1.")
         super().__init__(memory_id)
         self.task = task
         self.steps: List[TaskStep] = []  # Liste des étapes stockées
-        self.store = store  # Store de persistance (Redis ou SQLite)
+        # Store de persistance (Redis ou SQLite)
+        self.store: AsyncMemoryStore = store if isinstance(store, AsyncMemoryStore) else SyncStoreAdapter(store)
         self.current_request_id: Optional[str] = None  # Permet de suivre la requête en cours
+        self.loaded = False
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.max_buffered_steps = max_buffered_steps
+        self._pending: List[TaskStep] = []  # Étapes pas encore écrites, dans l'ordre
+        self._flush_lock: Optional[asyncio.Lock] = None  # Créé au premier usage, dans la boucle courante
+        self._flush_timer: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
 
-        # Charger les étapes existantes depuis le store
-        self.load_from_store()
+        self.window_turns = window_turns
+        self.snapshot_every = snapshot_every
+        # État de la discussion stockée, tenu à jour à chaque étape et enregistré dans les instantanés
+        self.stored_count = 0  # Nombre d'étapes stockées (ou en attente d'écriture)
+        self.turn_starts: List[int] = []  # Position de chaque message utilisateur parmi les étapes stockées
+        self.step_counts: Dict[str, int] = {}
+        self.dictator: Optional[str] = None
+        self.summary: Optional[Dict[str, Any]] = None  # Dernier `ConversationSummaryStep`, sous forme de dictionnaire
+        self.first_position = 0  # Position de la plus ancienne étape chargée
+        self._turns_since_snapshot = 0
 
-    def load_from_store(self):
+        self.compactor = compactor
+        self._compaction_task: Optional[asyncio.Task] = None
+
+    async def load(self):
         """
         Charge les étapes de la mémoire depuis le store de persistance.
+
+        The list `steps` is updated in place, so that the tasks sharing it see the loaded steps.
+        Buffered steps are flushed first. With `window_turns`, only the last turns are loaded.
+        Summarized steps are replaced by the latest summary.
+        """
+        await self.flush()
+        self._reset_state()
+        snapshot = await self.store.load_snapshot(self.memory_id)
+        if self.window_turns is None:
+            steps = await self.store.load_steps(self.memory_id)
+            for step in steps:
+                self._track(step)
+        else:
+            steps = await self._load_window(snapshot)
+        self.steps[:] = self._attach_summary(steps)
+        self.current_request_id = next(
+            (step.request_id for step in reversed(steps) if step.step_type == "user_message"), None
+        )
+        self.loaded = True
+
+    async def _load_window(self, snapshot: Optional[Dict[str, Any]]) -> List[TaskStep]:
+        """
+        Charge les `window_turns` derniers tours : l'instantané donne la position des tours qu'il couvre,
+        seules les étapes enregistrées après lui sont parcourues.
+        """
+        total = await self.store.count_steps(self.memory_id)
+        if snapshot is not None and snapshot.get("step_count", 0) <= total:
+            self.stored_count = snapshot["step_count"]
+            self.turn_starts = list(snapshot.get("turn_starts", []))
+            self.step_counts = dict(snapshot.get("step_counts", {}))
+            self.dictator = snapshot.get("dictator")
+            self.summary = snapshot.get("summary")
+        else:
+            snapshot = None  # Absent, ou en avance sur les étapes réellement écrites : tout est relu
+        tail_start = self.stored_count
+
+        tail = await self.store.load_steps_range(self.memory_id, tail_start, total)
+        for step in tail:
+            self._track(step)
+
+        window_start = self.turn_starts[-self.window_turns] if len(self.turn_starts) >= self.window_turns else 0
+        if window_start < tail_start:
+            steps = await self.store.load_steps_range(self.memory_id, window_start, tail_start) + tail
+        else:
+            steps = tail[window_start - tail_start:]
+        self.first_position = window_start
+
+        if snapshot is None and self.snapshot_every:
+            await self.save_snapshot()
+        return steps
+
+    def _attach_summary(self, steps: List[TaskStep]) -> List[TaskStep]:
+        """
+        Remplace les étapes chargées couvertes par le dernier résumé (à partir de `first_position`) par ce résumé.
+        """
+        if self.summary is None:
+            return steps
+        summary = TaskStep.from_dict(self.summary)
+        kept = [
+            step for position, step in enumerate(steps, self.first_position)
+            if position >= summary.compacted_until and step.step_type != "conversation_summary"
+        ]
+        self.first_position = max(self.first_position, summary.compacted_until)
+        return [summary] + kept
+
+    @property
+    def compacted_until(self) -> int:
+        """Position de la première étape stockée non couverte par le dernier résumé (0 sans résumé)."""
+        return self.summary.get("compacted_until", 0) if self.summary else 0
+
+    @property
+    def has_older_steps(self) -> bool:
+        """Indique si des étapes plus anciennes que celles chargées, et non résumées, sont stockées."""
+        return self.first_position > self.compacted_until
+
+    async def page_older_steps(self, turns: int = 1) -> List[TaskStep]:
+        """
+        Charge les étapes des `turns` tours précédant les étapes chargées, et les insère dans `steps`
+        avant elles (après le résumé, s'il y en a un). Les étapes résumées ne sont pas rechargées.
+
+        Args:
+            turns (int): Nombre de tours à charger.
+
+        Returns:
+            List[TaskStep]: Les étapes chargées, dans l'ordre (vide s'il n'y en a plus).
+        """
+        if not self.has_older_steps:
+            return []
+        older_turns = bisect.bisect_left(self.turn_starts, self.first_position)
+        start = self.turn_starts[older_turns - turns] if older_turns >= turns else 0
+        start = max(start, self.compacted_until)
+        older = [
+            step for step in await self.store.load_steps_range(self.memory_id, start, self.first_position)
+            if step.step_type != "conversation_summary"
+        ]
+        summary_index = next(
+            (index for index, step in enumerate(self.steps) if step.step_type == "conversation_summary"), -1
+        )
+        self.steps[summary_index + 1:summary_index + 1] = older
+        self.first_position = start
+        return older
+
+    def _track(self, step: TaskStep):
+        """
+        Met à jour l'état de la discussion stockée avec une nouvelle étape.
         """
-        self.steps = self.store.load_steps(self.memory_id)
+        if step.step_type == "user_message":
+            self.turn_starts.append(self.stored_count)
+        elif step.step_type == "coup_d_etat":
+            self.dictator = step.new_dictator
+        elif step.step_type == "conversation_summary":
+            self.summary = step.as_dict()
+        self.step_counts[step.step_type] = self.step_counts.get(step.step_type, 0) + 1
+        self.stored_count += 1
 
-    def save_step(self, step: TaskStep):
+    def _reset_state(self):
+        """
+        Réinitialise l'état de la discussion stockée.
+        """
+        self.stored_count = 0
+        self.turn_starts = []
+        self.step_counts = {}
+        self.dictator = None
+        self.summary = None
+        self.first_position = 0
+        self._turns_since_snapshot = 0
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne l'instantané de la discussion stockée.
+
+        Returns:
+            Dict[str, Any]: `step_count`, `turn_starts`, `step_counts`, `dictator` et `summary`.
+        """
+        return {
+            "step_count": self.stored_count,
+            "turn_starts": list(self.turn_starts),
+            "step_counts": dict(self.step_counts),
+            "dictator": self.dictator,
+            "summary": self.summary,
+        }
+
+    async def save_snapshot(self):
+        """
+        Écrit les étapes en attente, puis enregistre l'instantané de la discussion dans le store.
+        """
+        await self.flush()
+        await self.store.save_snapshot(self.memory_id, self.get_snapshot())
+        self._turns_since_snapshot = 0
+
+    async def ensure_loaded(self):
+        """
+        Charge les étapes de la mémoire si ce n'est pas encore fait.
+        """
+        if not self.loaded:
+            await self.load()
+
+    async def save_step(self, step: TaskStep):
         """
         Ajoute une étape en mémoire et la persiste dans le store.
 
@@ -44,21 +270,193 @@ class RegimeMemory(BaseMemory):
             step (TaskStep): Étape à ajouter.
         """
         self.steps.append(step)
-        self.store.save_step(self.memory_id, step)
+        self._track(step)
+        await self._persist(step)
+
+    async def _persist(self, step: TaskStep):
+        """
+        Écrit une étape déjà suivie par `_track`, selon le mode de durabilité.
+        """
+        if self.durability == "strict":
+            await self.store.save_step(self.memory_id, step)
+            return
+
+        self._pending.append(step)
+        if len(self._pending) >= self.max_buffered_steps:
+            await self.flush()
+        elif self.durability == "periodic" and self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """
+        Écrit les étapes en attente dans le store, en un seul lot et dans l'ordre.
+
+        If the write fails, the steps stay buffered for the next flush and the error is raised.
+        """
+        async with self._get_flush_lock():
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            try:
+                await self.store.save_steps(self.memory_id, batch)
+            except BaseException:
+                self._pending[:0] = batch
+                raise
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        """Verrou sérialisant les écritures du tampon et l'effacement de la mémoire."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def _flush_later(self):
+        """
+        Écrit les étapes en attente après `flush_interval` secondes (mode "periodic").
+        """
+        await asyncio.sleep(self.flush_interval)
+        self._flush_timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to persist the steps of memory '{self.memory_id}': {e}")
+        if self._pending and self._flush_timer is None:
+            # Étapes ajoutées pendant l'écriture, ou échec : nouvelle tentative au délai suivant
+            self._flush_timer = asyncio.create_task(self._flush_later())
+
+    async def end_turn(self):
+        """
+        Termine un tour de discussion : en mode "per_turn", les étapes du tour sont écrites.
+        Un instantané est enregistré tous les `snapshot_every` tours.
+        """
+        if self.durability == "per_turn":
+            await self.flush()
+        self._turns_since_snapshot += 1
+        if self.snapshot_every and self._turns_since_snapshot >= self.snapshot_every:
+            await self.save_snapshot()
+        if self.compactor is not None and self._compaction_task is None:
+            # Les tours à résumer sont fixés maintenant, avant que le tour suivant ne commence
+            plan = self._compaction_plan()
+            if plan is not None:
+                self._compaction_task = asyncio.create_task(self._compact_in_background(*plan))
 
-    def add_user_message(self, content: str) -> UserMessageStep:
+    def _compaction_plan(self, force: bool = False) -> Optional[tuple]:
+        """
+        Détermine les étapes à résumer : celles qui suivent le dernier résumé, hors `keep_recent_turns` derniers tours.
+
+        Returns:
+            Optional[tuple]: (résumé précédent, étapes à résumer, position de la première étape conservée),
+                None s'il n'y a rien à compacter.
+        """
+        start, previous = 0, None
+        for index in range(len(self.steps) - 1, -1, -1):
+            if self.steps[index].step_type == "conversation_summary":
+                start, previous = index + 1, self.steps[index]
+                break
+        turn_indexes = [index for index in range(start, len(self.steps)) if self.steps[index].step_type == "user_message"]
+        keep = self.compactor.keep_recent_turns
+        if len(turn_indexes) <= keep:
+            return None
+        if not force and not self.compactor.should_compact(self.steps, len(turn_indexes)):
+            return None
+        cut = turn_indexes[-keep]
+        return previous, self.steps[start:cut], self.turn_starts[-keep]
+
+    async def compact(self, force: bool = False) -> Optional[ConversationSummaryStep]:
+        """
+        Résume les tours les plus anciens si le contexte dépasse le seuil du compacteur (ou sans condition avec `force`).
+
+        Args:
+            force (bool): Compacter même sous le seuil de tokens.
+
+        Returns:
+            Optional[ConversationSummaryStep]: Le nouveau résumé, None si rien n'a été compacté.
+        """
+        if self.compactor is None:
+            raise ValueError("No compactor configured for this memory.")
+        plan = self._compaction_plan(force)
+        if plan is None:
+            return None
+        return await self._compact(*plan)
+
+    async def _compact_in_background(self, previous: Optional[ConversationSummaryStep], covered: List[TaskStep], until: int):
+        """
+        Compaction lancée par `end_turn`, hors du chemin de réponse : les erreurs sont journalisées.
+        """
+        try:
+            await self._compact(previous, covered, until)
+        except Exception as e:
+            self.logger.error(f"Failed to compact memory '{self.memory_id}': {e}")
+        finally:
+            self._compaction_task = None
+
+    async def _compact(
+        self, previous: Optional[ConversationSummaryStep], covered: List[TaskStep], until: int
+    ) -> Optional[ConversationSummaryStep]:
+        """
+        Résume `covered` avec le résumé précédent, puis remplace ces étapes par le résumé et le persiste.
+        """
+        content = await self.compactor.summarize(previous.content if previous else None, covered)
+        # Mémoire rechargée ou effacée pendant le résumé : les étapes ne sont plus dans `steps`
+        start = self._index_of(previous if previous is not None else covered[0])
+        end = self._index_of(covered[-1])
+        if not content or start is None or end is None:
+            return None
+
+        previous_metadata = previous.metadata if previous is not None else {}
+        summary = ConversationSummaryStep(
+            request_id=covered[-1].request_id,
+            content=content,
+            compacted_until=until,
+            metadata={
+                "compacted_turns": previous_metadata.get("compacted_turns", 0) + sum(step.step_type == "user_message" for step in covered),
+                "compacted_steps": previous_metadata.get("compacted_steps", 0) + len(covered),
+            },
+        )
+        self.steps[start:end + 1] = [summary]
+        self._track(summary)
+        self.first_position = max(self.first_position, until)  # Les étapes résumées ne sont plus paginées
+        await self._persist(summary)
+        if self.durability != "strict":
+            await self.flush()
+        self.logger.info(f"Compacted {len(covered)} steps of memory '{self.memory_id}' into a summary.")
+        return summary
+
+    def _index_of(self, step: TaskStep) -> Optional[int]:
+        """Position d'une étape dans `steps` (par identité), None si elle n'y est plus."""
+        return next((index for index, candidate in enumerate(self.steps) if candidate is step), None)
+
+    async def _cancel_compaction(self):
+        """Annule la compaction en cours, le cas échéant."""
+        task, self._compaction_task = self._compaction_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def add_step(self, step: TaskStep):
+        """
+        Ajoute une étape à la mémoire et la persiste (alias asynchrone de `save_step`).
+
+        Args:
+            step (TaskStep): L'étape à ajouter.
+        """
+        await self.save_step(step)
+
+    async def add_user_message(self, content: str) -> UserMessageStep:
         """
         Ajoute un message utilisateur sous forme de `UserMessageStep`.
 
         Args:
             content (str): Contenu du message utilisateur.
         """
-        self.current_request_id = f"req_{len(self.steps) + 1}"  # Génération d'un ID de requête
+        self.current_request_id = f"req_{self.stored_count + 1}"  # Génération d'un ID de requête, unique même sur une fenêtre
         step = UserMessageStep(request_id=self.current_request_id, content=content)
-        self.save_step(step)
+        await self.save_step(step)
         return step
 
-    def add_assistant_message(self, content: str) -> AssistantMessageStep:
+    async def add_assistant_message(self, content: str) -> AssistantMessageStep:
         """
         Ajoute un message assistant sous forme de `AssistantMessageStep`.
 
@@ -69,10 +467,10 @@ class RegimeMemory(BaseMemory):
             raise ValueError("Aucune requête utilisateur en cours. Ajoutez d'abord un message utilisateur.")
         
         step = AssistantMessageStep(request_id=self.current_request_id, content=content)
-        self.save_step(step)
+        await self.save_step(step)
         return step
 
-    def select_generals(self, selected_generals: List[str]) -> GeneralSelectionStep:
+    async def select_generals(self, selected_generals: List[str]) -> GeneralSelectionStep:
         """
         Ajoute une étape de sélection des généraux.
 
@@ -83,10 +481,10 @@ class RegimeMemory(BaseMemory):
             raise ValueError("Aucune requête utilisateur en cours. Ajoutez d'abord un message utilisateur.")
         
         step = GeneralSelectionStep(request_id=self.current_request_id, selected_generals=selected_generals)
-        self.save_step(step)
+        await self.save_step(step)
         return step
 
-    def coup_detat(self, new_dictator: str, previous_dictator: Optional[str] = None):
+    async def coup_detat(self, new_dictator: str, previous_dictator: Optional[str] = None):
         """
         Ajoute une étape de coup d'état.
 
@@ -98,9 +496,9 @@ class RegimeMemory(BaseMemory):
             raise ValueError("Aucune requête utilisateur en cours. Ajoutez d'abord un message utilisateur.")
         
         step = CoupDEtatStep(request_id=self.current_request_id, new_dictator=new_dictator, previous_dictator=previous_dictator)
-        self.save_step(step)
+        await self.save_step(step)
 
-    def add_action_step(self, general: str, action: str, result: Optional[str] = None):
+    async def add_action_step(self, general: str, action: str, result: Optional[str] = None):
         """
         Ajoute une étape d'action exécutée par un général.
 
@@ -113,7 +511,7 @@ class RegimeMemory(BaseMemory):
             raise ValueError("Aucune requête utilisateur en cours. Ajoutez d'abord un message utilisateur.")
         
         step = ActionStep(request_id=self.current_request_id, general=general, action=action, result=result)
-        self.save_step(step)
+        await self.save_step(step)
 
     def get_steps_for_request(self, request_id: str) -> List[TaskStep]:
         """
@@ -127,9 +525,91 @@ class RegimeMemory(BaseMemory):
         """
         return [step for step in self.steps if step.request_id == request_id]
 
-    def clear_memory(self):
+    async def load_steps_for_request(self, request_id: str) -> List[TaskStep]:
+        """
+        Interroge le store pour les étapes d'une requête, y compris hors de la fenêtre chargée.
+
+        Args:
+            request_id (str): Identifiant de la requête utilisateur.
+
+        Returns:
+            List[TaskStep]: Liste des étapes associées à la requête.
+        """
+        await self.flush()
+        return await self.store.load_steps_for_request(self.memory_id, request_id)
+
+    async def load_steps_by_type(
+        self, step_type: str, limit: Optional[int] = None, since: Optional[float] = None
+    ) -> List[TaskStep]:
+        """
+        Interroge le store pour les étapes d'un type, sans charger la discussion.
+
+        Args:
+            step_type (str): Type des étapes (ex. "tool_execution").
+            limit (Optional[int]): Ne retourne que les `limit` plus récentes.
+            since (Optional[float]): Ne retourne que les étapes horodatées à partir de cet instant (epoch).
+
+        Returns:
+            List[TaskStep]: Les étapes du type demandé, dans l'ordre.
+        """
+        await self.flush()
+        return await self.store.load_steps_by_type(self.memory_id, step_type, limit=limit, since=since)
+
+    async def load_latest_selection(self) -> Optional[GeneralSelectionStep]:
+        """
+        Retourne la dernière sélection de généraux de la discussion.
+
+        Returns:
+            Optional[GeneralSelectionStep]: La sélection, None si aucun général n'a encore été choisi.
+        """
+        await self.flush()
+        return await self.store.load_latest_step(self.memory_id, "general_selection")
+
+    async def clear_memory(self):
         """
         Efface toute la mémoire et réinitialise la discussion.
+
+        The blobs of the large tool outputs referenced by the steps (`ToolExecutionStep.output_ref`)
+        are deleted from `DictatorSettings.get_blob_store()` as well.
+        """
+        await self._cancel_compaction()
+        refs = {step.output_ref for step in [*self.steps, *self._pending] if getattr(step, "output_ref", None)}
+        self.steps.clear()
+        self._reset_state()
+        async with self._get_flush_lock():
+            self._pending.clear()
+            stored = await self.store.load_steps_by_type(self.memory_id, "tool_execution")
+            refs.update(step.output_ref for step in stored if getattr(step, "output_ref", None))
+            await self.store.clear_memory(self.memory_id)
+        if refs:
+            await asyncio.to_thread(self._delete_blobs, refs)
+
+    def _delete_blobs(self, refs):
+        """
+        Supprime des blobs du blob store ; un échec est journalisé sans interrompre l'effacement.
+        """
+        blob_store = DictatorSettings.get_blob_store()
+        for ref in refs:
+            try:
+                blob_store.delete(ref)
+            except Exception as e:
+                self.logger.error(f"Failed to delete blob {ref} of memory '{self.memory_id}': {e}")
+
+    async def reset(self):
+        """
+        Réinitialise la mémoire en vidant toutes les étapes (alias asynchrone de `clear_memory`).
+        """
+        await self.clear_memory()
+
+    async def close(self):
+        """
+        Écrit les étapes en attente puis ferme le store de persistance.
         """
-        self.steps = []
-        self.store.clear_memory(self.memory_id)
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        await self._cancel_compaction()
+        try:
+            await self.flush()
+        finally:
+            await self.store.close()
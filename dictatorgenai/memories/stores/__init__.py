@@ -2,9 +2,20 @@
 from .memory_store import MemoryStore
 from .sqlite_store import SQLiteStore
 from .redis_store import RedisStore
+from .async_memory_store import AsyncMemoryStore, SyncStoreAdapter
+from .async_sqlite_store import AsyncSQLiteStore
+from .async_redis_store import AsyncRedisStore
+from .blob_store import BlobStore, InMemoryBlobStore, FileBlobStore
 
 __all__ = [
     "MemoryStore",
     "SQLiteStore",
     "RedisStore",
-]
\ No newline at end of file
+    "AsyncMemoryStore",
+    "SyncStoreAdapter",
+    "AsyncSQLiteStore",
+    "AsyncRedisStore",
+    "BlobStore",
+    "InMemoryBlobStore",
+    "FileBlobStore",
+]
@@ -0,0 +1,243 @@
+# dictatorgenai/memories/stores/async_memory_store.py
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from ...steps.base_step import TaskStep
+from .memory_store import MemoryStore
+
+
+class AsyncMemoryStore(ABC):
+    """
+    Interface asynchrone des systèmes de stockage des mémoires.
+
+    Same operations as `MemoryStore`, awaited by `RegimeMemory` so that persistence never blocks
+    the event loop: a slow fsync or network round-trip only delays the session that waits for it.
+    """
+
+    @abstractmethod
+    async def save_step(self, memory_id: str, step: TaskStep):
+        """
+        Sauvegarde une étape spécifique dans la mémoire persistante.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            step (TaskStep): Étape à sauvegarder.
+        """
+        pass
+
+    async def save_steps(self, memory_id: str, steps: Sequence[TaskStep]):
+        """
+        Sauvegarde plusieurs étapes, dans l'ordre. Les stores la redéfinissent pour écrire le lot
+        en une seule fois (une transaction, un aller-retour réseau).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            steps (Sequence[TaskStep]): Étapes à sauvegarder.
+        """
+        for step in steps:
+            await self.save_step(memory_id, step)
+
+    @abstractmethod
+    async def load_steps(self, memory_id: str) -> List[TaskStep]:
+        """
+        Charge toutes les étapes associées à une mémoire donnée.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            List[TaskStep]: Liste des étapes stockées.
+        """
+        pass
+
+    async def count_steps(self, memory_id: str) -> int:
+        """
+        Compte les étapes stockées d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            int: Nombre d'étapes stockées.
+        """
+        return len(await self.load_steps(memory_id))
+
+    async def load_steps_range(self, memory_id: str, start: int, end: Optional[int] = None) -> List[TaskStep]:
+        """
+        Charge les étapes d'une mémoire par position, dans l'ordre d'insertion (voir `MemoryStore.load_steps_range`).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            start (int): Position de la première étape (0 pour la plus ancienne).
+            end (Optional[int]): Position suivant la dernière étape, None jusqu'à la fin.
+
+        Returns:
+            List[TaskStep]: Les étapes `[start, end)`.
+        """
+        return (await self.load_steps(memory_id))[start:end]
+
+    async def load_steps_for_request(self, memory_id: str, request_id: str) -> List[TaskStep]:
+        """
+        Charge les étapes d'une requête, dans l'ordre d'insertion (voir `MemoryStore.load_steps_for_request`).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            request_id (str): Identifiant de la requête utilisateur.
+
+        Returns:
+            List[TaskStep]: Les étapes de la requête.
+        """
+        return [step for step in await self.load_steps(memory_id) if step.request_id == request_id]
+
+    async def load_steps_by_type(
+        self,
+        memory_id: str,
+        step_type: str,
+        limit: Optional[int] = None,
+        since: Optional[float] = None,
+    ) -> List[TaskStep]:
+        """
+        Charge les étapes d'un type, dans l'ordre d'insertion (voir `MemoryStore.load_steps_by_type`).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            step_type (str): Type des étapes (ex. "general_selection").
+            limit (Optional[int]): Ne charge que les `limit` plus récentes.
+            since (Optional[float]): Ne charge que les étapes horodatées à partir de cet instant (epoch).
+
+        Returns:
+            List[TaskStep]: Les étapes du type demandé.
+        """
+        steps = [
+            step for step in await self.load_steps(memory_id)
+            if step.step_type == step_type and (since is None or step.timestamp >= since)
+        ]
+        return steps[-limit:] if limit else steps
+
+    async def load_latest_step(self, memory_id: str, step_type: str) -> Optional[TaskStep]:
+        """
+        Charge l'étape la plus récente d'un type (ex. la dernière sélection de généraux).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            step_type (str): Type de l'étape.
+
+        Returns:
+            Optional[TaskStep]: L'étape, None s'il n'y en a pas.
+        """
+        steps = await self.load_steps_by_type(memory_id, step_type, limit=1)
+        return steps[0] if steps else None
+
+    async def save_snapshot(self, memory_id: str, snapshot: Dict[str, Any]):
+        """
+        Remplace l'instantané d'une mémoire. Ne fait rien par défaut.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            snapshot (Dict[str, Any]): Instantané sérialisable en JSON.
+        """
+        pass
+
+    async def load_snapshot(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le dernier instantané enregistré, None s'il n'y en a pas.
+        """
+        return None
+
+    @abstractmethod
+    async def clear_memory(self, memory_id: str):
+        """
+        Supprime toutes les étapes associées à une mémoire, et son instantané.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+        """
+        pass
+
+    async def close(self):
+        """
+        Libère les ressources du store (connexions). Ne fait rien par défaut.
+        """
+        pass
+
+
+class SyncStoreAdapter(AsyncMemoryStore):
+    """
+    Expose un `MemoryStore` synchrone derrière l'interface `AsyncMemoryStore`.
+
+    Every call runs on a dedicated thread, one at a time: the event loop is never blocked, and
+    the operations reach the store in the order they were awaited (a step saved then loaded is
+    always found).
+    """
+
+    def __init__(self, store: MemoryStore, thread_name: str = "memory-store"):
+        """
+        Args:
+            store (MemoryStore): Le store synchrone à adapter.
+            thread_name (str): Préfixe du nom du thread d'écriture.
+        """
+        self.store = store
+        self._thread_name = thread_name
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        """Exécute un appel du store sur son thread dédié."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self._thread_name)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def save_step(self, memory_id: str, step: TaskStep):
+        await self._run(self.store.save_step, memory_id, step)
+
+    async def save_steps(self, memory_id: str, steps: Sequence[TaskStep]):
+        if steps:
+            await self._run(self.store.save_steps, memory_id, list(steps))
+
+    async def load_steps(self, memory_id: str) -> List[TaskStep]:
+        return await self._run(self.store.load_steps, memory_id)
+
+    async def count_steps(self, memory_id: str) -> int:
+        return await self._run(self.store.count_steps, memory_id)
+
+    async def load_steps_range(self, memory_id: str, start: int, end: Optional[int] = None) -> List[TaskStep]:
+        return await self._run(self.store.load_steps_range, memory_id, start, end)
+
+    async def load_steps_for_request(self, memory_id: str, request_id: str) -> List[TaskStep]:
+        return await self._run(self.store.load_steps_for_request, memory_id, request_id)
+
+    async def load_steps_by_type(
+        self,
+        memory_id: str,
+        step_type: str,
+        limit: Optional[int] = None,
+        since: Optional[float] = None,
+    ) -> List[TaskStep]:
+        return await self._run(self.store.load_steps_by_type, memory_id, step_type, limit, since)
+
+    async def load_latest_step(self, memory_id: str, step_type: str) -> Optional[TaskStep]:
+        return await self._run(self.store.load_latest_step, memory_id, step_type)
+
+    async def save_snapshot(self, memory_id: str, snapshot: Dict[str, Any]):
+        await self._run(self.store.save_snapshot, memory_id, snapshot)
+
+    async def load_snapshot(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self.store.load_snapshot, memory_id)
+
+    async def clear_memory(self, memory_id: str):
+        await self._run(self.store.clear_memory, memory_id)
+
+    async def close(self):
+        """
+        Ferme le store, après les opérations en cours, puis arrête le thread dédié.
+        """
+        await self._run(self.store.close)
+        executor, self._executor = self._executor, None
+        executor.shutdown(wait=False)
@@ -0,0 +1,131 @@
+# dictatorgenai/memories/stores/async_redis_store.py
+import json
+from typing import Any, Dict, List, Optional, Sequence
+import redis.asyncio as aioredis
+from ...steps.base_step import TaskStep
+from ...steps.step_codec import StepCodec, default_step_codec
+from .async_memory_store import AsyncMemoryStore
+
+
+class AsyncRedisStore(AsyncMemoryStore):
+    """
+    Implémente AsyncMemoryStore avec le client asyncio de Redis.
+    """
+
+    def __init__(self, redis_host: str = "localhost", redis_port: int = 6379, db: int = 0, codec: Optional[StepCodec] = None):
+        """
+        Initialise le pool de connexions Redis (les connexions sont ouvertes au premier appel).
+
+        Args:
+            redis_host (str): Adresse du serveur Redis.
+            redis_port (int): Port du serveur Redis.
+            db (int): Numéro de la base Redis.
+            codec (Optional[StepCodec]): Encodage des étapes, `default_step_codec` par défaut.
+        """
+        self.redis_conn = aioredis.Redis(host=redis_host, port=redis_port, db=db)
+        self.codec = codec or default_step_codec
+
+    async def save_step(self, memory_id: str, step: TaskStep):
+        """
+        Sauvegarde une étape encodée dans Redis.
+
+        Args:
+            memory_id (str): Identifiant unique de la mémoire.
+            step (TaskStep): Étape à sauvegarder.
+        """
+        await self.redis_conn.rpush(memory_id, self.codec.encode(step))
+
+    async def save_steps(self, memory_id: str, steps: Sequence[TaskStep]):
+        """
+        Sauvegarde plusieurs étapes en un seul `RPUSH` (un aller-retour, ajout atomique).
+
+        Args:
+            memory_id (str): Identifiant unique de la mémoire.
+            steps (Sequence[TaskStep]): Étapes à sauvegarder, dans l'ordre.
+        """
+        if steps:
+            await self.redis_conn.rpush(memory_id, *[self.codec.encode(step) for step in steps])
+
+    async def load_steps(self, memory_id: str) -> List[TaskStep]:
+        """
+        Charge toutes les étapes d'une mémoire et les reconstruit en `TaskStep`.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            List[TaskStep]: Liste des étapes rechargées.
+        """
+        steps_json = await self.redis_conn.lrange(memory_id, 0, -1)
+        return [self.codec.decode(step) for step in steps_json]
+
+    async def count_steps(self, memory_id: str) -> int:
+        """
+        Compte les étapes stockées d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            int: Nombre d'étapes stockées.
+        """
+        return await self.redis_conn.llen(memory_id)
+
+    async def load_steps_range(self, memory_id: str, start: int, end: Optional[int] = None) -> List[TaskStep]:
+        """
+        Charge les étapes `[start, end)` d'une mémoire, dans l'ordre d'insertion.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            start (int): Position de la première étape (0 pour la plus ancienne).
+            end (Optional[int]): Position suivant la dernière étape, None jusqu'à la fin.
+
+        Returns:
+            List[TaskStep]: Les étapes demandées.
+        """
+        if end is not None and end <= start:
+            return []
+        steps_json = await self.redis_conn.lrange(memory_id, start, -1 if end is None else end - 1)
+        return [self.codec.decode(step) for step in steps_json]
+
+    async def save_snapshot(self, memory_id: str, snapshot: Dict[str, Any]):
+        """
+        Remplace l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            snapshot (Dict[str, Any]): Instantané sérialisable en JSON.
+        """
+        await self.redis_conn.set(self._snapshot_key(memory_id), json.dumps(snapshot))
+
+    async def load_snapshot(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le dernier instantané enregistré, None s'il n'y en a pas.
+        """
+        snapshot = await self.redis_conn.get(self._snapshot_key(memory_id))
+        return json.loads(snapshot) if snapshot else None
+
+    @staticmethod
+    def _snapshot_key(memory_id: str) -> str:
+        return f"{memory_id}:snapshot"
+
+    async def clear_memory(self, memory_id: str):
+        """
+        Supprime toutes les étapes d'une mémoire, et son instantané.
+
+        Args:
+            memory_id (str): Identifiant unique de la mémoire.
+        """
+        await self.redis_conn.delete(memory_id, self._snapshot_key(memory_id))
+
+    async def close(self):
+        """
+        Ferme les connexions Redis.
+        """
+        await self.redis_conn.aclose()
@@ -0,0 +1,35 @@
+# dictatorgenai/memories/stores/async_sqlite_store.py
+from typing import Optional
+from ...steps.step_codec import StepCodec
+from .async_memory_store import SyncStoreAdapter
+from .sqlite_store import SQLiteStore
+
+
+class AsyncSQLiteStore(SyncStoreAdapter):
+    """
+    Implémente AsyncMemoryStore avec SQLite.
+
+    The `sqlite3` module has no asynchronous API: the calls of a `SQLiteStore` are offloaded to a
+    single writer thread that owns the connection, so that commits and fsyncs never block the
+    event loop and the writes keep their order.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "regime_memory.db",
+        synchronous: str = "NORMAL",
+        busy_timeout: float = 5.0,
+        codec: Optional[StepCodec] = None,
+    ):
+        """
+        Args:
+            db_path (str): Chemin du fichier de base de données SQLite.
+            synchronous (str): Mode `PRAGMA synchronous` (voir `SQLiteStore`).
+            busy_timeout (float): Secondes d'attente si un autre processus verrouille la base.
+            codec (Optional[StepCodec]): Encodage des étapes, `default_step_codec` par défaut.
+        """
+        super().__init__(
+            SQLiteStore(db_path=db_path, synchronous=synchronous, busy_timeout=busy_timeout, codec=codec),
+            thread_name="sqlite-writer",
+        )
+        self.db_path = db_path
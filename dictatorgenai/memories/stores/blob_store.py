@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Union
+
+BLOB_REF_PREFIX = "blob:sha256:"
+
+
+class BlobStore(ABC):
+    """
+    Stockage adressé par contenu des données volumineuses (ex. sorties des tools).
+
+    A blob is identified by the SHA-256 digest of its content: storing the same content twice
+    writes it once and returns the same reference.
+    """
+
+    @staticmethod
+    def make_ref(data: bytes) -> str:
+        """
+        Returns the reference of a content, `blob:sha256:<digest>`.
+        """
+        return BLOB_REF_PREFIX + hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def is_ref(value: object) -> bool:
+        """
+        Indicates whether a value is a blob reference.
+        """
+        return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX)
+
+    @staticmethod
+    def _encode(data: Union[str, bytes]) -> bytes:
+        return data.encode("utf-8") if isinstance(data, str) else data
+
+    @abstractmethod
+    def put(self, data: Union[str, bytes]) -> str:
+        """
+        Stores a content, if it is not already stored.
+
+        Args:
+            data (Union[str, bytes]): The content; text is stored as UTF-8.
+
+        Returns:
+            str: The reference of the content.
+        """
+        pass
+
+    async def aput(self, data: Union[str, bytes]) -> str:
+        """
+        Version asynchrone de `put`, exécutée sur un thread pour ne pas bloquer la boucle d'événements.
+        """
+        return await asyncio.to_thread(self.put, data)
+
+    def delete(self, ref: str) -> bool:
+        """
+        Deletes a content. Blobs are shared by identical contents: a deleted reference that is still
+        used elsewhere can no longer be resolved there.
+
+        Returns:
+            bool: True if the content was stored. Stores that cannot delete return False.
+        """
+        return False
+
+    @abstractmethod
+    def get_bytes(self, ref: str) -> Optional[bytes]:
+        """
+        Returns the content of a reference, or None if it is unknown.
+        """
+        pass
+
+    def get(self, ref: str) -> Optional[str]:
+        """
+        Returns the content of a reference as text, or None if it is unknown.
+        """
+        data = self.get_bytes(ref)
+        return data.decode("utf-8") if data is not None else None
+
+    def exists(self, ref: str) -> bool:
+        """
+        Indicates whether a reference is stored.
+        """
+        return self.get_bytes(ref) is not None
+
+
+class InMemoryBlobStore(BlobStore):
+    """
+    Stockage des blobs en mémoire, pour la durée du processus (tests, usages éphémères).
+
+    The store is bounded: beyond `max_bytes`, the least recently used blobs are evicted, and their
+    references can no longer be resolved. Use a `FileBlobStore` for outputs referenced by persisted steps.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        """
+        Initializes the store.
+
+        Args:
+            max_bytes (Optional[int]): Total size of the blobs kept in memory, None for no limit.
+        """
+        self.max_bytes = max_bytes
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: Union[str, bytes]) -> str:
+        data = self._encode(data)
+        ref = self.make_ref(data)
+        with self._lock:
+            if ref in self._blobs:
+                self._blobs.move_to_end(ref)
+                return ref
+            self._blobs[ref] = data
+            self._size += len(data)
+            # Éviction des blobs les moins récemment utilisés (le dernier ajouté est toujours conservé)
+            while self.max_bytes is not None and self._size > self.max_bytes and len(self._blobs) > 1:
+                _, evicted = self._blobs.popitem(last=False)
+                self._size -= len(evicted)
+        return ref
+
+    def get_bytes(self, ref: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._blobs.get(ref)
+            if data is not None:
+                self._blobs.move_to_end(ref)
+        return data
+
+    async def aput(self, data: Union[str, bytes]) -> str:
+        return self.put(data)  # Pas d'entrée/sortie : inutile de passer par un thread
+
+    def delete(self, ref: str) -> bool:
+        with self._lock:
+            data = self._blobs.pop(ref, None)
+            if data is None:
+                return False
+            self._size -= len(data)
+        return True
+
+    def exists(self, ref: str) -> bool:
+        return ref in self._blobs
+
+
+class FileBlobStore(BlobStore):
+    """
+    Stockage des blobs sur disque, un fichier par contenu (`<directory>/<2 premiers caractères>/<digest>`).
+
+    Files are written atomically and never modified, so the store can be shared by several processes.
+    """
+
+    def __init__(self, directory: str = "blobs"):
+        """
+        Initializes the store.
+
+        Args:
+            directory (str): The directory of the blobs, created if needed.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ref: str) -> str:
+        if not self.is_ref(ref):
+            raise ValueError(f"Invalid blob reference: {ref}")
+        digest = ref[len(BLOB_REF_PREFIX):]
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data: Union[str, bytes]) -> str:
+        data = self._encode(data)
+        ref = self.make_ref(data)
+        path = self._path(ref)
+        if os.path.exists(path):
+            return ref
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return ref
+
+    def get_bytes(self, ref: str) -> Optional[bytes]:
+        try:
+            with open(self._path(ref), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, ref: str) -> bool:
+        try:
+            os.remove(self._path(ref))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def exists(self, ref: str) -> bool:
+        return os.path.exists(self._path(ref))
@@ -1,6 +1,6 @@
 # mon_framework/memory_store/base_store.py
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
 from ...steps.base_step import TaskStep
 
 class MemoryStore(ABC):
@@ -19,6 +19,18 @@ class MemoryStore(ABC):
         """
         pass
 
+    def save_steps(self, memory_id: str, steps: Sequence[TaskStep]):
+        """
+        Sauvegarde plusieurs étapes, dans l'ordre. Les stores la redéfinissent pour écrire le lot
+        en une seule fois (une transaction, un aller-retour réseau).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            steps (Sequence[TaskStep]): Étapes à sauvegarder.
+        """
+        for step in steps:
+            self.save_step(memory_id, step)
+
     @abstractmethod
     def load_steps(self, memory_id: str) -> List[TaskStep]:
         """
@@ -32,12 +44,121 @@ class MemoryStore(ABC):
         """
         pass
 
+    def count_steps(self, memory_id: str) -> int:
+        """
+        Compte les étapes stockées d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            int: Nombre d'étapes stockées.
+        """
+        return len(self.load_steps(memory_id))
+
+    def load_steps_range(self, memory_id: str, start: int, end: Optional[int] = None) -> List[TaskStep]:
+        """
+        Charge les étapes d'une mémoire par position, dans l'ordre d'insertion. Les stores la
+        redéfinissent pour ne lire que les étapes demandées.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            start (int): Position de la première étape (0 pour la plus ancienne).
+            end (Optional[int]): Position suivant la dernière étape, None jusqu'à la fin.
+
+        Returns:
+            List[TaskStep]: Les étapes `[start, end)`.
+        """
+        return self.load_steps(memory_id)[start:end]
+
+    def load_steps_for_request(self, memory_id: str, request_id: str) -> List[TaskStep]:
+        """
+        Charge les étapes d'une requête, dans l'ordre d'insertion. Les stores indexés la redéfinissent
+        pour ne lire que ces étapes.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            request_id (str): Identifiant de la requête utilisateur.
+
+        Returns:
+            List[TaskStep]: Les étapes de la requête.
+        """
+        return [step for step in self.load_steps(memory_id) if step.request_id == request_id]
+
+    def load_steps_by_type(
+        self,
+        memory_id: str,
+        step_type: str,
+        limit: Optional[int] = None,
+        since: Optional[float] = None,
+    ) -> List[TaskStep]:
+        """
+        Charge les étapes d'un type, dans l'ordre d'insertion.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            step_type (str): Type des étapes (ex. "general_selection").
+            limit (Optional[int]): Ne charge que les `limit` plus récentes.
+            since (Optional[float]): Ne charge que les étapes horodatées à partir de cet instant (epoch).
+
+        Returns:
+            List[TaskStep]: Les étapes du type demandé.
+        """
+        steps = [
+            step for step in self.load_steps(memory_id)
+            if step.step_type == step_type and (since is None or step.timestamp >= since)
+        ]
+        return steps[-limit:] if limit else steps
+
+    def load_latest_step(self, memory_id: str, step_type: str) -> Optional[TaskStep]:
+        """
+        Charge l'étape la plus récente d'un type (ex. la dernière sélection de généraux).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            step_type (str): Type de l'étape.
+
+        Returns:
+            Optional[TaskStep]: L'étape, None s'il n'y en a pas.
+        """
+        steps = self.load_steps_by_type(memory_id, step_type, limit=1)
+        return steps[0] if steps else None
+
+    def save_snapshot(self, memory_id: str, snapshot: Dict[str, Any]):
+        """
+        Remplace l'instantané d'une mémoire (état résumé permettant un chargement partiel).
+        Ne fait rien par défaut : la mémoire est alors rechargée entièrement.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            snapshot (Dict[str, Any]): Instantané sérialisable en JSON.
+        """
+        pass
+
+    def load_snapshot(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le dernier instantané enregistré, None s'il n'y en a pas.
+        """
+        return None
+
     @abstractmethod
     def clear_memory(self, memory_id: str):
         """
-        Supprime toutes les étapes associées à une mémoire.
+        Supprime toutes les étapes associées à une mémoire, et son instantané.
 
         Args:
             memory_id (str): Identifiant de la mémoire.
         """
         pass
+
+    def close(self):
+        """
+        Libère les ressources du store (connexions). Ne fait rien par défaut.
+        """
+        pass
@@ -1,8 +1,9 @@
 # mon_framework/memory_store/redis_store.py
 import redis
 import json
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
 from ...steps.base_step import TaskStep
+from ...steps.step_codec import StepCodec, default_step_codec
 from .memory_store import MemoryStore
 
 class RedisStore(MemoryStore):
@@ -10,7 +11,7 @@ class RedisStore(MemoryStore):
     Implémente MemoryStore avec Redis comme backend.
     """
 
-    def __init__(self, redis_host: str = "localhost", redis_port: int = 6379, db: int = 0):
+    def __init__(self, redis_host: str = "localhost", redis_port: int = 6379, db: int = 0, codec: Optional[StepCodec] = None):
         """
         Initialise la connexion Redis.
 
@@ -18,23 +19,35 @@ class RedisStore(MemoryStore):
             redis_host (str): Adresse du serveur Redis.
             redis_port (int): Port du serveur Redis.
             db (int): Numéro de la base Redis.
+            codec (Optional[StepCodec]): Encodage des étapes, `default_step_codec` par défaut.
         """
-        self.redis_conn = redis.Redis(host=redis_host, port=redis_port, db=db, decode_responses=True)
+        self.redis_conn = redis.Redis(host=redis_host, port=redis_port, db=db)
+        self.codec = codec or default_step_codec
 
     def save_step(self, memory_id: str, step: TaskStep):
         """
-        Sauvegarde une étape en JSON dans Redis.
+        Sauvegarde une étape encodée dans Redis.
 
         Args:
             memory_id (str): Identifiant unique de la mémoire.
             step (TaskStep): Étape à sauvegarder.
         """
-        step_data = json.dumps(step.to_dict())
-        self.redis_conn.rpush(memory_id, step_data)
+        self.redis_conn.rpush(memory_id, self.codec.encode(step))
+
+    def save_steps(self, memory_id: str, steps: Sequence[TaskStep]):
+        """
+        Sauvegarde plusieurs étapes en un seul `RPUSH` (un aller-retour, ajout atomique).
+
+        Args:
+            memory_id (str): Identifiant unique de la mémoire.
+            steps (Sequence[TaskStep]): Étapes à sauvegarder, dans l'ordre.
+        """
+        if steps:
+            self.redis_conn.rpush(memory_id, *[self.codec.encode(step) for step in steps])
 
     def load_steps(self, memory_id: str) -> List[TaskStep]:
         """
-        Charge toutes les étapes d'une mémoire en JSON et les reconstruit en `TaskStep`.
+        Charge toutes les étapes d'une mémoire et les reconstruit en `TaskStep`.
 
         Args:
             memory_id (str): Identifiant de la mémoire.
@@ -43,13 +56,75 @@ class RedisStore(MemoryStore):
             List[TaskStep]: Liste des étapes rechargées.
         """
         steps_json = self.redis_conn.lrange(memory_id, 0, -1)
-        return [TaskStep.from_dict(json.loads(step)) for step in steps_json]
+        return [self.codec.decode(step) for step in steps_json]
+
+    def count_steps(self, memory_id: str) -> int:
+        """
+        Compte les étapes stockées d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            int: Nombre d'étapes stockées.
+        """
+        return self.redis_conn.llen(memory_id)
+
+    def load_steps_range(self, memory_id: str, start: int, end: Optional[int] = None) -> List[TaskStep]:
+        """
+        Charge les étapes `[start, end)` d'une mémoire, dans l'ordre d'insertion.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            start (int): Position de la première étape (0 pour la plus ancienne).
+            end (Optional[int]): Position suivant la dernière étape, None jusqu'à la fin.
+
+        Returns:
+            List[TaskStep]: Les étapes demandées.
+        """
+        if end is not None and end <= start:
+            return []
+        steps_json = self.redis_conn.lrange(memory_id, start, -1 if end is None else end - 1)
+        return [self.codec.decode(step) for step in steps_json]
+
+    def save_snapshot(self, memory_id: str, snapshot: Dict[str, Any]):
+        """
+        Remplace l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            snapshot (Dict[str, Any]): Instantané sérialisable en JSON.
+        """
+        self.redis_conn.set(self._snapshot_key(memory_id), json.dumps(snapshot))
+
+    def load_snapshot(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le dernier instantané enregistré, None s'il n'y en a pas.
+        """
+        snapshot = self.redis_conn.get(self._snapshot_key(memory_id))
+        return json.loads(snapshot) if snapshot else None
+
+    @staticmethod
+    def _snapshot_key(memory_id: str) -> str:
+        return f"{memory_id}:snapshot"
 
     def clear_memory(self, memory_id: str):
         """
-        Supprime toutes les étapes d'une mémoire.
+        Supprime toutes les étapes d'une mémoire, et son instantané.
 
         Args:
             memory_id (str): Identifiant unique de la mémoire.
         """
-        self.redis_conn.delete(memory_id)
+        self.redis_conn.delete(memory_id, self._snapshot_key(memory_id))
+
+    def close(self):
+        """
+        Ferme les connexions Redis.
+        """
+        self.redis_conn.close()
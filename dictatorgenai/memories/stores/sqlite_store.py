@@ -1,55 +1,152 @@
 # mon_framework/memory_store/sqlite_store.py
 import sqlite3
 import json
-from typing import List
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
 from ...steps.base_step import TaskStep
+from ...steps.step_codec import StepCodec, default_step_codec
 from .memory_store import MemoryStore
 
+# Modes de synchronisation acceptés par PRAGMA synchronous
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Version du schéma, enregistrée dans PRAGMA user_version
+SCHEMA_VERSION = 1
+
+
 class SQLiteStore(MemoryStore):
     """
     Implémente MemoryStore avec SQLite pour la persistance des étapes.
+
+    A single long-lived connection is shared by all the calls and guarded by a lock, so the store
+    can be used from several threads. File databases run in WAL mode: readers do not block the
+    writer, and with `synchronous="NORMAL"` a commit no longer waits for an fsync (the database
+    stays consistent, the last commits may be lost on a power failure).
+
+    Steps are stored in the compact binary form of `StepCodec`; rows written as JSON by previous
+    versions are still read. The type, request id and timestamp of each step are also stored in
+    indexed columns, so that the steps of a request or of a type are queried without loading the
+    discussion. The schema is migrated on opening (see `SCHEMA_VERSION`).
     """
 
-    def __init__(self, db_path: str = "regime_memory.db"):
+    def __init__(
+        self,
+        db_path: str = "regime_memory.db",
+        synchronous: str = "NORMAL",
+        busy_timeout: float = 5.0,
+        codec: Optional[StepCodec] = None,
+    ):
         """
         Initialise la base de données SQLite et crée les tables si elles n'existent pas.
 
         Args:
             db_path (str): Chemin du fichier de base de données SQLite.
+            synchronous (str): Mode `PRAGMA synchronous` : "OFF", "NORMAL" (défaut) ou "FULL"/"EXTRA"
+                pour une durabilité stricte.
+            busy_timeout (float): Secondes d'attente si un autre processus verrouille la base.
+            codec (Optional[StepCodec]): Encodage des étapes, `default_step_codec` par défaut.
         """
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid synchronous mode '{synchronous}'. Must be one of: {SYNCHRONOUS_MODES}")
         self.db_path = db_path
+        self.synchronous = synchronous
+        self.codec = codec or default_step_codec
+        self._lock = threading.Lock()
+        # Autocommit : les transactions sont ouvertes explicitement par `_transaction`
+        self._conn = sqlite3.connect(db_path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
         self._initialize_db()
 
     def _initialize_db(self):
-        """Crée la table pour stocker les `TaskStep` si elle n'existe pas."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        """Configure la connexion, crée les tables si elles n'existent pas et migre le schéma."""
+        with self._lock:
+            if self.db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        with self._transaction():
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS memory_steps (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     memory_id TEXT NOT NULL,
                     step_data TEXT NOT NULL
                 )
             """)
-            conn.commit()
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS memory_snapshots (
+                    memory_id TEXT PRIMARY KEY,
+                    snapshot TEXT NOT NULL
+                )
+            """)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_to_v1()
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            # Chargement d'une mémoire sans parcourir toute la table, dans l'ordre d'insertion
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_steps_memory_id ON memory_steps (memory_id, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_steps_request ON memory_steps (memory_id, request_id, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_steps_type ON memory_steps (memory_id, step_type, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_steps_timestamp ON memory_steps (timestamp)")
+
+    def _migrate_to_v1(self):
+        """
+        Version 1 : `step_type`, `request_id` et `timestamp` deviennent des colonnes, renseignées
+        pour les étapes existantes.
+        """
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(memory_steps)")}
+        for column, column_type in (("step_type", "TEXT"), ("request_id", "TEXT"), ("timestamp", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE memory_steps ADD COLUMN {column} {column_type}")
+
+        rows = self._conn.execute("SELECT id, step_data FROM memory_steps WHERE step_type IS NULL").fetchall()
+        updates = []
+        for row_id, step_data in rows:
+            step = self.codec.decode(step_data)
+            updates.append((step.step_type, step.request_id, step.timestamp, row_id))
+        self._conn.executemany("UPDATE memory_steps SET step_type = ?, request_id = ?, timestamp = ? WHERE id = ?", updates)
+
+    @contextmanager
+    def _transaction(self):
+        """Exécute un bloc sous le verrou, dans une transaction validée en un seul commit."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
 
     def save_step(self, memory_id: str, step: TaskStep):
         """
-        Sauvegarde une étape en JSON dans SQLite.
+        Sauvegarde une étape encodée dans SQLite.
 
         Args:
             memory_id (str): Identifiant unique de la mémoire.
             step (TaskStep): Étape à sauvegarder.
         """
-        step_data = json.dumps(step.to_dict())  # Convertit l'objet `TaskStep` en JSON
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO memory_steps (memory_id, step_data) VALUES (?, ?)", (memory_id, step_data))
-            conn.commit()
+        self.save_steps(memory_id, [step])
+
+    def save_steps(self, memory_id: str, steps: Sequence[TaskStep]):
+        """
+        Sauvegarde plusieurs étapes dans une seule transaction (un seul commit pour tout le lot).
+
+        Args:
+            memory_id (str): Identifiant unique de la mémoire.
+            steps (Sequence[TaskStep]): Étapes à sauvegarder, dans l'ordre.
+        """
+        if not steps:
+            return
+        # Sérialisation hors du verrou
+        rows = [(memory_id, self.codec.encode(step), step.step_type, step.request_id, step.timestamp) for step in steps]
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT INTO memory_steps (memory_id, step_data, step_type, request_id, timestamp) VALUES (?, ?, ?, ?, ?)", rows
+            )
 
     def load_steps(self, memory_id: str) -> List[TaskStep]:
         """
-        Charge toutes les étapes d'une mémoire en JSON et les reconstruit en `TaskStep`.
+        Charge toutes les étapes d'une mémoire et les reconstruit en `TaskStep`.
 
         Args:
             memory_id (str): Identifiant de la mémoire.
@@ -57,21 +154,137 @@ class SQLiteStore(MemoryStore):
         Returns:
             List[TaskStep]: Liste des étapes rechargées.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT step_data FROM memory_steps WHERE memory_id = ?", (memory_id,))
-            steps_json = cursor.fetchall()
+        with self._lock:
+            steps_json = self._conn.execute(
+                "SELECT step_data FROM memory_steps WHERE memory_id = ? ORDER BY id", (memory_id,)
+            ).fetchall()
+
+        return [self.codec.decode(step[0]) for step in steps_json if step[0]]
+
+    def count_steps(self, memory_id: str) -> int:
+        """
+        Compte les étapes stockées d'une mémoire (à partir de l'index, sans lire les données).
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            int: Nombre d'étapes stockées.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memory_steps WHERE memory_id = ?", (memory_id,)).fetchone()[0]
+
+    def load_steps_range(self, memory_id: str, start: int, end: Optional[int] = None) -> List[TaskStep]:
+        """
+        Charge les étapes `[start, end)` d'une mémoire, dans l'ordre d'insertion.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            start (int): Position de la première étape (0 pour la plus ancienne).
+            end (Optional[int]): Position suivant la dernière étape, None jusqu'à la fin.
+
+        Returns:
+            List[TaskStep]: Les étapes demandées.
+        """
+        limit = -1 if end is None else max(end - start, 0)
+        with self._lock:
+            steps_json = self._conn.execute(
+                "SELECT step_data FROM memory_steps WHERE memory_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                (memory_id, limit, start),
+            ).fetchall()
+
+        return [self.codec.decode(step[0]) for step in steps_json if step[0]]
+
+    def load_steps_for_request(self, memory_id: str, request_id: str) -> List[TaskStep]:
+        """
+        Charge les étapes d'une requête, dans l'ordre d'insertion.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            request_id (str): Identifiant de la requête utilisateur.
+
+        Returns:
+            List[TaskStep]: Les étapes de la requête.
+        """
+        with self._lock:
+            steps_data = self._conn.execute(
+                "SELECT step_data FROM memory_steps WHERE memory_id = ? AND request_id = ? ORDER BY id",
+                (memory_id, request_id),
+            ).fetchall()
+        return [self.codec.decode(step[0]) for step in steps_data]
+
+    def load_steps_by_type(
+        self,
+        memory_id: str,
+        step_type: str,
+        limit: Optional[int] = None,
+        since: Optional[float] = None,
+    ) -> List[TaskStep]:
+        """
+        Charge les étapes d'un type, dans l'ordre d'insertion.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            step_type (str): Type des étapes (ex. "general_selection").
+            limit (Optional[int]): Ne charge que les `limit` plus récentes.
+            since (Optional[float]): Ne charge que les étapes horodatées à partir de cet instant (epoch).
+
+        Returns:
+            List[TaskStep]: Les étapes du type demandé.
+        """
+        query = "SELECT step_data FROM memory_steps WHERE memory_id = ? AND step_type = ?"
+        params: List[Any] = [memory_id, step_type]
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        with self._lock:
+            steps_data = self._conn.execute(query, params).fetchall()
+        return [self.codec.decode(step[0]) for step in reversed(steps_data)]
 
-        return [TaskStep.from_dict(json.loads(step[0])) for step in steps_json if step[0]] if steps_json else []
+    def save_snapshot(self, memory_id: str, snapshot: Dict[str, Any]):
+        """
+        Remplace l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+            snapshot (Dict[str, Any]): Instantané sérialisable en JSON.
+        """
+        snapshot_data = json.dumps(snapshot)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO memory_snapshots (memory_id, snapshot) VALUES (?, ?)", (memory_id, snapshot_data)
+            )
+
+    def load_snapshot(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Charge l'instantané d'une mémoire.
+
+        Args:
+            memory_id (str): Identifiant de la mémoire.
+
+        Returns:
+            Optional[Dict[str, Any]]: Le dernier instantané enregistré, None s'il n'y en a pas.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT snapshot FROM memory_snapshots WHERE memory_id = ?", (memory_id,)).fetchone()
+        return json.loads(row[0]) if row else None
 
     def clear_memory(self, memory_id: str):
         """
-        Supprime toutes les étapes d'une mémoire.
+        Supprime toutes les étapes d'une mémoire, et son instantané.
 
         Args:
             memory_id (str): Identifiant unique de la mémoire.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM memory_steps WHERE memory_id = ?", (memory_id,))
-            conn.commit()
+        with self._transaction():
+            self._conn.execute("DELETE FROM memory_steps WHERE memory_id = ?", (memory_id,))
+            self._conn.execute("DELETE FROM memory_snapshots WHERE memory_id = ?", (memory_id,))
+
+    def close(self):
+        """
+        Ferme la connexion SQLite.
+        """
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,13 @@
 # dictatorgenai/models/__init__.py
 from .openai_model import OpenaiModel
 from .base_model import BaseModel, Message
+from .tool_call_assembler import ToolCallAssembler, StreamedToolCall, StreamUsage
 
 __all__ = [
     "OpenaiModel",
     "BaseModel",
     "Message",
+    "ToolCallAssembler",
+    "StreamedToolCall",
+    "StreamUsage",
 ]
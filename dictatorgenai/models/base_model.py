@@ -14,9 +14,12 @@ class Tool(TypedDict):
 
 
 class BaseModel(ABC):
+    # True si `stream_chat_completion(..., yield_tool_calls=True)` diffuse les appels d'outils dès qu'ils sont complets
+    supports_streaming_tool_calls: bool = False
+
     @abstractmethod
     async def chat_completion(
-        self, messages: List[Message], tools: List[Tool] = None
+        self, messages: List[Message], tools: List[Tool] = None, **kwargs: Any
     ) -> str:
         """
         Gère une complétion de chat avec support optionnel des tools.
@@ -24,6 +27,9 @@ class BaseModel(ABC):
         Args:
             messages (List[Message]): Historique des messages pour le modèle.
             tools (List[Tool], optional): Liste des outils disponibles avec leurs schémas JSON.
+            **kwargs (Any): Options de complétion, par exemple `response_format` ou `max_tokens`
+                (nombre maximal de tokens générés). La réponse expose `usage` quand le fournisseur
+                renvoie la consommation de tokens.
         
         Returns:
             str: La réponse du modèle.
@@ -40,8 +46,11 @@ class BaseModel(ABC):
         Args:
             messages (List[Message]): Historique des messages pour le modèle.
             tools (List[Tool], optional): Liste des outils disponibles avec leurs schémas JSON.
+            **kwargs (Any): Options de complétion, par exemple `max_tokens`. Les modèles dont
+                `supports_streaming_tool_calls` est True acceptent `yield_tool_calls=True`.
         
         Yields:
-            str: Un morceau de la réponse générée par le modèle.
+            str: Un morceau de la réponse générée par le modèle (et, avec `yield_tool_calls`,
+                les `StreamedToolCall` complets et le `StreamUsage` final).
         """
         pass
@@ -1,10 +1,13 @@
 import asyncio
 from openai import AsyncOpenAI
 from .base_model import Message, BaseModel
+from .tool_call_assembler import StreamUsage, ToolCallAssembler
 from typing import Any, AsyncGenerator, Generator, List, Dict
 
 
 class OpenaiModel(BaseModel):
+    supports_streaming_tool_calls = True
+
     def __init__(self, api_key: str):
         self.client = AsyncOpenAI(api_key=api_key)
 
@@ -28,36 +31,60 @@ class OpenaiModel(BaseModel):
             completion_args["tools"] = tools  # Add tools if provided
         if "response_format" in kwargs:
             completion_args["response_format"] = kwargs.pop("response_format")
+        if kwargs.get("max_tokens"):
+            completion_args["max_tokens"] = kwargs.pop("max_tokens")
 
         # Call the OpenAI API
         completion = await self.client.chat.completions.create(**completion_args)
 
-        # Extract the response
-        return completion.choices[0]
+        # Extract the response, keeping the token usage of the completion
+        choice = completion.choices[0]
+        choice.usage = completion.usage
+        return choice
 
     async def stream_chat_completion(
-        self, messages: List[Message], tools: List[Dict] = None, **kwargs: Any
-    ) -> AsyncGenerator[str, None]:
+        self, messages: List[Message], tools: List[Dict] = None, yield_tool_calls: bool = False, **kwargs: Any
+    ) -> AsyncGenerator[Any, None]:
         """
         Handles a streaming chat completion with optional tool support.
 
         Args:
             messages (List[Message]): User and system messages.
             tools (List[Dict], optional): List of tools defined with JSON schemas.
+            yield_tool_calls (bool): Also yield each tool call (`StreamedToolCall`) as soon as its arguments
+                are complete, and the token usage (`StreamUsage`) at the end of the stream.
             **kwargs (Any): Additional completion arguments.
 
         Yields:
-            str: A fragment of the response generated by the model.
+            str: A fragment of the response generated by the model, or, with `yield_tool_calls`,
+                a `StreamedToolCall` or the final `StreamUsage`.
         """
         completion_args = {"model": "gpt-4o-mini", "messages": messages, "stream": True}
         if tools:
             completion_args["tools"] = tools  # Add tools if provided
+        if kwargs.get("max_tokens"):
+            completion_args["max_tokens"] = kwargs.pop("max_tokens")
+        if yield_tool_calls:
+            completion_args["stream_options"] = {"include_usage": True}
+        assembler = ToolCallAssembler()
 
         # Use async for to handle the stream asynchronously
         async for chunk in await self.client.chat.completions.create(**completion_args):
+            if yield_tool_calls and getattr(chunk, "usage", None) is not None:
+                yield StreamUsage(chunk.usage.prompt_tokens or 0, chunk.usage.completion_tokens or 0)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
             # Check if the chunk contains content delta
-            if chunk.choices and chunk.choices[0].delta.content is not None:
-                yield chunk.choices[0].delta.content
+            if delta.content is not None:
+                yield delta.content
+            if yield_tool_calls and delta.tool_calls:
+                for tool_call in assembler.feed(delta.tool_calls):
+                    yield tool_call
+
+        if yield_tool_calls:
+            for tool_call in assembler.finish():
+                yield tool_call
 
     def _stream_chat_completion(
         self, messages: List[Message], tools: List[Dict] = None
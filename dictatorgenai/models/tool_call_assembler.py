@@ -0,0 +1,151 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class StreamedFunction:
+    """The function of a streamed tool call, with the same attributes as OpenAI's."""
+
+    def __init__(self, name: str, arguments: str):
+        self.name = name
+        self.arguments = arguments
+
+
+class StreamedToolCall:
+    """
+    Appel d'outil reconstitué à partir des fragments d'une complétion en streaming.
+
+    It exposes the same attributes as the `tool_calls` of a non-streamed completion
+    (`id`, `type`, `function.name`, `function.arguments`).
+    """
+
+    def __init__(self, index: int, id: str, name: str, arguments: str):
+        self.index = index
+        self.id = id
+        self.type = "function"
+        self.function = StreamedFunction(name, arguments)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The call as it must appear in the `tool_calls` of an assistant message."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "function": {"name": self.function.name, "arguments": self.function.arguments},
+        }
+
+
+class StreamUsage:
+    """Token usage of a streamed completion, yielded at the end of the stream."""
+
+    def __init__(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class _PendingCall:
+    def __init__(self, index: int):
+        self.index = index
+        self.id: Optional[str] = None
+        self.name = ""
+        self.arguments: List[str] = []
+        # État du scanner JSON incrémental
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+        self.complete = False
+
+    def feed(self, fragment: str) -> bool:
+        """Adds a fragment of the arguments; returns True once the JSON object is complete."""
+        self.arguments.append(fragment)
+        for char in fragment:
+            if self.complete:
+                break
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+                self.started = True
+            elif char in "}]":
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    self.complete = True
+        return self.complete
+
+
+class ToolCallAssembler:
+    """
+    Reconstitue les appels d'outils d'une complétion en streaming, et signale chacun dès que
+    le JSON de ses arguments est complet, sans attendre la fin de la complétion.
+
+    A call is complete when its arguments form a whole JSON object (tracked incrementally, so
+    each fragment is scanned once), when the model starts the next call, or at the end of the
+    stream.
+    """
+
+    def __init__(self):
+        self._pending: Dict[int, _PendingCall] = {}
+        self._emitted: set = set()
+        self.tool_calls: List[StreamedToolCall] = []
+
+    def feed(self, delta_tool_calls: Optional[List[Any]]) -> List[StreamedToolCall]:
+        """
+        Consumes the `delta.tool_calls` of a stream chunk.
+
+        Args:
+            delta_tool_calls (Optional[List[Any]]): The tool call fragments of the chunk.
+
+        Returns:
+            List[StreamedToolCall]: The calls completed by this chunk.
+        """
+        completed = []
+        for fragment in delta_tool_calls or []:
+            index = getattr(fragment, "index", 0) or 0
+            pending = self._pending.get(index)
+            if pending is None:
+                # Le modèle passe à l'appel suivant : les appels précédents sont terminés
+                completed.extend(self._flush(lambda other: other < index))
+                pending = self._pending[index] = _PendingCall(index)
+            if getattr(fragment, "id", None):
+                pending.id = fragment.id
+            function = getattr(fragment, "function", None)
+            if function is not None:
+                if getattr(function, "name", None):
+                    pending.name += function.name
+                if getattr(function, "arguments", None) and pending.feed(function.arguments):
+                    completed.extend(self._flush(lambda other: other == index))
+        return completed
+
+    def finish(self) -> List[StreamedToolCall]:
+        """
+        Ends the stream and returns the calls that were not completed yet.
+        """
+        return self._flush(lambda index: True)
+
+    def _flush(self, predicate) -> List[StreamedToolCall]:
+        completed = []
+        for index in sorted(self._pending):
+            if index in self._emitted or not predicate(index):
+                continue
+            pending = self._pending[index]
+            arguments = "".join(pending.arguments) or "{}"
+            call = StreamedToolCall(index, pending.id or f"call_{index}", pending.name, arguments)
+            self._emitted.add(index)
+            self.tool_calls.append(call)
+            completed.append(call)
+        return completed
+
+    @staticmethod
+    def is_valid(call: StreamedToolCall) -> bool:
+        """Indicates whether the arguments of a call are valid JSON."""
+        try:
+            json.loads(call.function.arguments)
+            return True
+        except json.JSONDecodeError:
+            return False
@@ -3,7 +3,7 @@ import uuid
 import logging
 import time
 import json
-from typing import AsyncGenerator, Dict, List, Optional
+from typing import AsyncGenerator, List, Optional, Union
 
 from dictatorgenai.models import BaseModel, Message
 from dictatorgenai.command_chains import CommandChain, DefaultCommandChain
@@ -12,7 +12,8 @@ from dictatorgenai.events import BaseEventManager, EventManager, EventType, Even
 from dictatorgenai.utils.task import Task
 from .base_regime import BaseRegime
 from dictatorgenai.memories.regime_memory import RegimeMemory
-from dictatorgenai.memories.stores.sqlite_store import SQLiteStore
+from dictatorgenai.memories.compaction import MemoryCompactor
+from dictatorgenai.memories.stores import AsyncMemoryStore, AsyncSQLiteStore, MemoryStore
 from dictatorgenai.steps.message_steps import UserMessageStep
 from dictatorgenai.steps.action_steps import GeneralSelectionStep, CoupDEtatStep, ActionStep
 
@@ -35,7 +36,10 @@ class Regime(BaseRegime):
         memory_id: Optional[str] = None,  # ✅ Ajout d'un paramètre memory_id
         command_chain: CommandChain = None,
         event_manager: BaseEventManager = None,
-        memory_store: Optional[SQLiteStore] = None,
+        memory_store: Optional[Union[AsyncMemoryStore, MemoryStore]] = None,
+        memory_durability: str = "per_turn",
+        memory_window_turns: Optional[int] = None,
+        memory_compactor: Optional[MemoryCompactor] = None,
     ):
         """
         Initialise un régime avec un modèle NLP, des généraux et une mémoire persistante.
@@ -47,7 +51,15 @@ class Regime(BaseRegime):
             memory_id (Optional[str]): Identifiant mémoire pour récupérer une discussion existante.
             command_chain (CommandChain, optional): Chaine de commande pour la gestion des tâches.
             event_manager (BaseEventManager, optional): Gestionnaire d'événements.
-            memory_store (Optional[SQLiteStore], optional): Store de mémoire pour la persistance.
+            memory_store (Optional[Union[AsyncMemoryStore, MemoryStore]], optional): Store de mémoire pour la persistance.
+                Les stores synchrones sont exécutés sur un thread dédié. Par défaut, `AsyncSQLiteStore("regime_store.db")`.
+            memory_durability (str): Quand les étapes sont écrites dans le store : "strict", "per_turn"
+                (à la fin de chaque tour, par défaut) ou "periodic" (voir `RegimeMemory`).
+            memory_window_turns (Optional[int]): Nombre de tours de la discussion chargés depuis le store,
+                None pour toute la discussion. Les étapes plus anciennes restent accessibles via
+                `memory.page_older_steps`.
+            memory_compactor (Optional[MemoryCompactor]): Résume en arrière-plan les tours les plus anciens
+                quand le contexte des prompts dépasse son seuil de tokens, None pour ne jamais compacter.
         """
         event_manager = event_manager or EventManager()
 
@@ -71,7 +83,10 @@ class Regime(BaseRegime):
         self.memory = RegimeMemory(
             memory_id=self.memory_id,
             task=Task(request=government_prompt),
-            store=memory_store or SQLiteStore(db_path="regime_store.db")
+            store=memory_store or AsyncSQLiteStore(db_path="regime_store.db"),
+            durability=memory_durability,
+            window_turns=memory_window_turns,
+            compactor=memory_compactor,
         )
 
     async def chat(self, request: str) -> AsyncGenerator[str, None]:
@@ -87,18 +102,29 @@ class Regime(BaseRegime):
         Raises:
             RegimeExecutionError: Si tous les généraux échouent.
         """
+        try:
+            async for chunk in self._run_turn(request):
+                yield chunk
+        finally:
+            # Les étapes du tour sont écrites en un seul lot (durabilité "per_turn")
+            await self.memory.end_turn()
+
+    async def _run_turn(self, request: str) -> AsyncGenerator[str, None]:
+        """
+        Exécute un tour de discussion (voir `chat`).
+        """
         start_time = time.time()
         
+        # La tâche partage la liste d'étapes de la mémoire : les étapes enregistrées par la mémoire
+        # y sont déjà ajoutées, les contributions des généraux y restent pour audit.
+        await self.memory.ensure_loaded()
         task = Task(request=request, steps=self.memory.steps)
-        user_step = self.memory.add_user_message(request)
-        task.add_step(user_step)
+        await self.memory.add_user_message(request)
         await self.publish(Event(EventType.TASK_STARTED, f"Starting task", task.task_id, details=task.to_dict()))
 
         try:
             dictator, generals_to_use, execute_task = await self.command_chain.prepare_task_execution(self.generals, task)
             generals_names = ", ".join([general.my_name_is for general in generals_to_use])
-            generals_selection_step = self.memory.select_generals([dictator.my_name_is] + [general.my_name_is for general in generals_to_use])
-            task.add_step(GeneralSelectionStep(request_id=len(task.steps) + 1, selected_generals=[dictator.my_name_is] + [general.my_name_is for general in generals_to_use], metadata={"dictator": dictator.my_name_is, "generals": generals_names}))
             await self.publish(Event(EventType.GENERALS_SELECTED, f"Selected generals: {generals_names}", task.task_id, details=task.to_dict()))
             
         except TaskExecutionError as e:
@@ -110,7 +136,7 @@ class Regime(BaseRegime):
             try:
                 
                 if len(generals_to_use) > 0:
-                    self.memory.select_generals([general.my_name_is for general in generals_to_use])
+                    await self.memory.select_generals([general.my_name_is for general in generals_to_use])
                     await self.perform_coup(dictator, generals_to_use, task=task)
                     # Notify that the dictator is solving the task with help
                     generals_names = ", ".join([general.my_name_is for general in generals_to_use])
@@ -118,7 +144,7 @@ class Regime(BaseRegime):
                     
                 else:
                     # Notify that the dictator is solving the task alone
-                    self.memory.select_generals([dictator.my_name_is])
+                    await self.memory.select_generals([dictator.my_name_is])
                     await self.perform_coup(dictator, task=task)
                     await self.publish(Event(EventType.TASK_UPDATED, f"General {dictator.my_name_is} is solving the task alone", task.task_id, details=task.to_dict()))
 
@@ -129,8 +155,7 @@ class Regime(BaseRegime):
                     result += chunk
                     yield chunk
 
-                step = self.memory.add_assistant_message(result)
-                task.add_step(step)
+                await self.memory.add_assistant_message(result)
 
                 await self.publish(Event(EventType.TASK_COMPLETED, f"Task completed by {dictator.my_name_is}", task.task_id, details=task.to_dict()))
                 return
@@ -168,7 +193,7 @@ class Regime(BaseRegime):
 
             self.logger.debug(f"{general.my_name_is} performed a coup d'état and became the new dictator.")
             await self.publish(Event(EventType.COUP_D_ETAT, f"{general.my_name_is} performed a coup d'état.", task.task_id, details=task.to_dict() if task else None))
-            self.memory.coup_detat(new_dictator=general.my_name_is, previous_dictator=previous_dictator.my_name_is if previous_dictator else None)
+            await self.memory.coup_detat(new_dictator=general.my_name_is, previous_dictator=previous_dictator.my_name_is if previous_dictator else None)
 
 
     async def _handle_task_failure(self, task: Task, error: TaskExecutionError):
@@ -180,7 +205,10 @@ class Regime(BaseRegime):
             error (TaskExecutionError): Erreur rencontrée.
         """
         await self.publish(Event(EventType.TASK_FAILED, f"Task '{task}' failed: {error.clarification_request}", task.task_id, details=task.to_dict()))
-        self.memory.add_action_step("System", "Failure handling", error.clarification_request)
-
-    
+        await self.memory.add_action_step("System", "Failure handling", error.clarification_request)
 
+    async def close(self):
+        """
+        Écrit les étapes de la mémoire encore en attente et ferme son store. À appeler à l'arrêt.
+        """
+        await self.memory.close()
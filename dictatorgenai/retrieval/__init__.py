@@ -0,0 +1,10 @@
+"""
+Moteur de recherche plein texte embarqué (BM25) pour les articles de loi et les décisions de justice,
+utilisable comme tool par les généraux.
+"""
+
+from .analyzer import analyze
+from .bm25_index import BM25Index
+from .search_tool import SearchTool, make_search_tool
+
+__all__ = ["analyze", "BM25Index", "SearchTool", "make_search_tool"]
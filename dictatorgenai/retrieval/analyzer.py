@@ -0,0 +1,28 @@
+import re
+import unicodedata
+from typing import List
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Mots vides français et anglais les plus fréquents, sans intérêt pour la recherche
+STOPWORDS = frozenset("""
+au aux avec ce ces dans de des du elle en et eux il ils je la le les leur lui ma mais me meme mes moi mon ne nos
+notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une vos votre vous est sont
+ete etre avoir ont cette cet sans sous entre dont ainsi
+the of and to in is are was were be been for on at by with from as an or that this it its into not
+""".split())
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Découpe un texte en termes indexables : minuscules, sans accents, sans mots vides.
+
+    Args:
+        text (str): The text to analyze.
+
+    Returns:
+        List[str]: The terms of the text, in order.
+    """
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [term for term in _WORD_RE.findall(text) if len(term) > 1 and term not in STOPWORDS]
@@ -0,0 +1,375 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .analyzer import analyze
+
+MANIFEST_FILE = "manifest.json"
+INDEX_VERSION = 1
+
+
+class _Segment:
+    """
+    Segment immuable de l'index, ouvert en lecture seule par mmap.
+
+    Files of a segment `<name>`:
+        - `<name>.lexicon.json`: term -> [offset in the postings, document frequency],
+        - `<name>.postings`: for each term, its local document ids then its term frequencies (uint32),
+        - `<name>.lengths`: the length of each document in terms (uint32),
+        - `<name>.docs` / `<name>.offsets`: the stored documents as JSON lines and their offsets (uint64),
+        - `<name>.ids.json`: the external id of each document.
+    """
+
+    def __init__(self, directory: str, name: str):
+        self.name = name
+        base = os.path.join(directory, name)
+        with open(f"{base}.lexicon.json", "r", encoding="utf-8") as f:
+            self.lexicon: Dict[str, List[int]] = json.load(f)
+        with open(f"{base}.ids.json", "r", encoding="utf-8") as f:
+            self.ids: List[str] = json.load(f)
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+        self.postings = self._map(f"{base}.postings", "I")
+        self.lengths = self._map(f"{base}.lengths", "I")
+        self.offsets = self._map(f"{base}.offsets", "Q")
+        self.docs = self._map(f"{base}.docs", None)
+
+    def _map(self, path: str, typecode: Optional[str]):
+        if os.path.getsize(path) == 0:
+            return array(typecode) if typecode else b""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        view = memoryview(mapped)
+        if typecode:
+            view = view.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def document(self, local_id: int) -> Dict[str, Any]:
+        return json.loads(bytes(self.docs[self.offsets[local_id]:self.offsets[local_id + 1]]))
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views, self._maps = [], []
+
+
+def _write_segment(directory: str, name: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Writes a new immutable segment and returns its manifest entry.
+    """
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    lengths = array("I")
+    offsets = array("Q", [0])
+    ids: List[str] = []
+    base = os.path.join(directory, name)
+
+    with open(f"{base}.docs", "wb") as docs_file:
+        for local_id, document in enumerate(documents):
+            terms = analyze(f"{document.get('title', '')} {document.get('text', '')}")
+            for term, frequency in Counter(terms).items():
+                postings.setdefault(term, []).append((local_id, frequency))
+            lengths.append(len(terms))
+            data = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            docs_file.write(data)
+            offsets.append(offsets[-1] + len(data))
+            ids.append(str(document["id"]))
+
+    lexicon: Dict[str, List[int]] = {}
+    flat = array("I")
+    for term in sorted(postings):
+        entries = postings[term]
+        lexicon[term] = [len(flat), len(entries)]
+        flat.extend(local_id for local_id, _ in entries)
+        flat.extend(frequency for _, frequency in entries)
+
+    with open(f"{base}.postings", "wb") as f:
+        flat.tofile(f)
+    with open(f"{base}.lengths", "wb") as f:
+        lengths.tofile(f)
+    with open(f"{base}.offsets", "wb") as f:
+        offsets.tofile(f)
+    with open(f"{base}.lexicon.json", "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False, separators=(",", ":"))
+    with open(f"{base}.ids.json", "w", encoding="utf-8") as f:
+        json.dump(ids, f, ensure_ascii=False)
+
+    return {"name": name, "doc_count": len(documents), "total_length": sum(lengths)}
+
+
+class BM25Index:
+    """
+    Index plein texte BM25 sur disque, pour la recherche d'articles de loi et de décisions.
+
+    The index is a directory of immutable segments listed in a manifest. Postings, document
+    lengths and stored documents are memory-mapped: several processes opening the same index
+    share it read-only through the page cache. Adding documents writes a new segment; updating
+    or deleting a document marks its previous version with a tombstone. `merge` compacts the
+    segments and drops deleted documents. Readers see the changes made by a writer after
+    `refresh`.
+
+    Only one writer at a time is supported per index directory. Binary files use the native
+    byte order, so an index must be read on a machine of the same endianness.
+
+    Attributes:
+        path (str): The directory of the index.
+        k1 (float): BM25 term frequency saturation.
+        b (float): BM25 document length normalization.
+    """
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        """
+        Opens the index at `path`, creating an empty one if the directory has no manifest.
+
+        Args:
+            path (str): The directory of the index.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 document length normalization.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._segments: Dict[str, _Segment] = {}
+        self._manifest: Dict[str, Any] = {}
+        self._generation: Optional[int] = None
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(self._manifest_path):
+            self._write_manifest({"version": INDEX_VERSION, "generation": 0, "next_segment": 1, "segments": [], "deleted": {}})
+        self.refresh()
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST_FILE)
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        # Écriture atomique : les lecteurs voient l'ancien ou le nouveau manifeste, jamais un fichier partiel
+        temp_path = f"{self._manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, self._manifest_path)
+
+    def refresh(self) -> bool:
+        """
+        Reloads the manifest if it changed on disk, opening new segments and closing removed ones.
+
+        Returns:
+            bool: True if the index changed.
+        """
+        with self._lock:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["generation"] == self._generation:
+                return False
+            names = [segment["name"] for segment in manifest["segments"]]
+            for name in list(self._segments):
+                if name not in names:
+                    self._segments.pop(name).close()
+            for name in names:
+                if name not in self._segments:
+                    self._segments[name] = _Segment(self.path, name)
+            self._manifest = manifest
+            self._generation = manifest["generation"]
+            self._locations = {
+                document_id: (name, local_id)
+                for name in names
+                for local_id, document_id in enumerate(self._segments[name].ids)
+                if local_id not in self._deleted(name)
+            }
+            return True
+
+    def _deleted(self, segment_name: str) -> set:
+        deleted = self._manifest.setdefault("deleted", {})
+        if not isinstance(deleted.get(segment_name), set):
+            deleted[segment_name] = set(deleted.get(segment_name, []))
+        return deleted[segment_name]
+
+    def _save_manifest(self):
+        self._manifest["generation"] += 1
+        manifest = dict(self._manifest)
+        manifest["deleted"] = {name: sorted(ids) for name, ids in self._manifest.get("deleted", {}).items() if ids}
+        self._write_manifest(manifest)
+        self._generation = self._manifest["generation"]
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, document_id: str) -> bool:
+        return str(document_id) in self._locations
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Indexes documents in a new segment. A document whose id is already indexed replaces it.
+
+        Args:
+            documents (Iterable[Dict[str, Any]]): Documents with an `id` and a `text`, and optionally a
+                `title` (indexed too) and any other stored field (`metadata`, `source`...).
+
+        Returns:
+            int: The number of documents indexed.
+        """
+        documents = list(documents)
+        if not documents:
+            return 0
+        # Le dernier document d'un même identifiant l'emporte
+        documents = list({str(document["id"]): document for document in documents}.values())
+        with self._lock:
+            self.refresh()
+            name = f"seg_{self._manifest['next_segment']:06d}"
+            entry = _write_segment(self.path, name, documents)
+            for document in documents:
+                self._tombstone(str(document["id"]))
+            self._manifest["next_segment"] += 1
+            self._manifest["segments"].append(entry)
+            self._segments[name] = _Segment(self.path, name)
+            for local_id, document_id in enumerate(self._segments[name].ids):
+                self._locations[document_id] = (name, local_id)
+            self._save_manifest()
+        return len(documents)
+
+    def delete_documents(self, document_ids: Iterable[str]) -> int:
+        """
+        Deletes documents from the index.
+
+        Args:
+            document_ids (Iterable[str]): The ids of the documents.
+
+        Returns:
+            int: The number of documents deleted.
+        """
+        with self._lock:
+            self.refresh()
+            deleted = sum(1 for document_id in document_ids if self._tombstone(str(document_id)))
+            if deleted:
+                self._save_manifest()
+        return deleted
+
+    def _tombstone(self, document_id: str) -> bool:
+        location = self._locations.pop(document_id, None)
+        if location is None:
+            return False
+        name, local_id = location
+        self._deleted(name).add(local_id)
+        return True
+
+    def merge(self):
+        """
+        Compacts all the segments into one, dropping deleted documents.
+        """
+        with self._lock:
+            self.refresh()
+            old_names = [segment["name"] for segment in self._manifest["segments"]]
+            if len(old_names) <= 1 and not any(self._manifest.get("deleted", {}).values()):
+                return
+            documents = [self.get_document(document_id) for document_id in self._locations]
+            name = f"seg_{self._manifest['next_segment']:06d}"
+            new_entries = [_write_segment(self.path, name, documents)] if documents else []
+            self._manifest["next_segment"] += 1
+            self._manifest["segments"] = new_entries
+            self._manifest["deleted"] = {}
+            self._save_manifest()
+            # Les lecteurs d'autres processus peuvent encore avoir les anciens fichiers ouverts :
+            # sous POSIX, la suppression ne libère l'espace qu'après leur fermeture.
+            self._generation = None
+            self.refresh()
+            for old_name in old_names:
+                for suffix in (".lexicon.json", ".postings", ".lengths", ".offsets", ".docs", ".ids.json"):
+                    try:
+                        os.remove(os.path.join(self.path, old_name + suffix))
+                    except OSError:
+                        pass
+
+    def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a stored document by id, or None if it is not indexed.
+        """
+        location = self._locations.get(str(document_id))
+        if location is None:
+            return None
+        name, local_id = location
+        return self._segments[name].document(local_id)
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns the `top_k` documents best matching a query, by BM25 score.
+
+        Args:
+            query (str): The query, in natural language.
+            top_k (int): The number of documents to return.
+
+        Returns:
+            List[Dict[str, Any]]: The stored documents, best first, each with its `score`.
+        """
+        terms = list(dict.fromkeys(analyze(query)))
+        if not terms or top_k <= 0:
+            return []
+
+        with self._lock:
+            segments = [self._segments[entry["name"]] for entry in self._manifest["segments"]]
+            entries = self._manifest["segments"]
+            document_count = sum(entry["doc_count"] for entry in entries)
+            total_length = sum(entry["total_length"] for entry in entries)
+            if not document_count:
+                return []
+            average_length = total_length / document_count
+            k1, b = self.k1, self.b
+
+            # Statistiques globales (les documents supprimés restent comptés jusqu'au prochain merge)
+            idf: Dict[str, float] = {}
+            for term in terms:
+                frequency = sum(segment.lexicon[term][1] for segment in segments if term in segment.lexicon)
+                if frequency:
+                    idf[term] = math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+
+            candidates: List[Tuple[float, str, int]] = []
+            for segment in segments:
+                scores: Dict[int, float] = {}
+                lengths = segment.lengths
+                for term, term_idf in idf.items():
+                    entry = segment.lexicon.get(term)
+                    if entry is None:
+                        continue
+                    offset, frequency = entry
+                    postings = segment.postings
+                    for local_id, term_frequency in zip(
+                        postings[offset:offset + frequency], postings[offset + frequency:offset + 2 * frequency]
+                    ):
+                        norm = k1 * (1 - b + b * lengths[local_id] / average_length)
+                        scores[local_id] = scores.get(local_id, 0.0) + term_idf * term_frequency * (k1 + 1) / (term_frequency + norm)
+                deleted = self._deleted(segment.name)
+                best = heapq.nlargest(
+                    top_k,
+                    ((score, local_id) for local_id, score in scores.items() if local_id not in deleted),
+                )
+                candidates.extend((score, segment.name, local_id) for score, local_id in best)
+
+            results = []
+            for score, name, local_id in heapq.nlargest(top_k, candidates):
+                document = self._segments[name].document(local_id)
+                document["score"] = score
+                results.append(document)
+            return results
+
+    def close(self):
+        """Closes the memory maps of the index."""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments = {}
+            self._generation = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Seul le chemin est transmis : l'index est rouvert (et partagé par mmap) dans le processus cible
+        return {"path": self.path, "k1": self.k1, "b": self.b}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(state["path"], k1=state["k1"], b=state["b"])
@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional, Union
+
+from dictatorgenai.agents.tool import tool
+from .bm25_index import BM25Index
+
+# Index ouverts dans le processus courant, par chemin : chaque worker d'un pool ouvre l'index une seule fois
+_OPEN_INDEXES: Dict[str, BM25Index] = {}
+
+
+def open_index(path: str) -> BM25Index:
+    """
+    Returns the index at `path`, opened once per process and refreshed to see the latest segments.
+    """
+    index = _OPEN_INDEXES.get(path)
+    if index is None:
+        index = _OPEN_INDEXES[path] = BM25Index(path)
+    else:
+        index.refresh()
+    return index
+
+
+class SearchTool:
+    """
+    Tool de recherche plein texte sur un `BM25Index`.
+
+    Instances are picklable by index path only, so the tool can run in the process pool: each
+    worker opens the memory-mapped index once and shares its pages with the other processes.
+    """
+
+    def __init__(self, index_path: str, name: str, max_text_chars: Optional[int] = 2000):
+        self.index_path = index_path
+        self.__name__ = name
+        self.max_text_chars = max_text_chars
+
+    def __call__(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        results = open_index(self.index_path).search(query, top_k=top_k)
+        if self.max_text_chars:
+            for result in results:
+                text = result.get("text") or ""
+                if len(text) > self.max_text_chars:
+                    result["text"] = text[:self.max_text_chars] + "…"
+        return results
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"index_path": self.index_path, "name": self.__name__, "max_text_chars": self.max_text_chars}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(state["index_path"], state["name"], state["max_text_chars"])
+
+
+def make_search_tool(
+    index: Union[BM25Index, str],
+    name: str = "legal_search",
+    description: str = "Recherche plein texte dans les articles de loi et les décisions de justice. Renvoie les documents les plus pertinents pour la requête.",
+    execution: str = "process",
+    max_text_chars: Optional[int] = 2000,
+    **tool_options: Any,
+):
+    """
+    Exposes a `BM25Index` as a retrieval tool, prefetched on the `legal_queries` of the generals.
+
+    Args:
+        index (Union[BM25Index, str]): The index or its directory.
+        name (str): The name of the tool.
+        description (str): The description of the tool given to the model.
+        execution (str): The execution policy of the tool ("process" by default, "thread" also works
+            since the index is shared by mmap).
+        max_text_chars (Optional[int]): Truncates the text of the returned documents, None to keep it whole.
+        **tool_options: Other options of `@tool` (timeout, cacheable, ttl...).
+
+    Returns:
+        SearchTool: The tool, to pass in the `tools` of a General.
+    """
+    index_path = index.path if isinstance(index, BM25Index) else index
+    search = SearchTool(index_path, name, max_text_chars=max_text_chars)
+    tool_options.setdefault("query_param", "query")
+    return tool(description, execution=execution, **tool_options)(search)
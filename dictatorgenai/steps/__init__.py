@@ -1,16 +1,20 @@
 # dictatorgen/steps/__init__.py
 from .base_step import TaskStep
-from .message_steps import UserMessageStep, AssistantMessageStep
+from .message_steps import UserMessageStep, AssistantMessageStep, ConversationSummaryStep
 from .action_steps import GeneralSelectionStep, CoupDEtatStep, ActionStep, PlanningStep, GeneralEvaluationStep, ToolExecutionStep
+from .step_codec import StepCodec, default_step_codec
 
 __all__ = [
     "TaskStep",
     "UserMessageStep",
     "AssistantMessageStep",
+    "ConversationSummaryStep",
     "GeneralSelectionStep",
     "CoupDEtatStep",
     "ActionStep",
     "PlanningStep",
     "GeneralEvaluationStep",
     "ToolExecutionStep",
+    "StepCodec",
+    "default_step_codec",
 ]
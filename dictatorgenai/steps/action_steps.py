@@ -67,19 +67,38 @@ class ToolExecutionStep(TaskStep):
         tool_name: str,
         arguments: Dict[str, object],
         output: Optional[object] = None,
-        metadata: Optional[Dict[str, object]] = None
+        metadata: Optional[Dict[str, object]] = None,
+        output_ref: Optional[str] = None,
     ):
         super().__init__(request_id, "tool_execution", metadata)
         self.tool_name = tool_name
         self.arguments = arguments
+        # Pour une sortie volumineuse, `output` n'en contient qu'un aperçu et `output_ref` référence le blob complet
         self.output = output
+        self.output_ref = output_ref
+
+    def get_output(self, blob_store=None) -> Optional[object]:
+        """
+        Returns the full output, reading it from the blob store if it was stored out of line.
+
+        Args:
+            blob_store (BlobStore, optional): The blob store, `DictatorSettings.get_blob_store()` by default.
+        """
+        if not self.output_ref:
+            return self.output
+        if blob_store is None:
+            from dictatorgenai.config import DictatorSettings
+            blob_store = DictatorSettings.get_blob_store()
+        output = blob_store.get(self.output_ref)
+        return output if output is not None else self.output
 
     def to_dict(self) -> Dict[str, object]:
         data = super().to_dict()
         data.update({
             "tool_name": self.tool_name,
             "arguments": self.arguments,
-            "output": self.output
+            "output": self.output,
+            "output_ref": self.output_ref
         })
         return data
 
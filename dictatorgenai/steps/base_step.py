@@ -1,21 +1,128 @@
 from abc import ABC
 import time
 import inspect  # ✅ Ajout de l'import manquant
-from typing import Optional, Dict, Type
+import weakref
+from typing import Any, Optional, Dict, Tuple, Type
 
 # Registre global des types de step
 TASK_STEP_REGISTRY: Dict[str, Type["TaskStep"]] = {}
 
+
+class _StepMetadata(dict):
+    """
+    Métadonnées d'une étape : toute modification en place invalide les formes sérialisées de l'étape.
+    """
+
+    def __init__(self, data: Dict[str, object], owner: "TaskStep"):
+        super().__init__(data)
+        self._owner = weakref.ref(owner)
+
+    def _changed(self):
+        owner = self._owner()
+        if owner is not None:
+            owner.__dict__.pop("_serialized", None)
+
+    def __setitem__(self, key, value):
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._changed()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self._changed()
+        return super().__ior__(other)
+
+    def update(self, *args, **kwargs):
+        self._changed()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        self._changed()
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def clear(self):
+        self._changed()
+        super().clear()
+
+    def __reduce__(self):
+        # Une copie est un dictionnaire ordinaire, rattaché à l'étape qui la reçoit
+        return dict, (dict(self),)
+
 class TaskStep(ABC):
     """
     Classe de base pour toutes les étapes d'exécution d'une tâche.
+
+    The serialized forms of a step (`as_dict`, `StepCodec.encode`) are memoized on the step and
+    reset whenever one of its attributes is assigned or its `metadata` is modified in place (the
+    metadata is copied into a dict that tracks its changes). Values nested in the attributes must
+    not be modified in place once the step is recorded.
     """
+    # Paramètres du constructeur, calculés une fois à l'enregistrement du type (voir `register_step`)
+    _init_params: frozenset = frozenset()
+    _step_fields: Tuple[str, ...] = ()
+
     def __init__(self, request_id: str, step_type: str, metadata: Optional[Dict[str, object]] = None):
         self.request_id = request_id
         self.step_type = step_type  # ✅ Chaque sous-classe doit enregistrer son propre type
         self.timestamp = time.time()
         self.metadata = metadata if metadata is not None else {}
 
+    def __setattr__(self, name: str, value: Any):
+        # Toute modification invalide les formes sérialisées mémorisées
+        self.__dict__.pop("_serialized", None)
+        if name == "metadata" and isinstance(value, dict):
+            value = _StepMetadata(value, self)
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # Copies et pickles : les formes mémorisées ne sont pas reprises, les métadonnées sont suivies à nouveau
+        for name, value in state.items():
+            if name != "_serialized":
+                setattr(self, name, value)
+
+    def get_serialized(self, key: str) -> Any:
+        """
+        Retourne une forme sérialisée mémorisée de l'étape, None si elle n'a pas été calculée.
+
+        Args:
+            key (str): Le nom de la forme (ex. la clé d'un `StepCodec`).
+        """
+        cache = self.__dict__.get("_serialized")
+        return cache.get(key) if cache else None
+
+    def set_serialized(self, key: str, value: Any):
+        """
+        Mémorise une forme sérialisée de l'étape, jusqu'à la prochaine modification d'un attribut.
+
+        Args:
+            key (str): Le nom de la forme.
+            value (Any): La forme sérialisée.
+        """
+        self.__dict__.setdefault("_serialized", {})[key] = value
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Version mémorisée de `to_dict` : le dictionnaire n'est reconstruit qu'après une modification de l'étape.
+
+        Returns:
+            Dict[str, object]: Une copie (superficielle) de la représentation de l'étape.
+        """
+        data = self.get_serialized("dict")
+        if data is None:
+            data = self.to_dict()
+            self.set_serialized("dict", data)
+        return dict(data)
+
     def to_dict(self) -> Dict[str, object]:
         """
         Convertit l'objet en dictionnaire pour JSON serialization.
@@ -33,11 +140,10 @@ class TaskStep(ABC):
     @classmethod
     def from_dict(cls, data: Dict[str, object]) -> "TaskStep":
         """
-        Recrée une instance de TaskStep ou d'une de ses sous-classes à partir d'un dictionnaire.
+        Recrée une instance de TaskStep ou d'une de ses sous-classes à partir d'un dictionnaire
+        (le dictionnaire n'est pas modifié, l'horodatage est restauré).
         """
-        print("DEBUG data before pop:", data)  # ✅ Ajoute ce log pour voir la structure de `data`
-        step_type = data.pop("step_type", None)
-        print("DEBUG step_type:", step_type)  # ✅ Vérifie si step_type est bien récupéré
+        step_type = data.get("step_type")
 
         if not step_type:
             raise ValueError("Le dictionnaire ne contient pas de type d'étape.")
@@ -47,19 +153,26 @@ class TaskStep(ABC):
         if not step_class:
             raise ValueError(f"Aucune classe trouvée pour le type d'étape: {step_type}")
 
-        # 🔹 Récupérer les arguments acceptés par le constructeur de la classe
-        step_params = inspect.signature(step_class).parameters
-        filtered_data = {key: value for key, value in data.items() if key in step_params}
-
-        # 🔹 Instancier la classe avec uniquement les arguments valides
-        return step_class(**filtered_data)
+        # 🔹 Instancier la classe avec uniquement les arguments acceptés par son constructeur
+        step_params = step_class._init_params
+        step = step_class(**{key: value for key, value in data.items() if key in step_params})
+        if "timestamp" in data:
+            step.timestamp = data["timestamp"]
+        return step
 
     @classmethod
     def register_step(cls, step_type: str):
         """
         Décorateur pour enregistrer une sous-classe de TaskStep dans le registre.
+
+        The parameters of the constructor are read once here, so that rebuilding a step
+        does not inspect its signature.
         """
         def decorator(subclass: Type["TaskStep"]):
+            params = tuple(inspect.signature(subclass).parameters)
+            subclass._init_params = frozenset(params)
+            # Champs propres au type, dans l'ordre du constructeur (encodage positionnel de `StepCodec`)
+            subclass._step_fields = tuple(param for param in params if param not in ("request_id", "metadata"))
             TASK_STEP_REGISTRY[step_type] = subclass
             return subclass
         return decorator
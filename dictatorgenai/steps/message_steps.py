@@ -1,6 +1,7 @@
 from .base_step import TaskStep
 from typing import Dict, Optional
 
+
 @TaskStep.register_step("user_message")
 class UserMessageStep(TaskStep):
     def __init__(self, request_id: str, content: str, metadata: Optional[Dict[str, object]] = None):
@@ -13,6 +14,7 @@ class UserMessageStep(TaskStep):
         data.update({"role": self.role, "content": self.content})
         return data
 
+
 @TaskStep.register_step("assistant_message")
 class AssistantMessageStep(TaskStep):
     def __init__(self, request_id: str, content: str, metadata: Optional[Dict[str, object]] = None):
@@ -24,3 +26,23 @@ class AssistantMessageStep(TaskStep):
         data = super().to_dict()
         data.update({"role": self.role, "content": self.content})
         return data
+
+
+@TaskStep.register_step("conversation_summary")
+class ConversationSummaryStep(TaskStep):
+    """
+    Résumé des tours les plus anciens d'une discussion, produit par la compaction de la mémoire.
+
+    `compacted_until` is the position (among the stored steps) of the first step that is not
+    summarized: the prompts use the summary in place of the steps before it.
+    """
+    def __init__(self, request_id: str, content: str, compacted_until: int = 0, metadata: Optional[Dict[str, object]] = None):
+        super().__init__(request_id, "conversation_summary", metadata)
+        self.role = "system"
+        self.content = content
+        self.compacted_until = compacted_until
+
+    def to_dict(self) -> Dict[str, object]:
+        data = super().to_dict()
+        data.update({"role": self.role, "content": self.content, "compacted_until": self.compacted_until})
+        return data
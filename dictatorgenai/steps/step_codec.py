@@ -0,0 +1,129 @@
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Union
+
+from .base_step import TASK_STEP_REGISTRY, TaskStep
+
+try:
+    import msgpack
+except ImportError:  # msgpack est optionnel : JSON compact sinon
+    msgpack = None
+
+# Premier octet d'un step encodé : le format du corps, en majuscule s'il est compressé avec zlib
+_JSON, _JSON_ZLIB, _MSGPACK, _MSGPACK_ZLIB = b"j", b"J", b"m", b"M"
+
+
+class StepCodec:
+    """
+    Encodage compact des `TaskStep` pour la persistance.
+
+    A step is encoded as a positional array `[step_type, request_id, timestamp, metadata, *fields]`,
+    where `fields` are the parameters of its constructor, in order: the field names are not stored
+    and decoding calls the constructor directly. The array is packed with msgpack when it is
+    installed, as compact JSON otherwise. With msgpack, bodies beyond `compress_threshold` bytes
+    (large plans and evaluations) are compressed with zlib; the JSON fallback is not compressed
+    by default, as zlib would make it slower to encode than the plain JSON it replaces. The
+    encoded form is memoized on the step.
+
+    Decoding also reads the plain JSON written by previous versions of the stores.
+    """
+
+    def __init__(self, use_msgpack: bool = True, compress_threshold: Optional[int] = None, compress_level: int = 1):
+        """
+        Args:
+            use_msgpack (bool): Utilise msgpack s'il est installé.
+            compress_threshold (Optional[int]): Taille (en octets) à partir de laquelle le corps est compressé,
+                0 pour ne jamais compresser. Par défaut 1024 avec msgpack, 0 sans.
+            compress_level (int): Niveau de compression zlib.
+        """
+        self.use_msgpack = use_msgpack and msgpack is not None
+        if compress_threshold is None:
+            compress_threshold = 1024 if self.use_msgpack else 0
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        # Clé de mémorisation : deux codecs configurés différemment ne partagent pas leurs encodages
+        self.key = f"codec:{'m' if self.use_msgpack else 'j'}:{compress_threshold}:{compress_level}"
+
+    def encode(self, step: TaskStep) -> bytes:
+        """
+        Encode une étape (forme mémorisée si l'étape n'a pas changé depuis le dernier encodage).
+
+        Args:
+            step (TaskStep): L'étape à encoder.
+
+        Returns:
+            bytes: L'étape encodée.
+        """
+        encoded = step.get_serialized(self.key)
+        if encoded is None:
+            encoded = self._encode(step)
+            step.set_serialized(self.key, encoded)
+        return encoded
+
+    def decode(self, data: Union[bytes, str]) -> TaskStep:
+        """
+        Reconstruit une étape encodée par `encode`, ou écrite en JSON par une version précédente.
+
+        Args:
+            data (Union[bytes, str]): L'étape encodée.
+
+        Returns:
+            TaskStep: L'étape reconstruite.
+        """
+        if isinstance(data, str):
+            return TaskStep.from_dict(json.loads(data))  # Ancien format (colonne TEXT)
+        header, body = data[:1], data[1:]
+        if header in (_JSON_ZLIB, _MSGPACK_ZLIB):
+            body = zlib.decompress(body)
+        if header in (_MSGPACK, _MSGPACK_ZLIB):
+            if msgpack is None:
+                raise RuntimeError("This step was encoded with msgpack, which is not installed.")
+            payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+        elif header in (_JSON, _JSON_ZLIB):
+            payload = json.loads(body)
+        else:
+            return TaskStep.from_dict(json.loads(data))  # Ancien format (JSON en octets)
+
+        step = self._build(payload)
+        step.set_serialized(self.key, bytes(data))
+        return step
+
+    def _encode(self, step: TaskStep) -> bytes:
+        """Encode une étape, sans mémorisation."""
+        data = step.as_dict()
+        step_class = type(step)
+        fields = step_class._step_fields
+        if (
+            TASK_STEP_REGISTRY.get(step.step_type) is step_class
+            and {"request_id", "metadata"} <= step_class._init_params
+            and all(field in data for field in fields)
+        ):
+            payload: Any = [step.step_type, step.request_id, step.timestamp, step.metadata, *[data[field] for field in fields]]
+        else:
+            payload = data  # Type non enregistré, ou champs sans attribut correspondant : forme nommée
+
+        if self.use_msgpack:
+            body, header, zlib_header = msgpack.packb(payload, use_bin_type=True), _MSGPACK, _MSGPACK_ZLIB
+        else:
+            body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            header, zlib_header = _JSON, _JSON_ZLIB
+        if self.compress_threshold and len(body) >= self.compress_threshold:
+            return zlib_header + zlib.compress(body, self.compress_level)
+        return header + body
+
+    @staticmethod
+    def _build(payload: Union[List[Any], Dict[str, Any]]) -> TaskStep:
+        """Reconstruit une étape depuis sa forme positionnelle (ou nommée)."""
+        if isinstance(payload, dict):
+            return TaskStep.from_dict(payload)
+        step_type, request_id, timestamp, metadata, *values = payload
+        step_class = TASK_STEP_REGISTRY.get(step_type)
+        if step_class is None:
+            raise ValueError(f"Aucune classe trouvée pour le type d'étape: {step_type}")
+        step = step_class(request_id=request_id, metadata=metadata, **dict(zip(step_class._step_fields, values)))
+        step.timestamp = timestamp
+        return step
+
+
+# Codec utilisé par défaut par les stores
+default_step_codec = StepCodec()
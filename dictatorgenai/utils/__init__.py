@@ -1,6 +1,7 @@
 # Import direct du décorateur tool pour un accès plus simple
 from .tool import tool
 from .task import Task, TaskStatus
+from .token_budget import TokenBudget
 
 # Liste des éléments publics pour le module `utils`
-__all__ = ["tool", "Task", "TaskStatus"]
+__all__ = ["tool", "Task", "TaskStatus", "TokenBudget"]
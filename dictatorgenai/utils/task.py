@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional, List, Dict
+from typing import Iterable, Optional, List, Dict
 from dictatorgenai.steps.base_step import TaskStep  # ✅ Import de TaskStep
 
 class TaskStatus:
@@ -26,7 +26,7 @@ class Task:
     ):
         self.task_id = task_id or str(uuid.uuid4())  # Génération d'un ID unique si non fourni
         self.request = request
-        self.steps = steps or []  # ✅ Stocke une liste d'objets TaskStep
+        self.steps = steps if steps is not None else []  # ✅ Stocke une liste d'objets TaskStep (partagée si fournie, même vide)
         self.subtasks = subtasks or []  # Ajouter un attribut pour les sous-tâches
         self.metadata = metadata or {}
         self.priority = priority
@@ -41,6 +41,65 @@ class Task:
         """
         self.steps.append(step)
     
+    def get_context_steps(
+        self,
+        step_types: Iterable[str] = ("user_message", "assistant_message"),
+        include_contributions: bool = True,
+        include_summary: bool = True,
+    ) -> List[TaskStep]:
+        """
+        Retourne la vue du contexte du tour courant, destinée aux prompts.
+
+        The view keeps the user messages and the final answers of the previous turns, and the
+        contributions of the generals of the current turn only (the turn starts at the last user
+        message). Contributions of earlier turns stay in `steps` for audit but are left out.
+
+        Once the memory has been compacted, the view starts with the latest `ConversationSummaryStep`
+        (role "system"), which stands for all the steps before it.
+
+        Args:
+            step_types (Iterable[str]): Les types d'étapes à conserver.
+            include_contributions (bool): Inclure les contributions des généraux du tour courant.
+            include_summary (bool): Inclure le résumé des tours compactés.
+
+        Returns:
+            List[TaskStep]: Les étapes du contexte, dans l'ordre chronologique.
+        """
+        step_types = set(step_types)
+        current_turn_start = 0
+        summary_index = None
+        for index, step in enumerate(self.steps):
+            if step.step_type == "user_message":
+                current_turn_start = index
+            elif step.step_type == "conversation_summary":
+                summary_index = index
+
+        context = []
+        if summary_index is not None and include_summary:
+            context.append(self.steps[summary_index])
+        for index, step in enumerate(self.steps):
+            if summary_index is not None and index <= summary_index:
+                continue  # Résumées
+            if step.step_type not in step_types:
+                continue
+            if self.is_general_contribution(step) and (index < current_turn_start or not include_contributions):
+                continue
+            context.append(step)
+        return context
+
+    @staticmethod
+    def is_general_contribution(step: TaskStep) -> bool:
+        """
+        Indique si une étape est la contribution d'un général (et non une réponse finale).
+
+        Args:
+            step (TaskStep): L'étape à tester.
+
+        Returns:
+            bool: True pour un `AssistantMessageStep` produit par un général.
+        """
+        return step.step_type == "assistant_message" and "general" in (step.metadata or {})
+
     def add_subtask(self, subtask: 'Task'):
         """Ajoute une sous-tâche à la tâche principale."""
         self.subtasks.append(subtask)
@@ -65,7 +124,7 @@ class Task:
         task_dict = {
             "task_id": self.task_id,
             "request": self.request,
-            "steps": [step.to_dict() for step in self.steps],
+            "steps": [step.as_dict() for step in self.steps],  # Formes mémorisées : pas de reconstruction à chaque événement
             "metadata": self.metadata,
             "priority": self.priority,
             "status": self.status,
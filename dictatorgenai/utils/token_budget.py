@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional
+
+
+class TokenBudget:
+    """
+    Répartit un budget de tokens de sortie, par requête, entre les généraux sélectionnés et le dictateur.
+
+    A share of the budget is reserved for the synthesis of the dictator, the rest is split across
+    the generals in proportion to their `confidence` and to the number of subtasks assigned to them.
+    Each general gets at least `min_tokens` (scaled down if the budget is too small for that).
+
+    Attributes:
+        total_tokens (int): The output-token budget of the request.
+        synthesis_share (float): Share of the budget reserved for the synthesis of the dictator.
+        min_tokens (int): Minimum allocation of a general.
+        allocations (Dict[str, int]): The allocation of each general, filled by `allocate`.
+        usage (Dict[str, int]): The output tokens actually generated by each general.
+        synthesis_usage (int): The output tokens actually generated by the synthesis.
+    """
+
+    def __init__(self, total_tokens: int, synthesis_share: float = 0.25, min_tokens: int = 256):
+        """
+        Initializes the TokenBudget.
+
+        Args:
+            total_tokens (int): The output-token budget of the request.
+            synthesis_share (float): Share of the budget reserved for the synthesis, strictly between 0 and 1.
+            min_tokens (int): Minimum allocation of a general.
+        """
+        if total_tokens <= 0:
+            raise ValueError("total_tokens must be positive.")
+        if not 0 < synthesis_share < 1:
+            raise ValueError("synthesis_share must be strictly between 0 and 1.")
+        self.total_tokens = total_tokens
+        self.synthesis_share = synthesis_share
+        self.min_tokens = min_tokens
+        self.allocations: Dict[str, int] = {}
+        self.usage: Dict[str, int] = {}
+        self.synthesis_usage = 0
+
+    @property
+    def synthesis_tokens(self) -> int:
+        """The number of tokens reserved for the synthesis of the dictator (at least 1: 0 would mean no limit)."""
+        return max(1, int(self.total_tokens * self.synthesis_share))
+
+    @property
+    def generals_tokens(self) -> int:
+        """The number of tokens shared by the generals."""
+        return self.total_tokens - self.synthesis_tokens
+
+    def allocate(self, generals: List[Any]) -> Dict[str, int]:
+        """
+        Splits the generals' share of the budget across the given generals.
+
+        Args:
+            generals (List[AssignedGeneral]): The selected generals. Their `confidence` and the subtasks
+                listed in their `capabilities_used` weight the allocation.
+
+        Returns:
+            Dict[str, int]: The number of output tokens allocated to each general.
+        """
+        if not generals:
+            self.allocations = {}
+            return self.allocations
+
+        weights = {general.my_name_is: self._weight(general) for general in generals}
+        total_weight = sum(weights.values())
+        pool = self.generals_tokens
+
+        # Plancher garanti pour chaque général, réduit si le budget ne permet pas de le respecter
+        floor = min(self.min_tokens, pool // len(weights))
+        remaining = pool - floor * len(weights)
+
+        self.allocations = {
+            name: floor + int(remaining * weight / total_weight)
+            for name, weight in weights.items()
+        }
+        return self.allocations
+
+    def limit_for(self, general_name: str, calls: int = 1) -> Optional[int]:
+        """
+        Returns the `max_tokens` of one request to a general. It bounds all the completions of the request
+        (its tool loop included), not each of them.
+
+        Args:
+            general_name (str): The general making the call.
+            calls (int): The number of calls sharing the allocation of the general (per-subtask fan-out).
+
+        Returns:
+            Optional[int]: The limit, or None if the general has no allocation.
+        """
+        allocation = self.allocations.get(general_name)
+        if allocation is None:
+            return None
+        return max(1, allocation // max(1, calls))
+
+    def record_usage(self, general_name: str, completion_tokens: int):
+        """
+        Records output tokens generated on behalf of a general.
+
+        Args:
+            general_name (str): The general whose allocation is consumed.
+            completion_tokens (int): The number of generated tokens.
+        """
+        self.usage[general_name] = self.usage.get(general_name, 0) + (completion_tokens or 0)
+
+    def record_synthesis_usage(self, completion_tokens: int):
+        """
+        Records output tokens generated by the synthesis of the dictator.
+
+        Args:
+            completion_tokens (int): The number of generated tokens.
+        """
+        self.synthesis_usage += completion_tokens or 0
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Reports the usage of the synthesis and of each general against their allocation.
+
+        Returns:
+            Dict[str, Any]: The total budget, the synthesis reservation, the `allocated` and `used`
+            tokens of the synthesis and of each general.
+        """
+        return {
+            "total_tokens": self.total_tokens,
+            "synthesis_tokens": self.synthesis_tokens,
+            "synthesis": {"allocated": self.synthesis_tokens, "used": self.synthesis_usage},
+            "generals": {
+                name: {"allocated": allocated, "used": self.usage.get(name, 0)}
+                for name, allocated in self.allocations.items()
+            },
+        }
+
+    @staticmethod
+    def _weight(general: Any) -> float:
+        subtasks = {
+            str(subtask)
+            for cap in getattr(general, "capabilities_used", None) or []
+            for subtask in cap.get("subtasks", []) or []
+        }
+        confidence = float(getattr(general, "confidence", 0.0) or 0.0)
+        # Un général sans confiance déclarée garde un poids minimal pour ne pas être affamé
+        return max(confidence, 0.05) * max(1, len(subtasks))
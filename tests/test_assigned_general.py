@@ -0,0 +1,36 @@
+import asyncio
+
+from dictatorgenai.agents import AssignedGeneral, General
+from dictatorgenai.models import BaseModel
+from dictatorgenai.utils.task import Task
+
+
+class _EchoModel(BaseModel):
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        raise NotImplementedError
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+def _general(name: str) -> General:
+    return General(name, name, [{"capability": "droit"}], _EchoModel())
+
+
+def test_views_do_not_share_conversation_history():
+    general = _general("Juriste")
+    first, second = AssignedGeneral(general), AssignedGeneral(general)
+
+    assert first.conversation_history is not second.conversation_history
+    assert first.conversation_history is not general.conversation_history
+
+    async def reply(sender, message, task, **kwargs):
+        return "ok"
+
+    first.process_message = reply
+    asyncio.run(first.receive_message(_general("Dictateur"), "question", task=Task(request="question")))
+
+    assert len(first.conversation_history) == 1
+    assert second.conversation_history == []
+    assert general.conversation_history == []
+    assert first.failed_attempts == second.failed_attempts == 0
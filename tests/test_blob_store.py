@@ -0,0 +1,72 @@
+import asyncio
+import json
+import threading
+
+from dictatorgenai.agents import General
+from dictatorgenai.config import DictatorSettings
+from dictatorgenai.memories import RegimeMemory
+from dictatorgenai.memories.stores import FileBlobStore, InMemoryBlobStore, SQLiteStore
+from dictatorgenai.steps import StepCodec, ToolExecutionStep
+from dictatorgenai.utils.task import Task
+
+
+def test_default_blob_store_outlives_the_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(DictatorSettings, "blob_store", None)
+    store = DictatorSettings.get_blob_store()
+    assert isinstance(store, FileBlobStore)
+
+    output = "Article 1240 du Code civil. " * 1000
+    step = ToolExecutionStep("req_1", "code_civil_search", {"query": "responsabilité"}, output="…", output_ref=store.put(output))
+    reloaded = StepCodec().decode(StepCodec().encode(step))
+
+    # Nouveau processus : le store par défaut est recréé
+    monkeypatch.setattr(DictatorSettings, "blob_store", None)
+    assert reloaded.get_output() == output
+
+
+def test_in_memory_blob_store_is_bounded():
+    store = InMemoryBlobStore(max_bytes=10)
+    first = store.put("aaaaaa")
+    second = store.put("bbbbbb")
+    assert store.get(first) is None
+    assert store.get(second) == "bbbbbb"
+    assert store.delete(second) and not store.delete(second)
+    assert store._size == 0
+
+
+class _ThreadRecordingBlobStore(FileBlobStore):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.threads = []
+
+    def put(self, data):
+        self.threads.append(threading.current_thread())
+        return super().put(data)
+
+
+def test_tool_outputs_are_offloaded_off_the_event_loop_and_deleted_with_the_memory(tmp_path, monkeypatch):
+    store = _ThreadRecordingBlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(DictatorSettings, "blob_store", store)
+    output = json.dumps({"result": "Article 1240 du Code civil. " * 1000})
+    memory = RegimeMemory("m", Task(request=""), SQLiteStore(str(tmp_path / "memory.db")))
+
+    async def main():
+        await memory.ensure_loaded()
+        await memory.add_user_message("Question")
+        preview, ref = await General._offload_tool_output(output)
+        # Étape persistée (retirée de `steps`) et étape seulement en mémoire
+        await memory.save_step(ToolExecutionStep("req_1", "code_civil_search", {"query": "faute"}, output=preview, output_ref=ref))
+        await memory.end_turn()
+        memory.steps.clear()
+        _, other_ref = await General._offload_tool_output(output + " ")
+        memory.steps.append(ToolExecutionStep("req_1", "code_civil_search", {"query": "faute"}, output=preview, output_ref=other_ref))
+        assert store.exists(ref) and store.exists(other_ref)
+        await memory.clear_memory()
+        await memory.close()
+        return ref, other_ref
+
+    ref, other_ref = asyncio.run(main())
+    assert threading.main_thread() not in store.threads
+    assert not store.exists(ref)
+    assert not store.exists(other_ref)
@@ -0,0 +1,72 @@
+import os
+import pickle
+
+from dictatorgenai.retrieval import BM25Index
+
+
+def _documents():
+    return [
+        {"id": "1737", "title": "Article 1737", "text": "Le bail cesse de plein droit à l'expiration du terme fixé.", "source": "Code civil"},
+        {"id": "1719", "title": "Article 1719", "text": "Le bailleur est obligé de délivrer au preneur la chose louée.", "source": "Code civil"},
+        {"id": "L1231-1", "title": "Article L1231-1", "text": "Le contrat de travail à durée indéterminée peut être rompu.", "source": "Code du travail"},
+    ]
+
+
+def _ids(results):
+    return [result["id"] for result in results]
+
+
+def test_add_search_and_replace(tmp_path):
+    index = BM25Index(str(tmp_path / "index"))
+    assert index.add_documents(_documents()) == 3
+    results = index.search("bail terme")
+    assert _ids(results)[0] == "1737"
+    assert results[0]["source"] == "Code civil" and results[0]["score"] > 0
+    assert _ids(index.search("contrat de travail")) == ["L1231-1"]
+
+    # Un document réindexé remplace sa version précédente
+    index.add_documents([{"id": "1737", "text": "Le contrat de travail est suspendu."}])
+    assert len(index) == 3
+    assert index.get_document("1737")["text"] == "Le contrat de travail est suspendu."
+    assert "1737" not in _ids(index.search("bail terme"))
+    assert set(_ids(index.search("contrat de travail"))) == {"1737", "L1231-1"}
+    index.close()
+
+
+def test_delete_and_merge(tmp_path):
+    path = str(tmp_path / "index")
+    index = BM25Index(path)
+    index.add_documents(_documents()[:2])
+    index.add_documents(_documents()[2:])
+    assert index.delete_documents(["1719", "absent"]) == 1
+    assert "1719" not in index
+    assert "1719" not in _ids(index.search("bailleur chose louée"))
+
+    index.merge()
+    segments = {name.split(".")[0] for name in os.listdir(path) if name.startswith("seg_")}
+    assert len(segments) == 1
+    assert len(index) == 2
+    assert _ids(index.search("bail terme"))[0] == "1737"
+    assert index.get_document("1719") is None
+    index.close()
+
+
+def test_reopened_and_refreshed_readers_see_the_writes(tmp_path):
+    path = str(tmp_path / "index")
+    writer = BM25Index(path)
+    writer.add_documents(_documents()[:1])
+    reader = pickle.loads(pickle.dumps(writer))  # Rouvert depuis le disque, par mmap
+    assert _ids(reader.search("bail")) == ["1737"]
+
+    writer.add_documents(_documents()[1:])
+    writer.delete_documents(["1737"])
+    assert "1719" not in reader
+    assert reader.refresh()
+    assert not reader.refresh()
+    assert _ids(reader.search("bail bailleur")) == ["1719"]
+
+    writer.merge()
+    reader.refresh()
+    assert sorted(_ids(reader.search("bailleur contrat travail"))) == ["1719", "L1231-1"]
+    writer.close()
+    reader.close()
@@ -0,0 +1,219 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from dictatorgenai.agents import AssignedGeneral, General, tool
+from dictatorgenai.conversations.group_chat import GroupChat
+from dictatorgenai.conversations.refinement_chat import RefinementChat
+from dictatorgenai.models import BaseModel
+from dictatorgenai.utils.task import Task
+from dictatorgenai.utils.token_budget import TokenBudget
+
+
+@tool("Recherche dans le Code civil", execution="inline", failure_threshold=None)
+def code_civil_search(query: str) -> str:
+    return f"Article sur {query}"
+
+
+class _ScriptedModel(BaseModel):
+    """Joue un scénario : "tool" (appel d'outil), "answer" ou une exception, 40 tokens générés par complétion."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.max_tokens = []
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        self.max_tokens.append(kwargs.get("max_tokens"))
+        action = self.script.pop(0)
+        if isinstance(action, Exception):
+            raise action
+        tool_calls = None
+        if action == "tool":
+            tool_calls = [SimpleNamespace(
+                id=f"call_{len(self.max_tokens)}",
+                type="function",
+                function=SimpleNamespace(name="code_civil_search", arguments=json.dumps({"query": "bail"})),
+            )]
+        message = SimpleNamespace(role="assistant", content="Contribution" if action == "answer" else None, tool_calls=tool_calls)
+        return SimpleNamespace(message=message, usage=SimpleNamespace(prompt_tokens=10, completion_tokens=40))
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+def _general(name, model, subtasks=("Résiliation du bail",)):
+    general = General(name, name, [{"capability": "bail"}], model, tools=[code_civil_search])
+    capabilities = [{"capability": "bail", "subtasks": list(subtasks)}]
+    return AssignedGeneral(general, capabilities_used=capabilities, confidence=0.8)
+
+
+def _dictator():
+    return AssignedGeneral(General("Dictateur", "dictateur", [{"capability": "synthèse"}], _ScriptedModel()))
+
+
+def _budget(**allocations):
+    budget = TokenBudget(1000)
+    budget.allocations = dict(allocations)
+    return budget
+
+
+def test_retry_gets_the_remaining_allocation_and_tags_the_failed_attempt():
+    model = _ScriptedModel("tool", RuntimeError("timeout"), "answer")
+    juriste = _general("Juriste", model)
+    task = Task(request="Puis-je résilier mon bail ?")
+    budget = _budget(Juriste=100)
+    chat = GroupChat(retry_backoff=0)
+
+    contribution = asyncio.run(chat.send_command_to_general(_dictator(), juriste, task, generals=[juriste], budget=budget))
+
+    assert contribution["status"] == "ok"
+    assert contribution["content"] == "Contribution"
+    # La nouvelle tentative ne dispose que de ce que la première a laissé
+    assert model.max_tokens == [100, 60, 60]
+    assert budget.usage == {"Juriste": 80}
+    (tool_step,) = [step for step in task.steps if step.step_type == "tool_execution"]
+    assert tool_step.metadata["failed_attempt"] == 1
+
+
+def test_failover_is_charged_to_the_alternate():
+    juriste = _general("Juriste", _ScriptedModel(RuntimeError("timeout"), RuntimeError("timeout")))
+    notaire_model = _ScriptedModel("answer")
+    notaire = _general("Notaire", notaire_model)
+    budget = _budget(Juriste=100, Notaire=100)
+    chat = GroupChat(max_retries=1, retry_backoff=0)
+
+    contribution = asyncio.run(chat.send_command_to_general(
+        _dictator(), juriste, Task(request="Question"), generals=[juriste, notaire], budget=budget
+    ))
+
+    assert contribution["status"] == "failover"
+    assert contribution["covered_by"] == "Notaire"
+    assert notaire_model.max_tokens == [100]
+    assert budget.usage == {"Juriste": 0, "Notaire": 40}
+
+
+def test_missing_contribution_marker_when_nobody_answers():
+    juriste = _general("Juriste", _ScriptedModel(RuntimeError("timeout")))
+    notaire = _general("Notaire", _ScriptedModel(ValueError("invalid")))
+    chat = GroupChat(max_retries=0, retry_backoff=0)
+
+    contribution = asyncio.run(chat.send_command_to_general(_dictator(), juriste, Task(request="Question"), generals=[juriste, notaire]))
+
+    assert contribution["status"] == "missing"
+    assert json.loads(contribution["content"]) == {
+        "missing_contribution": {
+            "general": "Juriste",
+            "capabilities": ["bail"],
+            "subtasks": ["Résiliation du bail"],
+            "reason": "ValueError",
+        }
+    }
+
+
+def test_alternates_share_a_subtask():
+    juriste = _general("Juriste", _ScriptedModel(), subtasks=("bail", "préavis"))
+    notaire = _general("Notaire", _ScriptedModel(), subtasks=("préavis",))
+    fiscaliste = _general("Fiscaliste", _ScriptedModel(), subtasks=("impôts",))
+
+    assert GroupChat().select_alternate_generals(juriste, [juriste, notaire, fiscaliste]) == [notaire]
+
+
+class _SubtaskModel(BaseModel):
+    """Répond à la sous-tâche nommée dans la commande, échoue sur `failing`, et mesure la concurrence."""
+
+    def __init__(self, subtasks, failing=None):
+        self.subtasks = subtasks
+        self.failing = failing
+        self.running = 0
+        self.max_running = 0
+        self.max_tokens = []
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        self.max_tokens.append(kwargs.get("max_tokens"))
+        command = messages[-1]["content"]
+        subtask = next(subtask for subtask in self.subtasks if f"handled separately: '{subtask}'" in command)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+        if subtask == self.failing:
+            raise RuntimeError("timeout")
+        message = SimpleNamespace(role="assistant", content=f"Réponse sur {subtask}", tool_calls=None)
+        return SimpleNamespace(message=message, usage=SimpleNamespace(prompt_tokens=10, completion_tokens=40))
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+def test_fan_out_sends_one_request_per_subtask():
+    subtasks = ("Résiliation du bail", "Délai de préavis")
+    model = _SubtaskModel(subtasks)
+    juriste = _general("Juriste", model, subtasks=subtasks)
+    budget = _budget(Juriste=100)
+    chat = GroupChat(fan_out_subtasks=True)
+
+    contribution = asyncio.run(chat.send_command_to_general(_dictator(), juriste, Task(request="Question"), generals=[juriste], budget=budget))
+
+    assert contribution["status"] == "ok"
+    assert contribution["subtasks"] == list(subtasks)
+    assert contribution["content"] == (
+        "### Résiliation du bail\nRéponse sur Résiliation du bail\n\n### Délai de préavis\nRéponse sur Délai de préavis"
+    )
+    assert model.max_running == 2
+    # Les sous-tâches se partagent l'allocation du général
+    assert model.max_tokens == [50, 50]
+    assert budget.usage == {"Juriste": 80}
+
+
+def test_fan_out_concurrency_cap_and_partial_contribution():
+    subtasks = ("Résiliation du bail", "Délai de préavis", "Dépôt de garantie")
+    model = _SubtaskModel(subtasks, failing="Délai de préavis")
+    juriste = _general("Juriste", model, subtasks=subtasks)
+    chat = GroupChat(fan_out_subtasks=True, max_parallel_subtasks=1, max_retries=0, failover=False)
+
+    contribution = asyncio.run(chat.send_command_to_general(_dictator(), juriste, Task(request="Question"), generals=[juriste]))
+
+    assert model.max_running == 1
+    assert contribution["status"] == "partial"
+    sections = contribution["content"].split("\n\n### ")
+    assert sections[0] == "### Résiliation du bail\nRéponse sur Résiliation du bail"
+    missing = json.loads(sections[1].split("\n", 1)[1])["missing_contribution"]
+    assert missing["subtasks"] == ["Délai de préavis"]
+    assert sections[2] == "Dépôt de garantie\nRéponse sur Dépôt de garantie"
+
+
+class _CritiqueModel(BaseModel):
+    """Critique la contribution du Juriste (25 tokens générés)."""
+
+    def __init__(self):
+        self.max_tokens = []
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        self.max_tokens.append(kwargs.get("max_tokens"))
+        content = json.dumps({"Juriste": {"satisfied": False, "critique": "Citez le délai de préavis."}})
+        message = SimpleNamespace(role="assistant", content=content, tool_calls=None)
+        return SimpleNamespace(message=message, usage=SimpleNamespace(prompt_tokens=10, completion_tokens=25))
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+def test_refinement_round_retries_the_revision_and_records_the_critique():
+    critique_model = _CritiqueModel()
+    dictator = AssignedGeneral(General("Dictateur", "dictateur", [{"capability": "synthèse"}], critique_model))
+    model = _ScriptedModel(RuntimeError("timeout"), "answer")
+    juriste = _general("Juriste", model)
+    budget = _budget(Juriste=100)
+    chat = RefinementChat(critique_max_tokens=300, retry_backoff=0)
+    contributions = [{"general": "Juriste", "content": "Premier jet", "status": "ok"}]
+
+    revised = asyncio.run(chat.run_refinement_round(dictator, [juriste], Task(request="Question"), contributions, budget=budget))
+
+    assert critique_model.max_tokens == [300]
+    assert budget.synthesis_usage == 25
+    assert revised[0]["content"] == "Contribution"
+    assert revised[0]["revised"] is True
+    assert model.max_tokens == [100, 100]
+    assert budget.usage == {"Juriste": 40}
@@ -0,0 +1,243 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from dictatorgenai.memories import MemoryCompactor, RegimeMemory
+from dictatorgenai.memories.stores import SQLiteStore
+from dictatorgenai.models import BaseModel
+from dictatorgenai.utils.task import Task
+
+
+class _SummaryModel(BaseModel):
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        return SimpleNamespace(message=SimpleNamespace(content="Résumé des échanges précédents."))
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+async def _turn(memory: RegimeMemory, index: int):
+    await memory.add_user_message(f"Question {index} sur le bail " + "x" * 200)
+    await memory.add_assistant_message(f"Réponse {index} " + "y" * 200)
+    await memory.end_turn()
+
+
+def _memory(db_path, **kwargs) -> RegimeMemory:
+    return RegimeMemory("m", Task(request=""), SQLiteStore(str(db_path)), **kwargs)
+
+
+class _FlakyStore(SQLiteStore):
+    """Échoue aux `failures` premières écritures par lot."""
+
+    def __init__(self, db_path, failures=1):
+        super().__init__(db_path)
+        self.failures = failures
+        self.batches = []
+
+    def save_steps(self, memory_id, steps):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.batches.append(len(steps))
+        super().save_steps(memory_id, steps)
+
+
+def test_strict_durability_writes_each_step(tmp_path):
+    async def main():
+        memory = _memory(tmp_path / "memory.db", durability="strict")
+        await memory.ensure_loaded()
+        await memory.add_user_message("Question")
+        stored = await memory.store.count_steps("m")
+        await memory.close()
+        return stored
+
+    assert asyncio.run(main()) == 1
+
+
+def test_per_turn_durability_writes_the_turn_in_one_batch(tmp_path):
+    async def main():
+        memory = RegimeMemory("m", Task(request=""), _FlakyStore(str(tmp_path / "memory.db"), failures=0))
+        await memory.ensure_loaded()
+        await memory.add_user_message("Question")
+        await memory.add_assistant_message("Réponse")
+        before = await memory.store.count_steps("m")
+        await memory.end_turn()
+        after = await memory.store.count_steps("m")
+        await memory.close()
+        return before, after, memory.store.store.batches
+
+    assert asyncio.run(main()) == (0, 2, [2])
+
+
+def test_periodic_durability_writes_behind(tmp_path):
+    async def main():
+        memory = _memory(tmp_path / "memory.db", durability="periodic", flush_interval=0.05)
+        await memory.ensure_loaded()
+        await memory.add_user_message("Question")
+        await memory.add_assistant_message("Réponse")
+        before = await memory.store.count_steps("m")
+        await asyncio.sleep(0.2)
+        after = await memory.store.count_steps("m")
+        await memory.close()
+        return before, after
+
+    assert asyncio.run(main()) == (0, 2)
+
+
+def test_failed_flush_keeps_the_steps_buffered(tmp_path):
+    db_path = tmp_path / "memory.db"
+
+    async def main():
+        memory = RegimeMemory("m", Task(request=""), _FlakyStore(str(db_path)))
+        await memory.ensure_loaded()
+        await memory.add_user_message("Question")
+        with pytest.raises(OSError):
+            await memory.end_turn()
+        await memory.add_assistant_message("Réponse")
+        # Le lot suivant reprend les étapes non écrites, dans l'ordre
+        await memory.flush()
+        await memory.close()
+
+        reloaded = _memory(db_path)
+        await reloaded.load()
+        await reloaded.close()
+        return [step.step_type for step in reloaded.steps]
+
+    assert asyncio.run(main()) == ["user_message", "assistant_message"]
+
+
+def test_close_flushes_the_buffered_steps(tmp_path):
+    db_path = tmp_path / "memory.db"
+
+    async def main():
+        memory = _memory(db_path, durability="periodic", flush_interval=60)
+        await memory.ensure_loaded()
+        await memory.add_user_message("Question")
+        await memory.close()
+
+        reloaded = _memory(db_path)
+        await reloaded.load()
+        await reloaded.close()
+        return reloaded.steps
+
+    assert [step.content for step in asyncio.run(main())] == ["Question"]
+
+
+def test_paging_after_compaction_does_not_reload_summarized_steps(tmp_path):
+    db_path = tmp_path / "memory.db"
+
+    async def main():
+        memory = _memory(db_path, compactor=MemoryCompactor(_SummaryModel(), max_context_tokens=1, keep_recent_turns=2))
+        await memory.ensure_loaded()
+        for index in range(8):
+            await _turn(memory, index)
+            if memory._compaction_task is not None:
+                await memory._compaction_task
+        await memory.close()
+
+        # Rechargement d'une fenêtre plus courte que les tours non résumés
+        reloaded = _memory(db_path, window_turns=1)
+        await reloaded.load()
+        compacted_until = reloaded.compacted_until
+        assert compacted_until > 0
+
+        paged = []
+        while reloaded.has_older_steps:
+            paged += await reloaded.page_older_steps()
+        assert await reloaded.page_older_steps() == []
+        await reloaded.close()
+        return reloaded.steps, paged, compacted_until, reloaded.first_position
+
+    steps, paged, compacted_until, first_position = asyncio.run(main())
+    types = [step.step_type for step in steps]
+    assert types[0] == "conversation_summary"
+    assert types.count("conversation_summary") == 1
+    assert all(step.step_type != "conversation_summary" for step in paged)
+    assert first_position == compacted_until
+    # Seuls les tours non résumés suivent le résumé
+    assert types[1:] == ["user_message", "assistant_message"] * 2
+
+
+def test_paging_after_in_session_compaction(tmp_path):
+    async def main():
+        memory = _memory(tmp_path / "memory.db", compactor=MemoryCompactor(_SummaryModel(), max_context_tokens=1, keep_recent_turns=2))
+        await memory.ensure_loaded()
+        for index in range(5):
+            await _turn(memory, index)
+        summary = await memory.compact(force=True)
+        older = await memory.page_older_steps()
+        await memory.close()
+        return memory, summary, older
+
+    memory, summary, older = asyncio.run(main())
+    assert summary is not None
+    assert older == []
+    assert not memory.has_older_steps
+    assert [step.step_type for step in memory.steps].count("conversation_summary") == 1
+
+
+class _RangeRecordingStore(SQLiteStore):
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.ranges = []
+
+    def load_steps_range(self, memory_id, start, end=None):
+        self.ranges.append((start, end))
+        return super().load_steps_range(memory_id, start, end)
+
+
+def test_window_load_starts_from_the_snapshot(tmp_path):
+    db_path = tmp_path / "memory.db"
+
+    async def main():
+        memory = _memory(db_path, snapshot_every=2)
+        await memory.ensure_loaded()
+        await memory.add_user_message(f"Question 0 sur le bail {'x' * 200}")
+        await memory.coup_detat("Juriste")
+        await memory.add_assistant_message(f"Réponse 0 {'y' * 200}")
+        await memory.end_turn()
+        for index in range(1, 5):
+            await _turn(memory, index)
+        await memory.close()
+
+        store = _RangeRecordingStore(str(db_path))
+        reloaded = RegimeMemory("m", Task(request=""), store, window_turns=2, snapshot_every=2)
+        await reloaded.load()
+        window = [step.content for step in reloaded.steps]
+        state = (reloaded.stored_count, reloaded.turn_starts, reloaded.dictator, reloaded.step_counts)
+        older = await reloaded.page_older_steps()
+        await reloaded.close()
+        return window, state, store.ranges, older, reloaded
+
+    window, state, ranges, older, reloaded = asyncio.run(main())
+    assert window == [f"Question 3 sur le bail {'x' * 200}", f"Réponse 3 {'y' * 200}", f"Question 4 sur le bail {'x' * 200}", f"Réponse 4 {'y' * 200}"]
+    assert state == (11, [0, 3, 5, 7, 9], "Juriste", {"coup_d_etat": 1, "user_message": 5, "assistant_message": 5})
+    # L'instantané couvre les 4 premiers tours : seul le dernier tour est relu après lui
+    assert ranges[:2] == [(9, 11), (7, 9)]
+    assert [step.content.split(" ")[1] for step in older] == ["2", "2"]
+    assert reloaded.first_position == 5
+
+
+def test_window_load_without_a_usable_snapshot_rereads_the_steps(tmp_path):
+    db_path = tmp_path / "memory.db"
+
+    async def main():
+        memory = _memory(db_path, snapshot_every=None)
+        await memory.ensure_loaded()
+        for index in range(3):
+            await _turn(memory, index)
+        # Instantané en avance sur les étapes écrites (ex. écrit avant un crash)
+        await memory.store.save_snapshot("m", {**memory.get_snapshot(), "step_count": 100})
+        await memory.close()
+
+        reloaded = _memory(db_path, window_turns=1)
+        await reloaded.load()
+        await reloaded.close()
+        return reloaded
+
+    reloaded = asyncio.run(main())
+    assert [step.step_type for step in reloaded.steps] == ["user_message", "assistant_message"]
+    assert reloaded.stored_count == 6
+    assert reloaded.turn_starts == [0, 2, 4]
+    assert reloaded.first_position == 4
@@ -0,0 +1,58 @@
+import json
+import sqlite3
+
+from dictatorgenai.memories.stores import SQLiteStore
+from dictatorgenai.memories.stores.sqlite_store import SCHEMA_VERSION
+from dictatorgenai.steps import AssistantMessageStep, GeneralSelectionStep, UserMessageStep
+
+
+def _baseline_db(db_path: str, steps):
+    """Base créée avec le schéma d'origine : une seule colonne `step_data` en JSON, sans index."""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_steps (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                memory_id TEXT NOT NULL,
+                step_data TEXT NOT NULL
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO memory_steps (memory_id, step_data) VALUES (?, ?)",
+            [(memory_id, json.dumps(step.to_dict())) for memory_id, step in steps],
+        )
+        conn.commit()
+
+
+def test_migration_keeps_baseline_rows(tmp_path):
+    db_path = str(tmp_path / "regime_memory.db")
+    legacy = [
+        ("m1", UserMessageStep("req_1", "Mon bailleur garde le dépôt de garantie.")),
+        ("m1", GeneralSelectionStep("req_1", ["Juriste"])),
+        ("m1", AssistantMessageStep("req_1", "Il dispose d'un mois pour le restituer.")),
+        ("m2", UserMessageStep("req_1", "Autre discussion.")),
+    ]
+    _baseline_db(db_path, legacy)
+
+    store = SQLiteStore(db_path)
+    assert store._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    rows = store._conn.execute("SELECT memory_id, step_type, request_id, timestamp FROM memory_steps ORDER BY id").fetchall()
+    assert rows == [(memory_id, step.step_type, step.request_id, step.timestamp) for memory_id, step in legacy]
+
+    steps = store.load_steps("m1")
+    assert [step.to_dict() for step in steps] == [step.to_dict() for _, step in legacy[:3]]
+    assert [step.step_type for step in store.load_steps_for_request("m1", "req_1")] == [
+        "user_message", "general_selection", "assistant_message"
+    ]
+    assert store.load_latest_step("m1", "general_selection").selected_generals == ["Juriste"]
+    assert store.count_steps("m2") == 1
+
+    # Les nouvelles étapes renseignent les colonnes ; la migration n'est pas rejouée
+    store.save_steps("m1", [UserMessageStep("req_2", "Et les intérêts de retard ?")])
+    store.close()
+    store = SQLiteStore(db_path)
+    assert store.count_steps("m1") == 4
+    assert [step.content for step in store.load_steps_by_type("m1", "user_message")] == [
+        "Mon bailleur garde le dépôt de garantie.", "Et les intérêts de retard ?"
+    ]
+    assert store.load_steps_by_type("m1", "user_message", limit=1)[0].request_id == "req_2"
+    store.close()
@@ -0,0 +1,82 @@
+import copy
+import json
+
+import pytest
+
+from dictatorgenai.steps import (
+    AssistantMessageStep,
+    ConversationSummaryStep,
+    PlanningStep,
+    StepCodec,
+    TaskStep,
+    ToolExecutionStep,
+    UserMessageStep,
+)
+
+
+def _steps():
+    return [
+        UserMessageStep(request_id="r1", content="Puis-je résilier mon bail ?"),
+        AssistantMessageStep(request_id="r1", content="Oui, sous conditions.", metadata={"general": "Juriste"}),
+        ToolExecutionStep(
+            request_id="r1", tool_name="code_civil_search", arguments={"query": "bail"},
+            output="Article 1737 " * 200, metadata={"executed_by": "Juriste"}, output_ref="sha256:abc",
+        ),
+        PlanningStep(request_id="r1", plan=json.dumps([{"subtask": "bail"}]), metadata={"subtasks": [1, 2]}),
+        ConversationSummaryStep(request_id="r1", content="Résumé", compacted_until=12),
+    ]
+
+
+@pytest.mark.parametrize("codec", [StepCodec(), StepCodec(compress_threshold=64), StepCodec(compress_threshold=0)])
+def test_round_trip(codec):
+    for step in _steps():
+        encoded = codec.encode(step)
+        decoded = codec.decode(encoded)
+        assert type(decoded) is type(step)
+        assert decoded.to_dict() == step.to_dict()
+        # Forme mémorisée : un second encodage rend les mêmes octets, y compris pour l'étape décodée
+        assert codec.encode(step) is encoded
+        assert codec.encode(decoded) == encoded
+
+
+def test_large_bodies_are_compressed_above_the_threshold():
+    step = _steps()[2]
+    assert len(StepCodec(compress_threshold=64).encode(step)) < len(StepCodec(compress_threshold=0).encode(step)) / 4
+
+
+def test_decodes_the_legacy_json_forms():
+    codec = StepCodec()
+    for step in _steps():
+        legacy = json.dumps(step.to_dict())
+        assert codec.decode(legacy).to_dict() == step.to_dict()  # Colonne TEXT
+        assert codec.decode(legacy.encode("utf-8")).to_dict() == step.to_dict()  # JSON en octets
+
+
+def test_unregistered_step_type_uses_the_named_form():
+    class _NotRegistered(TaskStep):
+        def __init__(self, request_id, metadata=None):
+            super().__init__(request_id, "assistant_message", metadata)
+
+    codec = StepCodec(use_msgpack=False)
+    payload = json.loads(codec.encode(_NotRegistered("r1", {"a": 1}))[1:])
+    assert isinstance(payload, dict) and payload["step_type"] == "assistant_message"
+
+
+def test_in_place_metadata_changes_invalidate_the_encoding():
+    codec = StepCodec()
+    step = AssistantMessageStep(request_id="r1", content="Réponse", metadata={"general": "Juriste"})
+    codec.encode(step)
+    step.as_dict()
+
+    step.metadata["evaluation"] = "ok"
+    assert codec.decode(codec.encode(step)).metadata == {"general": "Juriste", "evaluation": "ok"}
+    assert step.as_dict()["metadata"]["evaluation"] == "ok"
+
+    step.metadata.pop("evaluation")
+    assert codec.decode(codec.encode(step)).metadata == {"general": "Juriste"}
+
+    # Une copie ne modifie pas l'étape d'origine
+    copied = copy.deepcopy(step)
+    copied.metadata["general"] = "Notaire"
+    assert codec.decode(codec.encode(step)).metadata == {"general": "Juriste"}
+    assert codec.decode(codec.encode(copied)).metadata == {"general": "Notaire"}
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from dictatorgenai.agents import AssignedGeneral, General, tool
+from dictatorgenai.conversations.group_chat import GroupChat
+from dictatorgenai.models import BaseModel, StreamUsage
+from dictatorgenai.utils.task import Task
+from dictatorgenai.utils.token_budget import TokenBudget
+
+
+@tool("Recherche dans le Code civil", execution="inline", failure_threshold=None)
+def code_civil_search(query: str) -> str:
+    return f"Article sur {query}"
+
+
+class _ToolLoopModel(BaseModel):
+    """Appelle un outil à chaque complétion et génère 40 tokens par complétion (au plus `max_tokens`)."""
+
+    def __init__(self):
+        self.max_tokens = []
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        self.max_tokens.append(kwargs.get("max_tokens"))
+        call = SimpleNamespace(
+            id=f"call_{len(self.max_tokens)}",
+            type="function",
+            function=SimpleNamespace(name="code_civil_search", arguments=json.dumps({"query": "bail"})),
+        )
+        message = SimpleNamespace(role="assistant", content="analyse partielle", tool_calls=[call] if tools else None)
+        return SimpleNamespace(message=message, usage=SimpleNamespace(prompt_tokens=10, completion_tokens=min(40, kwargs.get("max_tokens") or 40)))
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+def test_synthesis_share_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBudget(1000, synthesis_share=0)
+    with pytest.raises(ValueError):
+        GroupChat(token_budget=1000, synthesis_share=0)
+    assert TokenBudget(3, synthesis_share=0.1).synthesis_tokens == 1
+
+
+def test_allocation_bounds_the_whole_tool_loop():
+    model = _ToolLoopModel()
+    general = General("Juriste", "juriste", [{"capability": "bail"}], model, tools=[code_civil_search], max_tool_iterations=10)
+    token_usage = {}
+
+    async def main():
+        return await general.process_message(general, "Question", task=Task(request="Question"), max_tokens=100, token_usage=token_usage)
+
+    asyncio.run(main())
+    assert model.max_tokens == [100, 60, 20]
+    assert token_usage["completion_tokens"] == 100
+
+
+class _SynthesisModel(BaseModel):
+    """Répond sans outil (30 tokens), puis diffuse la réponse finale et sa consommation (20 tokens)."""
+
+    supports_streaming_tool_calls = True
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        message = SimpleNamespace(role="assistant", content="brouillon", tool_calls=None)
+        return SimpleNamespace(message=message, usage=SimpleNamespace(prompt_tokens=10, completion_tokens=30))
+
+    async def stream_chat_completion(self, messages, tools=None, yield_tool_calls=False, **kwargs):
+        yield "Synthèse"
+        if yield_tool_calls:
+            yield StreamUsage(prompt_tokens=10, completion_tokens=20)
+
+
+def test_synthesis_usage_is_recorded_in_the_report():
+    dictator = AssignedGeneral(General("Dictateur", "dictateur", [{"capability": "synthèse"}], _SynthesisModel()))
+    task = Task(request="Question")
+    chat = GroupChat(token_budget=1000)
+    budget = TokenBudget(1000)
+
+    async def main():
+        return [chunk async for chunk in chat.synthesize(dictator, task, budget)]
+
+    assert asyncio.run(main()) == ["Synthèse"]
+    assert budget.synthesis_usage == 50
+    assert task.metadata["token_budget"]["synthesis"] == {"allocated": 250, "used": 50}
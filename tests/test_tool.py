@@ -0,0 +1,158 @@
+import asyncio
+import gc
+import json
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel as PydanticBaseModel
+from typing_extensions import TypedDict
+
+from dictatorgenai.agents import General
+from dictatorgenai.agents.tool import _BATCH_COALESCERS, BatchCoalescer, ToolUnavailableError, run_tool, tool
+from dictatorgenai.models import BaseModel
+
+
+class _Searcher:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    @tool("Search", execution="inline", max_concurrency=1)
+    def search(self, query: str) -> str:
+        return f"result:{query}"
+
+    @tool("Slow search", max_concurrency=2)
+    async def slow_search(self, query: str) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return query
+
+
+def test_method_tool_with_max_concurrency():
+    searcher = _Searcher()
+
+    async def main():
+        return await asyncio.gather(*[run_tool(searcher.search, {"query": str(i)}) for i in range(3)])
+
+    assert asyncio.run(main()) == ["result:0", "result:1", "result:2"]
+    # Nouvelle boucle d'événements : le sémaphore de la boucle précédente n'est pas réutilisé
+    assert asyncio.run(main()) == ["result:0", "result:1", "result:2"]
+
+
+def test_method_tool_concurrency_is_limited():
+    searcher = _Searcher()
+
+    async def main():
+        return await asyncio.gather(*[run_tool(searcher.slow_search, {"query": str(i)}) for i in range(6)])
+
+    assert asyncio.run(main()) == [str(i) for i in range(6)]
+    assert searcher.max_running == 2
+
+
+class _Query(TypedDict):
+    query: str
+
+
+@tool("Batch search", batch=True, failure_threshold=None)
+async def _batch_search(items: List[_Query]) -> List[str]:
+    await asyncio.sleep(0.02)
+    return [item["query"].upper() for item in items]
+
+
+def test_batch_invocation_is_kept_alive_until_done():
+    coalescer = BatchCoalescer(_batch_search, window=0)
+
+    async def main():
+        calls = [asyncio.ensure_future(coalescer.submit({"query": query})) for query in ("a", "b")]
+        await asyncio.sleep(0.005)
+        assert len(coalescer._tasks) == 1  # Invocation en cours, référencée par le regroupeur
+        gc.collect()
+        results = await asyncio.wait_for(asyncio.gather(*calls), 1)
+        await asyncio.sleep(0)
+        return results
+
+    assert asyncio.run(main()) == ["A", "B"]
+    assert not coalescer._tasks
+
+
+class _Citation(PydanticBaseModel):
+    article: int
+
+
+@tool("Parse a citation", execution="inline", failure_threshold=1)
+def _parse_citation(citation: str) -> int:
+    if citation == "down":
+        raise RuntimeError("database unavailable")
+    return _Citation.model_validate({"article": citation}).article
+
+
+def test_invalid_arguments_do_not_open_the_circuit():
+    async def main():
+        for _ in range(3):
+            with pytest.raises(ValueError):  # ValidationError levée par le tool
+                await run_tool(_parse_citation, {"citation": "article premier"})
+        assert await run_tool(_parse_citation, {"citation": "1240"}) == 1240
+        with pytest.raises(RuntimeError):
+            await run_tool(_parse_citation, {"citation": "down"})
+        with pytest.raises(ToolUnavailableError):
+            await run_tool(_parse_citation, {"citation": "1240"})
+
+    asyncio.run(main())
+
+
+class _NoModel(BaseModel):
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        raise NotImplementedError
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        yield ""
+
+
+@tool("Recherche", failure_threshold=None)
+async def _search(query: str) -> str:
+    await asyncio.sleep(0.01)
+    return f"Article sur {query}"
+
+
+def test_general_tool_semaphore_is_per_event_loop():
+    general = General("Juriste", "juriste", [{"capability": "bail"}], _NoModel(), tools=[_search], max_concurrent_tools=1)
+    call = SimpleNamespace(id="call_1", function=SimpleNamespace(name="_search", arguments=json.dumps({"query": "bail"})))
+
+    async def main():
+        return await asyncio.gather(general._run_tool_call(call), general._run_tool_call(call))
+
+    # Nouvelle boucle d'événements : le sémaphore de la boucle précédente n'est pas réutilisé
+    for _ in range(2):
+        for _, _, result, _ in asyncio.run(main()):
+            assert json.loads(result) == {"result": "Article sur bail"}
+
+
+class _Registry:
+    def __init__(self):
+        self.batches = []
+
+    @tool("Batch lookup", batch=True, batch_window=0.02, failure_threshold=None)
+    async def lookup(self, items: List[_Query]) -> List[str]:
+        self.batches.append([item["query"] for item in items])
+        return [item["query"].upper() for item in items]
+
+
+def test_generals_share_the_batch_of_a_method_tool():
+    registry = _Registry()
+    generals = [General(name, name, [{"capability": "bail"}], _NoModel(), tools=[registry.lookup]) for name in ("Juriste", "Notaire")]
+
+    async def main():
+        return await asyncio.gather(*[
+            general._execute_tool("lookup", {"query": query})
+            for general, query in zip(generals, ("a", "b"))
+        ])
+
+    results = asyncio.run(main())
+    assert [json.loads(result)["result"] for result in results] == ["A", "B"]
+    assert registry.batches == [["a", "b"]]
+    # Le regroupeur inactif est libéré
+    gc.collect()
+    assert not _BATCH_COALESCERS
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+from dictatorgenai.agents import General, tool
+from dictatorgenai.models import BaseModel
+from dictatorgenai.models.tool_call_assembler import StreamedToolCall, StreamUsage, ToolCallAssembler
+from dictatorgenai.utils.task import Task
+
+
+@tool("Recherche dans le Code civil", execution="inline", failure_threshold=None)
+def code_civil_search(query: str) -> str:
+    return f"Article sur {query}"
+
+
+class _StreamingToolModel(BaseModel):
+    """Diffuse un appel d'outil au premier tour, puis la réponse finale fragment par fragment."""
+
+    supports_streaming_tool_calls = True
+
+    def __init__(self, events):
+        self.events = events
+        self.turns = 0
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        raise AssertionError("the tool loop must stream")
+
+    async def stream_chat_completion(self, messages, tools=None, **kwargs):
+        self.turns += 1
+        if self.turns == 1:
+            yield StreamedToolCall(0, "call_a", "code_civil_search", '{"query": "bail"}')
+        else:
+            for chunk in ("Réponse ", "finale"):
+                self.events.append(f"model:{chunk}")
+                yield chunk
+        yield StreamUsage(prompt_tokens=10, completion_tokens=5)
+
+
+def _delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def test_call_is_emitted_as_soon_as_its_arguments_are_complete():
+    assembler = ToolCallAssembler()
+    assert assembler.feed([_delta(0, id="call_a", name="code_civil_search", arguments='{"query": "bail')]) == []
+    # Accolades et guillemets échappés dans les chaînes ne ferment pas l'objet
+    assert assembler.feed([_delta(0, arguments=' \\"}{\\" clause", ')]) == []
+    completed = assembler.feed([_delta(0, arguments='"top_k": [1, 2]}')])
+
+    assert [call.id for call in completed] == ["call_a"]
+    assert completed[0].function.name == "code_civil_search"
+    assert completed[0].function.arguments == '{"query": "bail \\"}{\\" clause", "top_k": [1, 2]}'
+    assert completed[0].to_dict()["function"]["name"] == "code_civil_search"
+    assert assembler.finish() == []
+
+
+def test_next_call_completes_the_previous_one():
+    assembler = ToolCallAssembler()
+    assembler.feed([_delta(0, id="call_a", name="search", arguments='{"q": "a"')])
+    completed = assembler.feed([_delta(1, id="call_b", name="search", arguments='{"q"')])
+    assert [call.id for call in completed] == ["call_a"]
+
+    # Fin du flux : l'appel inachevé est rendu tel quel
+    remaining = assembler.finish()
+    assert [call.id for call in remaining] == ["call_b"]
+    assert [call.id for call in assembler.tool_calls] == ["call_a", "call_b"]
+
+
+def test_call_without_arguments_or_id():
+    assembler = ToolCallAssembler()
+    assembler.feed([_delta(0, name="list_codes")])
+    (call,) = assembler.finish()
+    assert call.id == "call_0"
+    assert call.function.arguments == "{}"
+
+
+def test_final_answer_is_yielded_as_it_streams():
+    events = []
+    model = _StreamingToolModel(events)
+    general = General("Juriste", "juriste", [{"capability": "bail"}], model, tools=[code_civil_search])
+
+    async def main():
+        async for chunk in general.solve_task(Task(request="Question")):
+            events.append(f"client:{chunk}")
+
+    asyncio.run(main())
+    # Chaque fragment est transmis avant que le modèle ne produise le suivant
+    assert events == ["model:Réponse ", "client:Réponse ", "model:finale", "client:finale"]
+    assert model.turns == 2